@@ -4,6 +4,7 @@ from unittest.mock import patch
 import botocore.session
 import pytest
 from botocore.stub import Stubber
+from django.db import connection
 from psycopg2.extras import DateRange
 from rest_framework.test import APIClient
 
@@ -127,13 +128,14 @@ def growth_mediums(db):
 def drug_of(db):  # pylint: disable=unused-argument,invalid-name
     """Create and return selected drug."""
 
-    def _drug(code: str, name: str = None, synonyms: list = None):
+    def _drug(code: str, name: str = None, synonyms: list = None, drug_id: int = None):
         """Actual working function."""
+        defaults = {"drug_name": name or code}
+        if drug_id is not None:
+            defaults["drug_id"] = drug_id
         drug = Drug.objects.get_or_create(
             drug_code=code,
-            defaults={
-                "drug_name": name or code,
-            },
+            defaults=defaults,
         )[0]
         if not synonyms:
             synonyms = []
@@ -153,39 +155,57 @@ def drug_of(db):  # pylint: disable=unused-argument,invalid-name
 
 @pytest.fixture
 def drugs(drug_of):
-    """Create all drugs and 3-letter code drug synonyms."""
-    return [
-        drug_of("INH", "Isoniazid"),
-        drug_of("RIF", "Rifampicin"),
-        drug_of("STR", "Streptomycin", ["STM"]),
-        drug_of("EMB", "Ethambutol"),
-        drug_of("OFX", "Ofloxacin", ["OFL"]),
-        drug_of("CAP", "Capreomycin"),
-        drug_of("AMK", "Amikacin", ["AMI"]),
-        drug_of("KAN", "Kanamycin"),
-        drug_of("PZA", "Pyrazinamide"),
-        drug_of("LFX", "Levofloxacin", ["LEV", "LEVO", "LVX"]),
-        drug_of("MFX", "Moxifloxacin", ["MXF", "MOXI", "MOX"]),
-        drug_of("CYC", "Cycloserine", ["DCS", "Cs"]),
-        drug_of("ETO", "Ethionamide", ["ETH"]),
-        drug_of("DLM", "Delamanid"),
-        drug_of("BDQ", "Bedaquiline"),
-        drug_of("LZD", "Linezolid"),
-        drug_of("CFZ", "Clofazimine"),
-        drug_of("PMD", "Pretomanid"),
-        drug_of("PAS", "Para - Aminosalicylic Acid"),
-        drug_of("PTO", "Prothionamide"),
-        drug_of("AMX/CLV", "Amoxicillin-Clavulanate"),
-        drug_of("MB", "Rifabutin", ["RFB"]),
-        drug_of("IPM/CLN", "Imipenem - Cilastatin"),
-        drug_of("CLR", "Clarithromycin"),
-        drug_of("FT", "Fluoroquinolones"),
-        drug_of("AG/CP", "Aminoglycosides"),
-        drug_of("GFX", "Gatifloxacin"),
-        drug_of("CIP", "Ciprofloxacin"),
-        drug_of("SIT", "Sitafloxacin", ["STX"]),
-        drug_of("AZT", "Azithromycin"),
+    """
+    Create all drugs and 3-letter code drug synonyms.
+
+    Drugs get the same ids, as genphen initial data gives them,
+    drug resistance rules rely on them.
+    """
+    created = [
+        drug_of(code, name, synonyms, drug_id=drug_id)
+        for drug_id, (code, name, synonyms) in enumerate(
+            [
+                ("INH", "Isoniazid", None),
+                ("RIF", "Rifampicin", None),
+                ("STR", "Streptomycin", ["STM"]),
+                ("EMB", "Ethambutol", None),
+                ("OFX", "Ofloxacin", ["OFL"]),
+                ("CAP", "Capreomycin", None),
+                ("AMK", "Amikacin", ["AMI"]),
+                ("KAN", "Kanamycin", None),
+                ("PZA", "Pyrazinamide", None),
+                ("LFX", "Levofloxacin", ["LEV", "LEVO", "LVX"]),
+                ("MFX", "Moxifloxacin", ["MXF", "MOXI", "MOX"]),
+                ("CYC", "Cycloserine", ["DCS", "Cs"]),
+                ("ETO", "Ethionamide", ["ETH"]),
+                ("DLM", "Delamanid", None),
+                ("BDQ", "Bedaquiline", None),
+                ("LZD", "Linezolid", None),
+                ("CFZ", "Clofazimine", None),
+                ("PMD", "Pretomanid", None),
+                ("PAS", "Para - Aminosalicylic Acid", None),
+                ("PTO", "Prothionamide", None),
+                ("AMX/CLV", "Amoxicillin-Clavulanate", None),
+                ("MB", "Rifabutin", ["RFB"]),
+                ("IPM/CLN", "Imipenem - Cilastatin", None),
+                ("CLR", "Clarithromycin", None),
+                ("FT", "Fluoroquinolones", None),
+                ("AG/CP", "Aminoglycosides", None),
+                ("GFX", "Gatifloxacin", None),
+                ("CIP", "Ciprofloxacin", None),
+                ("SIT", "Sitafloxacin", ["STX"]),
+                ("AZT", "Azithromycin", None),
+            ],
+            start=1,
+        )
     ]
+    with connection.cursor() as cursor:
+        # explicit ids don't move the sequence
+        cursor.execute(
+            "select setval(pg_get_serial_sequence('genphen_drug', 'drug_id'), "
+            "(select max(drug_id) from genphen_drug))",
+        )
+    return created
 
 
 def create_user(name, is_staff=False):
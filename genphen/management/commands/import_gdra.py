@@ -5,7 +5,8 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from genphen.models import Drug, GeneDrugResistanceAssociation
-from overview.models import Gene, DrugGene
+from overview.models import Gene, MaterializedViewRefresh
+from overview.services.materialized_views import RefreshMaterializedViewsService
 
 log = logging.getLogger(__name__)
 
@@ -76,5 +77,10 @@ class Command(BaseCommand):
 
         log.info("imported %d from %d records", len(objs), len(rows[1:]))
 
-        DrugGene.refresh()
+        RefreshMaterializedViewsService.execute(
+            {
+                "views": ["overview.DrugGene"],
+                "trigger": MaterializedViewRefresh.Trigger.GDRA_IMPORT,
+            },
+        )
         log.info("refreshed overview_druggene matview")
@@ -29,3 +29,23 @@ def test_drug_detailed(client_of, alice, drug_of):
     assert data["drugName"] == drug.drug_name
     assert data["code"] == drug.drug_code
     assert response.status_code == 200
+
+
+def test_drug_not_modified(client_of, alice, drugs, drug_of, django_assert_num_queries):
+    """Unchanged drugs list is answered with 304, changed one is sent again."""
+    # pylint: disable=unused-argument
+    endpoint = reverse("v1:genphen:drug-list")
+    client = client_of(alice)
+    response = client.get(endpoint)
+    etag = response["ETag"]
+
+    # checksum only
+    with django_assert_num_queries(1):
+        response = client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    drug_of("XXX", "New drug")
+    response = client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
@@ -1,11 +1,14 @@
 from rest_framework import viewsets
 
+from tbkb.views import ConditionalGetMixin
 from ..models import Country
 from ..serializers import CountrySerializer
 
 
-class CountryViewSet(viewsets.ReadOnlyModelViewSet):
+class CountryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """API endpoint to manage countries."""
 
     queryset = Country.objects.all().order_by("country_usual_name")
     serializer_class = CountrySerializer
+    # versioned by the countries table content
+    version_querysets = (Country.objects.all(),)
@@ -1,12 +1,14 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
 
+from tbkb.views import ConditionalGetMixin
 from ..filters import DrugsFilterSet
-from ..models import Drug
+from ..models import Drug, GeneDrugResistanceAssociation
 from ..serializers import DrugReadSerializer
 
 
 class DrugViewSet(
+    ConditionalGetMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
     viewsets.mixins.RetrieveModelMixin,
@@ -17,3 +19,8 @@ class DrugViewSet(
     serializer_class = DrugReadSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = DrugsFilterSet
+    # versioned by the drugs table content, and drugs associations for filtering
+    version_querysets = (
+        Drug.objects.all(),
+        GeneDrugResistanceAssociation.objects.values("drug").distinct(),
+    )
@@ -9,6 +9,7 @@ gunicorn.SERVER = "unknown"
 wsgi_app = "tbkb.wsgi"
 workers = 4
 # threads = 4  # gthread worker type only
-timeout = 600
+# long running operations are executed by runjobs workers
+timeout = 120
 loglevel = "debug"
 bind = ["0.0.0.0:8000"]
@@ -1 +1,2 @@
 from . import gene_search_history
+from . import materialized_view_refresh
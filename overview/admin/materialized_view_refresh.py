@@ -0,0 +1,31 @@
+from django.contrib import admin
+
+from ..models import MaterializedViewRefresh
+
+
+@admin.register(MaterializedViewRefresh)
+class MaterializedViewRefreshAdmin(admin.ModelAdmin):
+    """Materialized view refresh log admin page."""
+
+    list_display = (
+        "view",
+        "trigger",
+        "started_at",
+        "finished_at",
+        "duration",
+        "row_count",
+        "concurrently",
+    )
+    list_filter = ("view", "trigger")
+    date_hierarchy = "started_at"
+    readonly_fields = (
+        "view",
+        "trigger",
+        "started_at",
+        "finished_at",
+        "duration",
+        "row_count",
+        "concurrently",
+        "sources",
+        "error",
+    )
@@ -3,3 +3,4 @@ from .base import NumberInFilter
 from .gene_drug_stats import GeneDrugStatsFilter
 from .resistance_stats import ResistanceStatsFilter
 from .search_gene import GeneSearchFilter
+from .trigram_search import prefix_search, trigram_search
@@ -2,6 +2,7 @@ from django.db.models import Max, Q
 from django_filters import rest_framework as filters
 
 from .base import NumberInFilter
+from .trigram_search import trigram_search
 from ..models.views import GeneDrugStats
 
 
@@ -28,6 +29,7 @@ class GeneDrugStatsFilter(filters.FilterSet):
         lookup_expr="in",
     )
     variant_grade = filters.CharFilter(lookup_expr="icontains")
+    search = filters.CharFilter(method="filter_search")
     order = filters.OrderingFilter(
         fields=(
             ("resistant_count", "resistantCount"),
@@ -38,6 +40,14 @@ class GeneDrugStatsFilter(filters.FilterSet):
         ),
     )
 
+    def filter_search(self, queryset, name, value):  # pylint: disable=unused-argument
+        """Typo-tolerant search by variant and its annotations, best matches first."""
+        return trigram_search(
+            queryset,
+            ("variant_name", "nucleodic_ann_name", "proteic_ann_name"),
+            value,
+        )
+
     @property
     def qs(self):
         """Apply default filtering by latest variant grade version."""
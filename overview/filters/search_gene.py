@@ -1,6 +1,7 @@
 from rest_framework.filters import SearchFilter
 
-from ..models import Gene, GeneSearchHistory
+from ..models import Gene
+from ..services.search_history import search_counters
 
 
 class GeneSearchFilter(SearchFilter):
@@ -9,15 +10,15 @@ class GeneSearchFilter(SearchFilter):
     def filter_queryset(self, request, queryset, view):
         """If there are one single search result, update its search counter."""
         queryset = super().filter_queryset(request, queryset, view)
+        if not self.get_search_terms(request):
+            return queryset
 
-        if queryset.count() == 1:
-            self.update_search_counter(queryset[0])
+        # two rows are enough to tell, no need to count all of them
+        found = list(queryset[:2])
+        if len(found) == 1:
+            self.update_search_counter(found[0])
         return queryset
 
     def update_search_counter(self, gene: Gene):
-        """Update search counter for selected Gene."""
-        search_history, _ = GeneSearchHistory.objects.get_or_create(
-            gene_db_crossref=gene.dbxref,
-        )
-        search_history.counter += 1
-        search_history.save()
+        """Count search of selected Gene, written to search history in batches."""
+        search_counters.add(gene.dbxref_id)
@@ -0,0 +1,43 @@
+from typing import Sequence
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models.functions import Greatest, Upper
+
+
+def upper_aliases(fields: Sequence[str]) -> dict:
+    """Upper-cased fields, the same expressions matviews trigram indexes are built on."""
+    return {f"{field}_upper": Upper(field) for field in fields}
+
+
+def trigram_search(queryset: QuerySet, fields: Sequence[str], term: str) -> QuerySet:
+    """
+    Rows, having the term or a word similar to it in any of the fields, best matches first.
+
+    Rows are annotated with `search_rank`, the best word similarity among the fields,
+    former ordering breaks ties.
+    """
+    term = term.upper()
+    aliases = upper_aliases(fields)
+    condition = Q()
+    ranks = []
+    for alias in aliases:
+        condition |= Q(**{f"{alias}__contains": term})
+        condition |= Q(**{f"{alias}__trigram_word_similar": term})
+        ranks.append(TrigramWordSimilarity(Value(term), F(alias)))
+    return (
+        queryset.alias(**aliases)
+        .filter(condition)
+        .annotate(search_rank=Greatest(*ranks) if len(ranks) > 1 else ranks[0])
+        .order_by("-search_rank", *queryset.query.order_by)
+    )
+
+
+def prefix_search(queryset: QuerySet, fields: Sequence[str], prefix: str) -> QuerySet:
+    """Rows with any of the fields starting with the prefix, case-insensitive."""
+    prefix = prefix.upper()
+    aliases = upper_aliases(fields)
+    condition = Q()
+    for alias in aliases:
+        condition |= Q(**{f"{alias}__startswith": prefix})
+    return queryset.alias(**aliases).filter(condition)
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from overview.services.materialized_views import RefreshMaterializedViewsService
+
+
+class Command(BaseCommand):
+    """
+    Refresh materialized views in dependency order.
+
+    Views, which don't depend on each other, are refreshed in parallel.
+    """
+
+    def add_arguments(self, parser):
+        """Add arguments to the command."""
+        parser.add_argument(
+            "views",
+            nargs="*",
+            help="View labels, like overview.Gene. Views, depending on them, "
+            "are refreshed too. All views by default",
+        )
+        parser.add_argument(
+            "--stale-only",
+            action="store_true",
+            help="Skip views, whose source tables haven't changed since the last refresh",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.MATVIEWS_REFRESH_CONCURRENCY,
+            help="How many views could be refreshed at once",
+        )
+
+    def handle(self, *args, **options):  # pylint: disable=unused-argument
+        """Handle the command."""
+        try:
+            refreshed = RefreshMaterializedViewsService.execute(
+                {
+                    "views": options["views"],
+                    "stale_only": options["stale_only"],
+                    "concurrency": options["concurrency"],
+                },
+            )
+        except (RuntimeError, ValidationError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(f"{len(refreshed)} views refreshed")
@@ -0,0 +1,127 @@
+# Generated by Django 4.1.10 on 2026-10-18 11:40
+
+import django.contrib.postgres.fields.ranges
+import django.db.models.deletion
+from django.db import migrations, models
+
+# SampleDrugResult was a materialized view, which is replaced with a table.
+# Dependent materialized views are dropped along with it,
+# and recreated by django_pgviews once migrations are applied.
+FILL_SQL = """
+INSERT INTO overview_sampledrugresult (
+    sample_id, sampling_date, country_id, drug_id, test_result
+)
+with
+-- get unique drug-sample-result rows
+sample_drug_result_contradictory as (
+    select distinct
+        sp.drug_id,
+        sp.sample_id,
+        sp.test_result
+    from submission_pdstest sp
+        where sp.staging IS FALSE
+            and sp.sample_id is not null
+),
+-- keep drug-sample rows that have only 1 unique test result
+sample_drug as (
+    select
+        drug_id,
+        sample_id
+    from sample_drug_result_contradictory sdr
+    group by drug_id, sample_id
+        having count(test_result) = 1
+)
+-- get sample-drug-result records, that have only 1 unique test result
+-- this is base table for drug/gene overview
+SELECT
+    sdr.sample_id,
+    ss.sampling_date,
+    coalesce(max(ssa.country_id), ss.country_id) country_id,
+    sdr.drug_id,
+    sdr.test_result
+FROM sample_drug_result_contradictory sdr
+     join sample_drug sd
+        on  sd.drug_id = sdr.drug_id
+        and sd.sample_id = sdr.sample_id
+     join submission_sample ss
+        on ss.id = sdr.sample_id
+     join submission_samplealias ssa
+        on ssa.sample_id=ss.id
+GROUP BY
+    sdr.sample_id,
+    ss.sampling_date,
+    ss.country_id,
+    sdr.drug_id,
+    sdr.test_result
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("genphen", "0012_alter_variantgrade_grade"),
+        ("submission", "0011_job"),
+        ("overview", "0002_remove_genesearchhistory_gene_db_crossref_id_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "DROP MATERIALIZED VIEW IF EXISTS overview_sampledrugresult CASCADE",
+            migrations.RunSQL.noop,
+        ),
+        migrations.DeleteModel(
+            name="SampleDrugResult",
+        ),
+        migrations.CreateModel(
+            name="SampleDrugResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "sampling_date",
+                    django.contrib.postgres.fields.ranges.DateRangeField(null=True),
+                ),
+                ("test_result", models.CharField(max_length=1)),
+                (
+                    "country",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="genphen.country",
+                    ),
+                ),
+                (
+                    "drug",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="genphen.drug",
+                    ),
+                ),
+                (
+                    "sample",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="submission.sample",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="sampledrugresult",
+            constraint=models.UniqueConstraint(
+                fields=("sample", "drug"),
+                name="overview_sampledrugresult_sample_drug_uniq",
+            ),
+        ),
+        migrations.RunSQL(FILL_SQL, migrations.RunSQL.noop),
+    ]
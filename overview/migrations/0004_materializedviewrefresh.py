@@ -0,0 +1,28 @@
+# Generated by Django 4.1.10 on 2026-10-18 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('overview', '0003_sampledrugresult_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterializedViewRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view', models.CharField(max_length=128)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(null=True)),
+                ('concurrently', models.BooleanField(default=False)),
+                ('sources', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='materializedviewrefresh',
+            index=models.Index(fields=['view', '-started_at'], name='matview_refresh__view__idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.1.10 on 2026-10-18 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('overview', '0004_materializedviewrefresh'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='materializedviewrefresh',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='materializedviewrefresh',
+            name='row_count',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='materializedviewrefresh',
+            name='trigger',
+            field=models.CharField(choices=[('command', 'Command'), ('gdra_import', 'Gdra Import')], default='command', max_length=32),
+        ),
+    ]
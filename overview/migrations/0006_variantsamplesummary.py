@@ -0,0 +1,194 @@
+# Generated by Django 4.1.10 on 2026-10-18 11:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Genotypes are loaded in bulk, mostly outside of the application,
+# so the summary is maintained by statement level triggers,
+# which process all rows of a statement at once through transition tables.
+TRIGGERS_SQL = """
+CREATE FUNCTION overview_variantsamplesummary_recalculate(pairs_variant_id bigint[], pairs_sample_id bigint[])
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO overview_variantsamplesummary (variant_id, sample_id, qualified)
+    SELECT
+        g.variant_id,
+        g.sample_id,
+        bool_or(g.genotyper = 'freebayes' AND g.quality > 120)
+    FROM unnest(pairs_variant_id, pairs_sample_id) pairs(variant_id, sample_id)
+        JOIN submission_genotype g
+            ON g.variant_id = pairs.variant_id
+            AND g.sample_id = pairs.sample_id
+    GROUP BY g.variant_id, g.sample_id
+    ON CONFLICT (variant_id, sample_id) DO UPDATE
+        SET qualified = excluded.qualified;
+
+    -- pairs without genotypes left
+    DELETE FROM overview_variantsamplesummary s
+    USING unnest(pairs_variant_id, pairs_sample_id) pairs(variant_id, sample_id)
+    WHERE s.variant_id = pairs.variant_id
+        AND s.sample_id = pairs.sample_id
+        AND NOT EXISTS (
+            SELECT FROM submission_genotype g
+            WHERE g.variant_id = s.variant_id
+                AND g.sample_id = s.sample_id
+        );
+END
+$$;
+
+CREATE FUNCTION overview_variantsamplesummary_genotype_inserted()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO overview_variantsamplesummary (variant_id, sample_id, qualified)
+    SELECT
+        variant_id,
+        sample_id,
+        bool_or(genotyper = 'freebayes' AND quality > 120)
+    FROM new_genotypes
+    GROUP BY variant_id, sample_id
+    ON CONFLICT (variant_id, sample_id) DO UPDATE
+        SET qualified = overview_variantsamplesummary.qualified OR excluded.qualified;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION overview_variantsamplesummary_genotype_updated()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM overview_variantsamplesummary_recalculate(array_agg(variant_id), array_agg(sample_id))
+    FROM (
+        SELECT variant_id, sample_id FROM old_genotypes
+        UNION
+        SELECT variant_id, sample_id FROM new_genotypes
+    ) pairs;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION overview_variantsamplesummary_genotype_deleted()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM overview_variantsamplesummary_recalculate(array_agg(variant_id), array_agg(sample_id))
+    FROM (
+        SELECT DISTINCT variant_id, sample_id FROM old_genotypes
+    ) pairs;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION overview_variantsamplesummary_genotype_truncated()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    DELETE FROM overview_variantsamplesummary;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER overview_variantsamplesummary_insert
+    AFTER INSERT ON submission_genotype
+    REFERENCING NEW TABLE AS new_genotypes
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION overview_variantsamplesummary_genotype_inserted();
+
+CREATE TRIGGER overview_variantsamplesummary_update
+    AFTER UPDATE ON submission_genotype
+    REFERENCING OLD TABLE AS old_genotypes NEW TABLE AS new_genotypes
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION overview_variantsamplesummary_genotype_updated();
+
+CREATE TRIGGER overview_variantsamplesummary_delete
+    AFTER DELETE ON submission_genotype
+    REFERENCING OLD TABLE AS old_genotypes
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION overview_variantsamplesummary_genotype_deleted();
+
+CREATE TRIGGER overview_variantsamplesummary_truncate
+    AFTER TRUNCATE ON submission_genotype
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION overview_variantsamplesummary_genotype_truncated();
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER overview_variantsamplesummary_insert ON submission_genotype;
+DROP TRIGGER overview_variantsamplesummary_update ON submission_genotype;
+DROP TRIGGER overview_variantsamplesummary_delete ON submission_genotype;
+DROP TRIGGER overview_variantsamplesummary_truncate ON submission_genotype;
+DROP FUNCTION overview_variantsamplesummary_genotype_inserted();
+DROP FUNCTION overview_variantsamplesummary_genotype_updated();
+DROP FUNCTION overview_variantsamplesummary_genotype_deleted();
+DROP FUNCTION overview_variantsamplesummary_genotype_truncated();
+DROP FUNCTION overview_variantsamplesummary_recalculate(bigint[], bigint[]);
+"""
+
+FILL_SQL = """
+INSERT INTO overview_variantsamplesummary (variant_id, sample_id, qualified)
+SELECT
+    variant_id,
+    sample_id,
+    bool_or(genotyper = 'freebayes' AND quality > 120) qualified
+FROM submission_genotype
+GROUP BY variant_id, sample_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("genphen", "0012_alter_variantgrade_grade"),
+        ("submission", "0011_job"),
+        ("overview", "0005_materializedviewrefresh_log"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VariantSampleSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("qualified", models.BooleanField()),
+                (
+                    "sample",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="submission.sample",
+                    ),
+                ),
+                (
+                    "variant",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="genphen.variant",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="variantsamplesummary",
+            constraint=models.UniqueConstraint(
+                fields=("variant", "sample"),
+                name="overview_variantsamplesummary_variant_sample_uniq",
+            ),
+        ),
+        migrations.RunSQL(FILL_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,177 @@
+# Generated by Django 4.1.10 on 2026-10-18 11:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Variant counters and the genotyped sample total follow variant sample summary,
+# which in turn follows genotypes, see 0006_variantsamplesummary.
+TRIGGERS_SQL = """
+CREATE FUNCTION overview_variantfrequency_add(variant_ids bigint[], deltas bigint[])
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO overview_variantfrequency (variant_id, sample_count)
+    SELECT variant_id, sum(delta)
+    FROM unnest(variant_ids, deltas) d(variant_id, delta)
+    GROUP BY variant_id
+    ORDER BY variant_id
+    ON CONFLICT (variant_id) DO UPDATE
+        SET sample_count = overview_variantfrequency.sample_count + excluded.sample_count;
+
+    DELETE FROM overview_variantfrequency
+    WHERE variant_id = ANY(variant_ids)
+        AND sample_count <= 0;
+END
+$$;
+
+CREATE FUNCTION overview_variantfrequency_summary_inserted()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM overview_variantfrequency_add(array_agg(variant_id), array_agg(1::bigint))
+    FROM new_summary
+    WHERE qualified;
+
+    -- samples, which had no genotypes before
+    INSERT INTO overview_genotypedsamplecount AS c (id, sample_count)
+    SELECT 1, count(*)
+    FROM (
+        SELECT sample_id, count(*) n
+        FROM new_summary
+        GROUP BY sample_id
+    ) t
+    WHERE t.n = (
+        SELECT count(*)
+        FROM overview_variantsamplesummary s
+        WHERE s.sample_id = t.sample_id
+    )
+    ON CONFLICT (id) DO UPDATE
+        SET sample_count = c.sample_count + excluded.sample_count;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION overview_variantfrequency_summary_updated()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM overview_variantfrequency_add(array_agg(variant_id), array_agg(delta))
+    FROM (
+        SELECT variant_id, 1::bigint delta FROM new_summary WHERE qualified
+        UNION ALL
+        SELECT variant_id, -1::bigint FROM old_summary WHERE qualified
+    ) d;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION overview_variantfrequency_summary_deleted()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM overview_variantfrequency_add(array_agg(variant_id), array_agg(-1::bigint))
+    FROM old_summary
+    WHERE qualified;
+
+    -- samples, which have no genotypes left
+    INSERT INTO overview_genotypedsamplecount AS c (id, sample_count)
+    SELECT 1, -count(DISTINCT sample_id)
+    FROM old_summary o
+    WHERE NOT EXISTS (
+        SELECT FROM overview_variantsamplesummary s
+        WHERE s.sample_id = o.sample_id
+    )
+    ON CONFLICT (id) DO UPDATE
+        SET sample_count = c.sample_count + excluded.sample_count;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER overview_variantfrequency_insert
+    AFTER INSERT ON overview_variantsamplesummary
+    REFERENCING NEW TABLE AS new_summary
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION overview_variantfrequency_summary_inserted();
+
+CREATE TRIGGER overview_variantfrequency_update
+    AFTER UPDATE ON overview_variantsamplesummary
+    REFERENCING OLD TABLE AS old_summary NEW TABLE AS new_summary
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION overview_variantfrequency_summary_updated();
+
+CREATE TRIGGER overview_variantfrequency_delete
+    AFTER DELETE ON overview_variantsamplesummary
+    REFERENCING OLD TABLE AS old_summary
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION overview_variantfrequency_summary_deleted();
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER overview_variantfrequency_insert ON overview_variantsamplesummary;
+DROP TRIGGER overview_variantfrequency_update ON overview_variantsamplesummary;
+DROP TRIGGER overview_variantfrequency_delete ON overview_variantsamplesummary;
+DROP FUNCTION overview_variantfrequency_summary_inserted();
+DROP FUNCTION overview_variantfrequency_summary_updated();
+DROP FUNCTION overview_variantfrequency_summary_deleted();
+DROP FUNCTION overview_variantfrequency_add(bigint[], bigint[]);
+"""
+
+FILL_SQL = """
+INSERT INTO overview_genotypedsamplecount (id, sample_count)
+SELECT 1, count(DISTINCT sample_id)
+FROM overview_variantsamplesummary;
+
+INSERT INTO overview_variantfrequency (variant_id, sample_count)
+SELECT variant_id, count(*)
+FROM overview_variantsamplesummary
+WHERE qualified
+GROUP BY variant_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("genphen", "0012_alter_variantgrade_grade"),
+        ("overview", "0006_variantsamplesummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenotypedSampleCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sample_count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="VariantFrequency",
+            fields=[
+                (
+                    "variant",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        serialize=False,
+                        to="genphen.variant",
+                    ),
+                ),
+                ("sample_count", models.IntegerField(db_index=True)),
+            ],
+        ),
+        migrations.RunSQL(FILL_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+    ]
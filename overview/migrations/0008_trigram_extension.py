@@ -0,0 +1,17 @@
+# Generated by Django 4.1.10 on 2026-10-18 14:05
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # trigram GIN indexes of Gene and GeneDrugStats matviews are created by pgviews,
+    # after migrations, so the extension is in place by then
+
+    dependencies = [
+        ("overview", "0007_variantfrequency"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+    ]
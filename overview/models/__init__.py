@@ -1,2 +1,6 @@
 from .gene_search_history import GeneSearchHistory
+from .materialized_view_refresh import MaterializedViewRefresh
+from .sample_drug_result import SampleDrugResult
+from .variant_frequency import GenotypedSampleCount, VariantFrequency
+from .variant_sample_summary import VariantSampleSummary
 from .views import *
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.db import models
+from django.db.models import Max
+
+
+class MaterializedViewRefreshQuerySet(models.QuerySet):
+    """Custom queryset for materialized view refreshes."""
+
+    def latest_by_view(self) -> dict:
+        """Latest successful refresh of every view, by view label."""
+        return {
+            refresh.view: refresh
+            for refresh in self.filter(finished_at__isnull=False)
+            .order_by("view", "-started_at")
+            .distinct("view")
+        }
+
+    def last_refreshes(self, views: Iterable[str]) -> Dict[str, datetime]:
+        """Time of the latest successful refresh of every view, by view label."""
+        return dict(
+            self.filter(view__in=views, finished_at__isnull=False)
+            .values("view")
+            .annotate(last=Max("finished_at"))
+            .values_list("view", "last")
+            .order_by(),
+        )
+
+
+class MaterializedViewRefresh(models.Model):
+    """Materialized view refresh, performed by refresh_matviews command."""
+
+    objects = MaterializedViewRefreshQuerySet.as_manager()
+
+    class Trigger(models.TextChoices):
+        """What caused the refresh."""
+
+        COMMAND = "command"
+        GDRA_IMPORT = "gdra_import"
+
+    view = models.CharField(max_length=128)
+    """View model label, like overview.GeneDrugStats."""
+    trigger = models.CharField(max_length=32, choices=Trigger.choices, default=Trigger.COMMAND)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True)
+    """Empty while the refresh is running, or if it failed."""
+    row_count = models.BigIntegerField(null=True)
+    """Rows in the view after the refresh."""
+    error = models.TextField(blank=True)
+    concurrently = models.BooleanField(default=False)
+    sources = models.JSONField(default=dict)
+    """Changes counters of the view source tables, taken before the refresh."""
+
+    class Meta:
+        """Meta class."""
+
+        indexes = [
+            models.Index(fields=["view", "-started_at"], name="matview_refresh__view__idx"),
+        ]
+
+    @property
+    def duration(self) -> Optional[timedelta]:
+        """How long the refresh took."""
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def __str__(self):
+        """Return string representation of a model."""
+        return f"{self.view} refresh at {self.started_at}"
@@ -0,0 +1,129 @@
+from typing import Iterable, Optional
+
+from django.contrib.postgres.fields import DateRangeField
+from django.db import connection, models, transaction
+
+SAMPLEDRUGRESULT_SQL = """
+with
+-- get unique drug-sample-result rows
+sample_drug_result_contradictory as (
+    select distinct
+        sp.drug_id,
+        sp.sample_id,
+        sp.test_result
+    from submission_pdstest sp
+        where sp.staging IS FALSE
+            and sp.sample_id is not null
+            -- tests without a result are not taken into account
+            and sp.test_result is not null
+            {sample_filter}
+),
+-- keep drug-sample rows that have only 1 unique test result
+sample_drug as (
+    select
+        drug_id,
+        sample_id
+    from sample_drug_result_contradictory sdr
+    group by drug_id, sample_id
+        having count(test_result) = 1
+)
+-- get sample-drug-result records, that have only 1 unique test result
+-- this is base table for drug/gene overview
+SELECT
+    sdr.sample_id,
+    ss.sampling_date,
+    coalesce(max(ssa.country_id), ss.country_id) country_id,
+    sdr.drug_id,
+    sdr.test_result
+FROM sample_drug_result_contradictory sdr
+     join sample_drug sd
+        on  sd.drug_id = sdr.drug_id
+        and sd.sample_id = sdr.sample_id
+     join submission_sample ss
+        on ss.id = sdr.sample_id
+     join submission_samplealias ssa
+        on ssa.sample_id=ss.id
+GROUP BY
+    sdr.sample_id,
+    ss.sampling_date,
+    ss.country_id,
+    sdr.drug_id,
+    sdr.test_result
+"""
+
+COLUMNS = "sample_id, sampling_date, country_id, drug_id, test_result"
+
+
+class SampleDrugResultQuerySet(models.QuerySet):
+    """Custom queryset for sample drug results."""
+
+    def rebuild(self, sample_ids: Optional[Iterable[int]] = None):
+        """
+        Recalculate results of the samples from PDS tests.
+
+        Only rows of the given samples are replaced,
+        or the whole table when no samples are given.
+        """
+        table = self.model._meta.db_table  # pylint: disable=protected-access
+        if sample_ids is None:
+            delete_sql = f"DELETE FROM {table}"
+            select_sql = SAMPLEDRUGRESULT_SQL.format(sample_filter="")
+            params = []
+        else:
+            sample_ids = sorted(set(sample_ids))
+            if not sample_ids:
+                return
+            delete_sql = f"DELETE FROM {table} WHERE sample_id = ANY(%s)"
+            select_sql = SAMPLEDRUGRESULT_SQL.format(
+                sample_filter="and sp.sample_id = ANY(%s)",
+            )
+            params = [sample_ids]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(delete_sql, params)
+            cursor.execute(f"INSERT INTO {table} ({COLUMNS}) {select_sql}", params)
+
+
+class SampleDrugResult(models.Model):
+    """
+    Sample drug test result, based on PDS tests.
+
+    Only production (non-staging) tests of matched samples count,
+    samples with contradictory results for a drug are left out.
+    Rows are recalculated per sample on package acceptance,
+    full rebuild is done with refresh(), by refresh_matviews command
+    along with materialized views, when tables below change.
+    """
+
+    rebuild_sources = ("submission_pdstest", "submission_sample", "submission_samplealias")
+
+    # we will use this table for Drug/Gene overview
+    # also SampleDrugResultStats matview is based on this table
+
+    objects = SampleDrugResultQuerySet.as_manager()
+
+    sample = models.ForeignKey("submission.Sample", models.DO_NOTHING, db_constraint=False)
+    drug = models.ForeignKey("genphen.Drug", models.DO_NOTHING, db_constraint=False)
+    country = models.ForeignKey(
+        "genphen.Country",
+        models.DO_NOTHING,
+        null=True,
+        db_constraint=False,
+    )
+    sampling_date = DateRangeField(null=True)
+    test_result = models.CharField(max_length=1)  # SRI
+
+    class Meta:
+        """Options for a model."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sample", "drug"],
+                name="overview_sampledrugresult_sample_drug_uniq",
+            ),
+        ]
+
+    @classmethod
+    def refresh(cls, concurrently=False):  # pylint: disable=unused-argument
+        """Rebuild the whole table, same interface as materialized views have."""
+        cls.objects.rebuild()
@@ -0,0 +1,88 @@
+import math
+
+from django.db import connection, models, transaction
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+
+# the same numbers are maintained incrementally by overview_variantsamplesummary triggers
+VARIANTFREQUENCY_SQL = """
+SELECT variant_id, count(*)
+FROM overview_variantsamplesummary
+WHERE qualified
+GROUP BY variant_id
+"""
+
+GENOTYPEDSAMPLECOUNT_SQL = """
+SELECT count(DISTINCT sample_id)
+FROM overview_variantsamplesummary
+"""
+
+
+class VariantFrequencyQuerySet(models.QuerySet):
+    """Custom queryset for variant frequencies."""
+
+    def with_frequency(self):
+        """Annotate frequency of the variant among all genotyped samples, in percents."""
+        total = GenotypedSampleCount.get()
+        return self.annotate(
+            frequency=ExpressionWrapper(
+                F("sample_count") * Value(100.0) / Value(total or 1),
+                output_field=FloatField(),
+            ),
+        )
+
+    def frequency_gte(self, percent: float):
+        """Variants with frequency of at least given percents, index scan on sample count."""
+        total = GenotypedSampleCount.get()
+        return self.filter(sample_count__gte=math.ceil(percent * total / 100))
+
+    def rebuild(self):
+        """Recalculate frequencies and the sample total from variant sample summary."""
+        table = self.model._meta.db_table  # pylint: disable=protected-access
+        total_model = GenotypedSampleCount.objects.model
+        total_table = total_model._meta.db_table  # pylint: disable=protected-access
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table} (variant_id, sample_count) {VARIANTFREQUENCY_SQL}")
+            cursor.execute(f"DELETE FROM {total_table}")
+            cursor.execute(
+                f"INSERT INTO {total_table} (id, sample_count) "
+                f"SELECT 1, ({GENOTYPEDSAMPLECOUNT_SQL})",
+            )
+
+
+class VariantFrequency(models.Model):
+    """
+    Amount of samples, carrying a variant.
+
+    Only freebayes calls with quality over 120 count, as in GeneDrugStats.
+    Counters are updated by overview_variantsamplesummary triggers,
+    which in turn follow genotypes, so frequencies are never recalculated from scratch.
+    """
+
+    objects = VariantFrequencyQuerySet.as_manager()
+
+    variant = models.OneToOneField(
+        "genphen.Variant",
+        models.DO_NOTHING,
+        primary_key=True,
+        db_constraint=False,
+    )
+    sample_count = models.IntegerField(db_index=True)
+
+    @classmethod
+    def refresh(cls, concurrently=False):  # pylint: disable=unused-argument
+        """Rebuild the whole table, same interface as materialized views have."""
+        cls.objects.rebuild()
+
+
+class GenotypedSampleCount(models.Model):
+    """Amount of samples with any genotype, the denominator of variant frequencies. Single row."""
+
+    objects = models.Manager()
+
+    sample_count = models.IntegerField(default=0)
+
+    @classmethod
+    def get(cls) -> int:
+        """Current amount of genotyped samples."""
+        return cls.objects.filter(pk=1).values_list("sample_count", flat=True).first() or 0
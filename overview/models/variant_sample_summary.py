@@ -0,0 +1,63 @@
+from django.db import connection, models, transaction
+
+# the same rows are maintained incrementally by submission_genotype triggers
+VARIANTSAMPLESUMMARY_SQL = """
+SELECT
+    variant_id,
+    sample_id,
+    bool_or(genotyper = 'freebayes' AND quality > 120) qualified
+FROM submission_genotype
+GROUP BY variant_id, sample_id
+"""
+
+
+class VariantSampleSummaryQuerySet(models.QuerySet):
+    """Custom queryset for variant sample summary."""
+
+    def rebuild(self):
+        """Recalculate the whole table from genotypes."""
+        table = self.model._meta.db_table  # pylint: disable=protected-access
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(
+                f"INSERT INTO {table} (variant_id, sample_id, qualified) "
+                f"{VARIANTSAMPLESUMMARY_SQL}",
+            )
+
+
+class VariantSampleSummary(models.Model):
+    """
+    Samples, carrying a variant, one row per variant and sample.
+
+    Collapses genotypes of all genotypers, so that GeneDrugStats
+    aggregates from here instead of scanning submission_genotype.
+    Rows are maintained by submission_genotype triggers,
+    so genotype loads, done outside of the application, keep it up to date too.
+    """
+
+    objects = VariantSampleSummaryQuerySet.as_manager()
+
+    variant = models.ForeignKey(
+        "genphen.Variant",
+        models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,  # covered by the unique constraint
+    )
+    sample = models.ForeignKey("submission.Sample", models.DO_NOTHING, db_constraint=False)
+    qualified = models.BooleanField()
+    """Variant is called by freebayes with quality over 120, counts for test results."""
+
+    class Meta:
+        """Options for a model."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["variant", "sample"],
+                name="overview_variantsamplesummary_variant_sample_uniq",
+            ),
+        ]
+
+    @classmethod
+    def refresh(cls, concurrently=False):  # pylint: disable=unused-argument
+        """Rebuild the whole table, same interface as materialized views have."""
+        cls.objects.rebuild()
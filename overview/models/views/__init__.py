@@ -1,6 +1,5 @@
 from .gene import Gene
 from .gene_drug_stats import GeneDrugStats
 from .global_resistance import GlobalResistanceStats
-from .sample_drug_result import SampleDrugResult
 from .sample_drug_result_stats import SampleDrugResultStats
 from .drug_gene import DrugGene
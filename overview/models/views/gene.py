@@ -1,4 +1,7 @@
+from django.contrib.postgres.fields import IntegerRangeField
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django_pgviews import view
 
 
@@ -50,6 +53,11 @@ SELECT
     l.start_pos,
     l.end_pos,
     l.strand,
+    -- inclusive, as biosql locations are; indexed for genome context overlap lookups
+    CASE
+        WHEN l.start_pos IS NOT NULL AND l.end_pos IS NOT NULL
+        THEN int4range(l.start_pos, l.end_pos, '[]')
+    END AS location,
     gene_name.value gene_name,
     locus_tag.value locus_tag,
     gene_description.value gene_description,
@@ -95,6 +103,7 @@ class Gene(view.MaterializedView):
     start_pos = models.IntegerField(null=True)
     end_pos = models.IntegerField(null=True)
     strand = models.IntegerField(null=True)
+    location = IntegerRangeField(null=True)
     gene_name = models.TextField(null=True)
     locus_tag = models.TextField(null=True)
     gene_description = models.TextField(null=True)
@@ -105,6 +114,23 @@ class Gene(view.MaterializedView):
         """Meta class."""
 
         managed = False
+        indexes = [
+            GistIndex(fields=["location"], name="overview_gene_location_gist"),
+            # trigram indexes serve both fuzzy search and icontains lookups,
+            # which compare upper-cased values
+            GinIndex(
+                OpClass(Upper("gene_name"), name="gin_trgm_ops"),
+                name="overview_gene_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("locus_tag"), name="gin_trgm_ops"),
+                name="overview_gene_locus_tag_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("ncbi_id"), name="gin_trgm_ops"),
+                name="overview_gene_ncbi_id_trgm",
+            ),
+        ]
 
     def __str__(self):
         """Return string representation of a model."""
@@ -1,35 +1,54 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
-from django.db.models import Sum
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce, Upper
 from django_pgviews import view
 
 from genphen.models import Drug
 
 
+STATS_FIELDS = (
+    "drug",
+    "drug__drug_name",
+    "gene_name",
+    "nucleodic_ann_name",
+    "proteic_ann_name",
+    "consequence",
+    "variant_id",
+    "variant_name",
+    "variant_grade",
+    "variant_grade_version",
+    "gene_db_crossref",
+    "start_pos",
+    "end_pos",
+    "global_frequency",
+    "total_counts",
+)
+
+
 class GeneDrugStatsQueryset(models.QuerySet):
     """GeneDrugStats queryset manager."""
 
+    def rows(self):
+        """
+        Matview rows, in the same shape as .with_stats() gives them.
+
+        Rows are unique by the concurrent index already,
+        so they are not aggregated again, and could be read by index page by page.
+        """
+        return self.values(
+            *STATS_FIELDS,
+            "resistant_count",
+            "susceptible_count",
+            "intermediate_count",
+        )
+
     def with_stats(self):
         """Sum results by drug, variant, gene name, etc."""
         return (
             self
             .select_related("drug__data")
-            .values(
-                "drug",
-                "drug__drug_name",
-                "gene_name",
-                "nucleodic_ann_name",
-                "proteic_ann_name",
-                "consequence",
-                "variant_id",
-                "variant_name",
-                "variant_grade",
-                "variant_grade_version",
-                "gene_db_crossref",
-                "start_pos",
-                "end_pos",
-                "global_frequency",
-                "total_counts",
-            )
+            .values(*STATS_FIELDS)
             .order_by("start_pos")
             .annotate(
                 resistant_count=Sum("resistant_count"),
@@ -40,30 +59,26 @@ class GeneDrugStatsQueryset(models.QuerySet):
 
 
 OVERVIEW_GENEDRUGSTATS_SQL = """
-with overall_samples as (
+-- variant samples are collapsed from genotypes as they load,
+-- see VariantSampleSummary
+with variant_samples as (
     select
-        count(distinct sample_id)
-    from submission_genotype
-    -- TODO add freebayes filter here too?
-),
-variant_samples as (
-    select distinct
         variant_id,
         sample_id
-    from submission_genotype
-    where genotyper = 'freebayes'
-        and quality>120
+    from overview_variantsamplesummary
+    where qualified
 ),
+-- frequencies are counted as genotypes load, see VariantFrequency
 global_frequencies as (
     select
         variant_id,
-        count(sample_id) total_samples,
+        vf.sample_count total_samples,
         (
-            count(sample_id) * 100.0 /
-            (select * from overall_samples)
+            vf.sample_count * 100.0 /
+            -- TODO add freebayes filter to the denominator too?
+            (select sample_count from overview_genotypedsamplecount where id = 1)
         )::float as global_frequency
-    from variant_samples
-    group by variant_id
+    from overview_variantfrequency vf
 ),
 fapg_distinct as (
     select distinct
@@ -144,7 +159,6 @@ class GeneDrugStats(view.MaterializedView):
     """Gene association with drug, full info of drug and gene view."""
 
     dependencies = [
-        "overview.SampleDrugResult",
         "overview.Gene",
     ]
 
@@ -191,3 +205,34 @@ class GeneDrugStats(view.MaterializedView):
         """GeneDrugStats options class."""
 
         managed = False  # this is a matview
+        # trigram indexes serve search-as-you-type icontains filters and fuzzy search
+        indexes = [
+            GinIndex(
+                OpClass(Upper("gene_name"), name="gin_trgm_ops"),
+                name="overview_gds_gene_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("variant_name"), name="gin_trgm_ops"),
+                name="overview_gds_variant_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("nucleodic_ann_name"), name="gin_trgm_ops"),
+                name="overview_gds_nucl_ann_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("proteic_ann_name"), name="gin_trgm_ops"),
+                name="overview_gds_prot_ann_trgm",
+            ),
+            # keyset pagination, see GeneDrugStatsPagination
+            models.Index(
+                Coalesce("start_pos", Value(2147483647)),
+                F("variant_id"),
+                F("drug"),
+                F("gene_db_crossref"),
+                Coalesce("nucleodic_ann_name", Value("")),
+                Coalesce("proteic_ann_name", Value("")),
+                Coalesce("consequence", Value("")),
+                Coalesce("variant_grade_version", Value(-1)),
+                name="overview_gds_keyset",
+            ),
+        ]
@@ -1,130 +1,109 @@
 from django.db import models
-from django.db.models import F, Case, When, Value
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
 from django_pgviews import view
 
+from genphen.models import Drug
+from ...resistance import (
+    DRUG_NAMES,
+    ResistanceType,
+    check_drug_ids,
+    drug_bit_sql,
+    resistance_type_sql,
+    rifampicin_sql,
+)
+
+COUNTERS = (
+    "total_samples",
+    "mono_resistant",
+    "poly_resistant",
+    "multidrug_resistant",
+    "extensive_drug_resistant",
+    "rifampicin_resistant",
+)
+
 
 class GlobalResistanceStatsQuerySet(models.QuerySet):
     """GlobalResistanceStats custom queryset."""
 
-    def with_ratios(self):
-        """Annotate with ratios, follow old naming."""
-        total = F("total_samples")
-        # pylint: disable=unnecessary-lambda-assignment
-        total_ratio = lambda field: Case(
-            When(total_samples=0, then=Value(0.0)),
-            default=field / total * 100.0,
-        )
-        return self.values(
-            "total_samples",
-            "mono_resistant",
-            "poly_resistant",
-            "multidrug_resistant",
-            "extensive_drug_resistant",
-            "rifampicin_resistant",
-        ).annotate(
-            ratio_mono_res=total_ratio(F("mono_resistant")),
-            ratio_poly_res=total_ratio(F("poly_resistant")),
-            ratio_multi_drug_res=total_ratio(F("multidrug_resistant")),
-            ratio_ext_drug_res=total_ratio(F("extensive_drug_resistant")),
-            ratio_rif_res=total_ratio(F("rifampicin_resistant")),
+    def totals(self) -> dict:
+        """Counters, summed over all countries and years."""
+        return self.aggregate(**{name: Coalesce(Sum(name), 0) for name in COUNTERS})
+
+    def by_country(self):
+        """Counters, summed by country, samples of unknown country are left out."""
+        return (
+            self.filter(country__isnull=False)
+            .values("country")
+            .order_by("country")
+            # aliased, as annotation can't shadow model field
+            .annotate(**{f"{name}_sum": Sum(name) for name in COUNTERS})
         )
 
 
-GLOBALRESISTANCESTATS_SQL = """
+_TYPES = resistance_type_sql("drugs_mask", "rifampicin_genotypic")
+
+# resistant drugs set of a sample is collapsed into a bitmask of drug groups
+# in a single pass over sample results, see overview.resistance for the rules
+GLOBALRESISTANCESTATS_SQL = f"""
 with resistant as (
     select
-        sample_id,
-        array_agg(drug_name) drug_arr
+        r.sample_id,
+        bit_or({drug_bit_sql("r.drug_id")}) drugs_mask
     from overview_sampledrugresult r
-        join genphen_drug d on d.drug_id = r.drug_id
     where r.test_result = 'R'
-    group by sample_id
+    group by r.sample_id
 ),
 
--- Mono-resistance:
--- resistance to one first-line anti-TB drug only
-mono_resistant as (
-    select *
-    from resistant
-    where drug_arr::text[] in (
-                       array ['Ethambutol'],
-                       array ['Isoniazid'],
-                       array ['Pyrazinamide'],
-                       array ['Rifampicin']
-                      )
+rifampicin_genotypic as (
+    select distinct gr.sample_id
+    from submission_genotyperesistance gr
+    where gr.version = 1
+        and gr.resistance_flag = 'R'
+        and {rifampicin_sql("gr.drug_id")}
 ),
 
--- Poly-resistance:
--- resistance to more than one first-line anti-TB drug,
--- other than both isoniazid and rifampicin
-poly_resistant as (
-    select *
-    from resistant
-    where (select count(*) from (
-        select unnest(drug_arr)
-        intersect
-        select unnest(array ['Ethambutol', 'Isoniazid', 'Pyrazinamide', 'Rifampicin'])
-    ) intersection ) > 1
-        and drug_arr::text[] != array ['Isoniazid', 'Rifampicin']
-),
-
--- Multi-drug resistance (MDR):
--- resistance to at least both isoniazid and rifampicin
-multidrug_resistant as (
-    select *
-    from resistant
-    -- where left array is included in drug_arr
-    where array ['Isoniazid', 'Rifampicin'] <@ drug_arr::text[]
-),
-
--- Extensive drug resistance (XDR):
--- resistance to any fluoroquinolone, and at least one of three second-line injectable drugs
--- (capreomycin, kanamycin and amikacin), in addition to multidrug resistance
-extensive_drug_resistant as (
-    select *
-    -- all MDR
-    from multidrug_resistant
-    -- that fluoroquinolone resistant
-    where array ['Fluoroquinolones'] <@ drug_arr::text[]
-    -- and at least one of three second-line injectable resistant
-    and array ['Capreomycin', 'Kanamycin', 'Amikacin']  && drug_arr::text[]
+alias_country as (
+    select sample_id, max(country_id) country_id
+    from submission_samplealias
+    group by sample_id
 ),
 
--- Rifampicin resistance (RR):
--- resistance to rifampicin detected using phenotypic or genotypic methods,
--- with or without resistance to other anti-TB drugs.
--- It includes any resistance to rifampicin,
--- in the form of mono-resistance, poly-resistance, MDR or XDR.
-rifampicin_resistant as (
-    -- selecting from overview_sample_drug_result_stats
-    -- because it has genotypic data too
-    select count(resistant)
-    from overview_sampledrugresultstats osdrs
-    join genphen_drug d on d.drug_id = osdrs.drug_id
-    where d.drug_name = 'Rifampicin'
+samples as (
+    select
+        coalesce(ac.country_id, ss.country_id) country_id,
+        extract(year from lower(ss.sampling_date))::integer sampling_year,
+        coalesce(r.drugs_mask, 0) drugs_mask,
+        rg.sample_id is not null rifampicin_genotypic
+    from submission_sample ss
+        left join alias_country ac on ac.sample_id = ss.id
+        left join resistant r on r.sample_id = ss.id
+        left join rifampicin_genotypic rg on rg.sample_id = ss.id
 )
 
 select
-    (select count(*) from submission_sample)        total_samples,
---     (select count(*) from resistant)                total_sum,
-    (select count(*) from mono_resistant)           mono_resistant,
-    (select count(*) from poly_resistant)           poly_resistant,
-    (select count(*) from multidrug_resistant)      multidrug_resistant,
-    (select count(*) from extensive_drug_resistant) extensive_drug_resistant,
-    (select * from rifampicin_resistant)            rifampicin_resistant
+    country_id,
+    sampling_year,
+    count(*) total_samples,
+    count(*) filter (where {_TYPES[ResistanceType.MONO]}) mono_resistant,
+    count(*) filter (where {_TYPES[ResistanceType.POLY]}) poly_resistant,
+    count(*) filter (where {_TYPES[ResistanceType.MULTIDRUG]}) multidrug_resistant,
+    count(*) filter (where {_TYPES[ResistanceType.EXTENSIVE]}) extensive_drug_resistant,
+    count(*) filter (where {_TYPES[ResistanceType.RIFAMPICIN]}) rifampicin_resistant
+from samples
+group by country_id, sampling_year
 """
 
 
 class GlobalResistanceStats(view.MaterializedView):
     """
-    Single-record view with global sample stats for TB drug-resistance.
+    Sample stats for TB drug-resistance, by country and sampling year.
 
-    Reference link:
-    https://www.who.int/teams/global-tuberculosis-programme/diagnosis-treatment/treatment-of-drug-resistant-tb/types-of-tb-drug-resistance
+    Resistance types are defined in overview.resistance.
     """
 
+    # refreshed along with per drug stats, built from the same sample results
     dependencies = [
-        "overview.SampleDrugResult",
         "overview.SampleDrugResultStats",
     ]
     sql = GLOBALRESISTANCESTATS_SQL
@@ -136,9 +115,23 @@ class GlobalResistanceStats(view.MaterializedView):
 
     objects = GlobalResistanceStatsQuerySet.as_manager()
 
+    country = models.ForeignKey("genphen.Country", models.DO_NOTHING, null=True)
+    sampling_year = models.IntegerField(null=True)
     total_samples = models.IntegerField()
     mono_resistant = models.IntegerField()
     poly_resistant = models.IntegerField()
     multidrug_resistant = models.IntegerField()
     extensive_drug_resistant = models.IntegerField()
     rifampicin_resistant = models.IntegerField()
+
+    @classmethod
+    def refresh(cls, concurrently=False):
+        """Refresh the view, if drug ids the SQL has are still the right drugs."""
+        check_drug_ids(
+            dict(
+                Drug.objects.filter(
+                    Q(drug_id__in=DRUG_NAMES) | Q(drug_name__in=DRUG_NAMES.values()),
+                ).values_list("drug_id", "drug_name"),
+            ),
+        )
+        super().refresh(concurrently=concurrently)
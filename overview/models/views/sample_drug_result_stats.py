@@ -75,7 +75,6 @@ class SampleDrugResultStatsQuerySet(models.QuerySet):
 class SampleDrugResultStats(view.MaterializedView):
     """Sample to drug resistance statistics view, based on PDS tests."""
 
-    dependencies = ["overview.SampleDrugResult"]
     sql = SAMPLEDRUGRESULTSTATS_SQL
 
     objects = SampleDrugResultStatsQuerySet.as_manager()
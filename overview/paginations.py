@@ -1,4 +1,14 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Optional
+
+from django.db.models import F, Field, Func, Value
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class PageSizePageNumberPagination(PageNumberPagination):
@@ -17,3 +27,152 @@ class PluggablePageSizePageNumberPagination(PageSizePageNumberPagination):
         if request.GET.get("paginated"):
             return super().paginate_queryset(queryset, request, view)
         return None
+
+
+class Row(Func):  # pylint: disable=abstract-method
+    """Row constructor, compared column by column, the way btree indexes are ordered."""
+
+    function = "ROW"
+    output_field = Field()
+
+
+class KeysetPaginationMixin:
+    """
+    Opt-in keyset pagination, enabled by `cursor` query param.
+
+    Pages are sought by `keyset` values of the last row of the previous page,
+    instead of OFFSET, so deep pages take as long as the first one,
+    and rows are not counted. Pass empty cursor for the first page,
+    the rest are linked by `next`. Rows are ordered by the keyset in this mode,
+    so requested ordering is rejected.
+
+    Rows are sought with a single row-value comparison, which is an index range scan,
+    given an index on the same keyset expressions.
+    """
+
+    cursor_query_param = "cursor"
+    keyset: tuple = ()
+    """Fields, uniquely identifying a row."""
+    keyset_nulls: dict = {}
+    """Values, nullable keyset fields are compared and ordered as, instead of nulls."""
+    ordering_query_param: Optional[str] = None
+    """Ordering param of the view filters, if any."""
+
+    def keyset_expressions(self) -> list:
+        """Keyset fields, with nulls replaced, as they are indexed."""
+        return [
+            Coalesce(F(field), Value(self.keyset_nulls[field]))
+            if field in self.keyset_nulls
+            else F(field)
+            for field in self.keyset
+        ]
+
+    def keyset_values(self, row) -> list:
+        """Keyset values of the row, with nulls replaced."""
+        values = []
+        for field in self.keyset:
+            value = row[field] if isinstance(row, dict) else getattr(row, field)
+            values.append(self.keyset_nulls.get(field) if value is None else value)
+        return values
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Use keyset pagination, when cursor is given."""
+        if self.cursor_query_param not in request.GET:
+            self.cursor_mode = False  # pylint: disable=attribute-defined-outside-init
+            return super().paginate_queryset(queryset, request, view)
+
+        if self.ordering_query_param and request.GET.get(self.ordering_query_param):
+            raise ValidationError(
+                {self.ordering_query_param: "Ordering is not supported with a cursor."},
+            )
+
+        # pylint: disable=attribute-defined-outside-init
+        self.cursor_mode = True
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        expressions = self.keyset_expressions()
+        queryset = queryset.order_by(*expressions)
+        cursor = self.decode_cursor(request.GET[self.cursor_query_param])
+        if cursor is not None:
+            queryset = queryset.alias(keyset=Row(*expressions)).filter(
+                keyset__gt=Row(*(Value(value) for value in cursor)),
+            )
+
+        rows = list(queryset[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.rows = rows[:page_size]
+        return self.rows
+
+    def get_paginated_response(self, data):
+        """Link the next page only, there is no count in cursor mode."""
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_next_link(self):
+        """Link to the page after the last row."""
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.keyset_values(self.rows[-1])),
+        )
+
+    @staticmethod
+    def encode_cursor(values) -> str:
+        """Pack keyset values into url-safe string."""
+        return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, cursor: str):
+        """Unpack keyset values, None for the first page."""
+        if not cursor:
+            return None
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError) as exc:
+            raise NotFound("Invalid cursor.") from exc
+        if not isinstance(values, list) or len(values) != len(self.keyset):
+            raise NotFound("Invalid cursor.")
+        return values
+
+
+class GenePagination(KeysetPaginationMixin, PageSizePageNumberPagination):
+    """Genes pagination, by page number or by gene cross reference."""
+
+    keyset = ("dbxref_id",)
+
+
+class GeneDrugStatsPagination(
+    KeysetPaginationMixin,
+    PluggablePageSizePageNumberPagination,
+):
+    """
+    Gene drug stats pagination, by page number or by position.
+
+    Keyset is indexed on GeneDrugStats, see "overview_gds_keyset".
+    """
+
+    # position first, the rest makes rows unique
+    keyset = (
+        "start_pos",
+        "variant_id",
+        "drug",
+        "gene_db_crossref",
+        "nucleodic_ann_name",
+        "proteic_ann_name",
+        "consequence",
+        "variant_grade_version",
+    )
+    keyset_nulls = {
+        # positionless variants go last
+        "start_pos": 2147483647,
+        "nucleodic_ann_name": "",
+        "proteic_ann_name": "",
+        "consequence": "",
+        "variant_grade_version": -1,
+    }
+    ordering_query_param = "order"
@@ -0,0 +1,186 @@
+"""
+WHO types of TB drug resistance, told by the set of drugs a sample is resistant to.
+
+Rules are defined once, over groups of drugs keyed on Drug.drug_id, and are both
+rendered into SQL of GlobalResistanceStats view and evaluated by ResistanceClassifier
+in Python. Drug ids are checked against the drug names before use, see check_drug_ids.
+
+Reference link:
+https://www.who.int/teams/global-tuberculosis-programme/diagnosis-treatment/treatment-of-drug-resistant-tb/types-of-tb-drug-resistance
+"""
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+
+# drug groups resistance rules are expressed in, by drug ids,
+# given by genphen initial data migration (genphen/sql/0007_initial_data.sql)
+DRUG_GROUPS: Dict[str, Tuple[int, ...]] = {
+    "ethambutol": (4,),
+    "isoniazid": (1,),
+    "pyrazinamide": (9,),
+    "rifampicin": (2,),
+    "fluoroquinolones": (25,),
+    # second-line injectable drugs: capreomycin, amikacin, kanamycin
+    "injectables": (6, 7, 8),
+}
+# names the drugs of the groups are expected to have
+DRUG_NAMES: Dict[int, str] = {
+    1: "Isoniazid",
+    2: "Rifampicin",
+    4: "Ethambutol",
+    6: "Capreomycin",
+    7: "Amikacin",
+    8: "Kanamycin",
+    9: "Pyrazinamide",
+    25: "Fluoroquinolones",
+}
+FIRST_LINE = ("ethambutol", "isoniazid", "pyrazinamide", "rifampicin")
+# group of any drug, not named above
+OTHER = "other"
+GROUPS = (*DRUG_GROUPS, OTHER)
+# set of resistant drug groups is a bitmask in SQL
+BITS = {group: 1 << index for index, group in enumerate(GROUPS)}
+
+
+class ResistanceType(models.TextChoices):
+    """Type of drug resistance."""
+
+    # resistance to one first-line anti-TB drug only
+    MONO = "mono", "Mono-resistance"
+    # resistance to more than one first-line anti-TB drug,
+    # other than both isoniazid and rifampicin only
+    POLY = "poly", "Poly-resistance"
+    # resistance to at least both isoniazid and rifampicin
+    MULTIDRUG = "mdr", "Multi-drug resistance"
+    # resistance to any fluoroquinolone, and at least one of second-line injectable drugs,
+    # in addition to multi-drug resistance
+    EXTENSIVE = "xdr", "Extensive drug resistance"
+    # resistance to rifampicin detected using phenotypic or genotypic methods,
+    # with or without resistance to other drugs
+    RIFAMPICIN = "rr", "Rifampicin resistance"
+
+
+def check_drug_ids(drug_names: Dict[int, str]) -> None:
+    """
+    Fail if any of the drugs, by drug id, disagrees with the ids rules expect.
+
+    Drugs missing from the table are fine, there are no results of them to classify.
+    """
+    expected_ids = {name: drug_id for drug_id, name in DRUG_NAMES.items()}
+    mismatched = [
+        f"{drug_id} {name!r}"
+        for drug_id, name in sorted(drug_names.items())
+        if DRUG_NAMES.get(drug_id, name) != name
+        or expected_ids.get(name, drug_id) != drug_id
+    ]
+    if mismatched:
+        raise ImproperlyConfigured(
+            f"Drug ids of resistance rules don't match Drug table: {', '.join(mismatched)}.",
+        )
+
+
+def _listed(drug_ids: Iterable[int]) -> str:
+    """SQL list of drug ids."""
+    return ", ".join(map(str, drug_ids))
+
+
+def drug_bit_sql(drug_id: str) -> str:
+    """SQL expression of drug group bit, by drug id column."""
+    whens = " ".join(
+        f"when {drug_id} in ({_listed(drug_ids)}) then {BITS[group]}"
+        for group, drug_ids in DRUG_GROUPS.items()
+    )
+    return f"case {whens} else {BITS[OTHER]} end"
+
+
+def rifampicin_sql(drug_id: str) -> str:
+    """SQL condition of drug id column being rifampicin."""
+    return f"{drug_id} in ({_listed(DRUG_GROUPS['rifampicin'])})"
+
+
+def resistance_type_sql(
+    mask: str,
+    rifampicin_genotypic: str,
+) -> Dict[ResistanceType, str]:
+    """SQL conditions of resistance types, by drugs mask and genotypic rifampicin flag columns."""
+    first_line = [BITS[group] for group in FIRST_LINE]
+    first_line_count = " + ".join(
+        f"(({mask} & {bit}) > 0)::integer" for bit in first_line
+    )
+    mdr = BITS["isoniazid"] | BITS["rifampicin"]
+    return {
+        ResistanceType.MONO: f"{mask} in ({', '.join(map(str, first_line))})",
+        ResistanceType.POLY: f"{first_line_count} > 1 and {mask} != {mdr}",
+        ResistanceType.MULTIDRUG: f"({mask} & {mdr}) = {mdr}",
+        ResistanceType.EXTENSIVE: (
+            f"({mask} & {mdr}) = {mdr}"
+            f" and ({mask} & {BITS['fluoroquinolones']}) > 0"
+            f" and ({mask} & {BITS['injectables']}) > 0"
+        ),
+        ResistanceType.RIFAMPICIN: (
+            f"({mask} & {BITS['rifampicin']}) > 0 or {rifampicin_genotypic}"
+        ),
+    }
+
+
+class ResistanceClassifier:
+    """
+    Classifies batches of samples by resistance types, with boolean matrices.
+
+    Drugs are keyed on Drug.drug_id, every drug belongs to a single group.
+    """
+
+    def __init__(self, drug_ids: Iterable[int]):
+        """Build drugs × groups membership matrix of all the drugs."""
+        group_of = {
+            drug_id: group
+            for group, group_drug_ids in DRUG_GROUPS.items()
+            for drug_id in group_drug_ids
+        }
+        self.drug_ids = sorted(drug_ids)
+        self.columns = {drug_id: column for column, drug_id in enumerate(self.drug_ids)}
+        self.membership = np.zeros((len(self.drug_ids), len(GROUPS)), dtype=bool)
+        for column, drug_id in enumerate(self.drug_ids):
+            self.membership[column, GROUPS.index(group_of.get(drug_id, OTHER))] = True
+
+    def resistance_matrix(
+        self,
+        sample_ids: Sequence[int],
+        resistant_pairs: Iterable[Tuple[int, int]],
+    ) -> np.ndarray:
+        """Samples × drugs matrix of resistance, from (sample id, drug id) pairs."""
+        rows = {sample_id: row for row, sample_id in enumerate(sample_ids)}
+        matrix = np.zeros((len(sample_ids), len(self.drug_ids)), dtype=bool)
+        for sample_id, drug_id in resistant_pairs:
+            matrix[rows[sample_id], self.columns[drug_id]] = True
+        return matrix
+
+    def classify(
+        self,
+        resistant: np.ndarray,
+        rifampicin_genotypic: np.ndarray,
+    ) -> Dict[ResistanceType, np.ndarray]:
+        """
+        Vectors of samples, having each resistance type.
+
+        Takes samples × drugs phenotypic resistance matrix
+        and vector of samples with genotypic rifampicin resistance.
+        """
+        # bool matrix product is "any drug of the group"
+        groups = dict(zip(GROUPS, (resistant @ self.membership).T))
+        first_line_count = sum(groups[group].astype(np.int8) for group in FIRST_LINE)
+        others = groups["fluoroquinolones"] | groups["injectables"] | groups[OTHER]
+        mdr = groups["isoniazid"] & groups["rifampicin"]
+        return {
+            ResistanceType.MONO: (first_line_count == 1) & ~others,
+            ResistanceType.POLY: (first_line_count > 1) & ~(
+                mdr & (first_line_count == 2) & ~others
+            ),
+            ResistanceType.MULTIDRUG: mdr,
+            ResistanceType.EXTENSIVE: (
+                mdr & groups["fluoroquinolones"] & groups["injectables"]
+            ),
+            ResistanceType.RIFAMPICIN: groups["rifampicin"] | rifampicin_genotypic,
+        }
@@ -1,6 +1,8 @@
 from .gene_drug_stats import GeneDrugStatsSerializer
-from .gene import GeneSerializer, GeneRetrieveSerializer
+from .gene import GeneSerializer, GeneRetrieveSerializer, GenomeContextQuerySerializer
 from .gene_search import GeneSearchSerializer
+from .search import SearchQuerySerializer, VariantAutocompleteQuerySerializer
+from .sample_resistance import SampleResistanceSerializer
 from .resistance_stats import (
     ResistanceStatsDataSerializer,
     ResistanceStatsByDrugSerializer,
@@ -43,3 +43,20 @@ class GeneRetrieveSerializer(serializers.Serializer):
             },
         )
         return {gene_name: gene_drugs}
+
+
+class GenomeContextQuerySerializer(serializers.Serializer):
+    """Genome context lookup params."""
+
+    start_pos = serializers.IntegerField(min_value=0)
+    end_pos = serializers.IntegerField(min_value=0)
+    padding = serializers.IntegerField(min_value=0, max_value=1_000_000, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, required=False)
+
+    def validate(self, attrs):
+        """Window must not be reversed."""
+        if attrs["start_pos"] > attrs["end_pos"]:
+            raise serializers.ValidationError(
+                {"end_pos": "Should not be less than start position."},
+            )
+        return attrs
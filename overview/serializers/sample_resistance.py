@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+from ..resistance import ResistanceType
+
+
+class SampleResistanceSerializer(serializers.Serializer):  # pylint: disable=W0223
+    """Sample resistance classification, read serializer."""
+
+    sample_id = serializers.IntegerField()
+    resistant_drugs = serializers.ListField(child=serializers.IntegerField())
+    resistance_types = serializers.ListField(
+        child=serializers.ChoiceField(choices=ResistanceType.choices),
+    )
@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+
+class SearchQuerySerializer(serializers.Serializer):  # pylint: disable=W0223
+    """Fuzzy search and autocomplete params."""
+
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class VariantAutocompleteQuerySerializer(SearchQuerySerializer):  # pylint: disable=W0223
+    """Gene drug stats autocomplete params, completed value is chosen by `field`."""
+
+    field = serializers.ChoiceField(
+        choices=("variant_name", "nucleodic_ann_name", "proteic_ann_name"),
+        default="variant_name",
+    )
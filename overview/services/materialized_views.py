@@ -0,0 +1,307 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Set, Type
+
+from django import forms
+from django.apps import apps
+from django.db import connection, connections, transaction
+from django.db.models import Model
+from django.utils import timezone
+from django_pgviews.view import MaterializedView
+
+from overview.models import MaterializedViewRefresh
+from submission.services import Service
+
+log = logging.getLogger(__name__)
+
+# sources of every given matview, looking through plain views down to
+# tables and other matviews
+SOURCES_SQL = """
+WITH RECURSIVE deps(view_oid, source_oid) AS (
+    SELECT r.ev_class, d.refobjid
+    FROM pg_rewrite r
+        JOIN pg_depend d
+            ON d.classid = 'pg_rewrite'::regclass
+            AND d.objid = r.oid
+            AND d.refclassid = 'pg_class'::regclass
+    WHERE r.ev_class IN (SELECT oid FROM pg_class WHERE relkind = 'm' AND relname = ANY(%s))
+        AND d.refobjid <> r.ev_class
+    UNION
+    SELECT deps.view_oid, d.refobjid
+    FROM deps
+        JOIN pg_class c
+            ON c.oid = deps.source_oid
+            AND c.relkind = 'v'
+        JOIN pg_rewrite r
+            ON r.ev_class = c.oid
+        JOIN pg_depend d
+            ON d.classid = 'pg_rewrite'::regclass
+            AND d.objid = r.oid
+            AND d.refclassid = 'pg_class'::regclass
+    WHERE d.refobjid <> r.ev_class
+)
+SELECT DISTINCT v.relname, s.relname, s.relkind
+FROM deps
+    JOIN pg_class v ON v.oid = deps.view_oid
+    JOIN pg_class s ON s.oid = deps.source_oid
+WHERE s.relkind IN ('r', 'p', 'm')
+"""
+
+# tables changes counters, including changes of the current transaction
+COUNTERS_SQL = """
+SELECT
+    c.relname,
+    s.n_tup_ins + s.n_tup_upd + s.n_tup_del
+        + coalesce(x.n_tup_ins + x.n_tup_upd + x.n_tup_del, 0)
+FROM pg_class c
+    JOIN pg_stat_all_tables s ON s.relid = c.oid
+    LEFT JOIN pg_stat_xact_all_tables x ON x.relid = c.oid
+WHERE c.relname = ANY(%s)
+"""
+
+
+# plain tables, updated in place as data comes, and fully rebuilt along with matviews,
+# before the views built on them; their sources are listed in `rebuild_sources`
+REBUILT_TABLES = ("overview.SampleDrugResult",)
+
+
+def materialized_views() -> Dict[str, Type[Model]]:
+    """All materialized view models, along with rebuilt tables, by model label."""
+    matviews = {
+        model._meta.label: model  # pylint: disable=protected-access
+        for model in apps.get_models()
+        if issubclass(model, MaterializedView) and hasattr(model, "sql")
+    }
+    return {**{label: apps.get_model(label) for label in REBUILT_TABLES}, **matviews}
+
+
+def run_in_order(
+    dependencies: Dict[str, Set[str]],
+    func: Callable[[str], None],
+    concurrency: int,
+) -> Dict[str, BaseException]:
+    """
+    Call func for every node after all of its dependencies.
+
+    Independent nodes are processed in parallel threads.
+    Nodes, which depend on a failed one, are not processed.
+    Return errors by failed node.
+    """
+    pending = {node: set(deps) & dependencies.keys() for node, deps in dependencies.items()}
+    errors: Dict[str, BaseException] = {}
+    running: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while pending or running:
+            for node in sorted(node for node, deps in pending.items() if not deps):
+                del pending[node]
+                running[executor.submit(func, node)] = node
+
+            if not running:
+                # the rest depends on failed nodes
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                if future.exception() is not None:
+                    errors[node] = future.exception()
+                    continue
+                for deps in pending.values():
+                    deps.discard(node)
+
+    return errors
+
+
+class RefreshMaterializedViewsService(Service):
+    """
+    Refresh materialized views in dependency order.
+
+    Views are ordered by their `dependencies`, as well as by actual
+    matview-on-matview usage, found in the database catalog.
+    Independent views are refreshed in parallel, each on its own connection.
+    Views with `concurrent_index` are refreshed concurrently,
+    so they remain readable during the refresh.
+    Rebuilt tables are refreshed the same way, before the views built on them.
+    """
+
+    db_transaction = False
+
+    views = forms.MultipleChoiceField(required=False, choices=())
+    """Views to refresh, along with views depending on them. All views by default."""
+    stale_only = forms.BooleanField(required=False)
+    """Skip views, whose sources haven't changed since the last refresh."""
+    concurrency = forms.IntegerField(required=False, min_value=1)
+    """How many views could be refreshed at once."""
+    trigger = forms.ChoiceField(
+        required=False,
+        choices=MaterializedViewRefresh.Trigger.choices,
+    )
+    """What caused the refresh, recorded in the refresh log."""
+
+    def __init__(self, *args, **kwargs):
+        """Prepare view choices."""
+        super().__init__(*args, **kwargs)
+        self.matviews = materialized_views()
+        self.fields["views"].choices = [(label, label) for label in self.matviews]
+        self.table_to_label = {
+            model._meta.db_table: label  # pylint: disable=protected-access
+            for label, model in self.matviews.items()
+        }
+        self.sources: Dict[str, Set[str]] = {}
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.latest: Dict[str, MaterializedViewRefresh] = {}
+        self.refreshed: Set[str] = set()
+
+    def load_graph(self):
+        """Collect source tables and matview dependencies of every view."""
+        self.dependencies = {
+            label: {dep for dep in getattr(model, "_dependencies", []) if dep in self.matviews}
+            for label, model in self.matviews.items()
+        }
+        self.sources = {
+            label: set(getattr(model, "rebuild_sources", ()))
+            for label, model in self.matviews.items()
+        }
+
+        with connection.cursor() as cursor:
+            cursor.execute(SOURCES_SQL, [list(self.table_to_label)])
+            for view_table, source_table, kind in cursor.fetchall():
+                label = self.table_to_label[view_table]
+                if source_table in self.table_to_label:
+                    # other view or rebuilt table
+                    self.dependencies[label].add(self.table_to_label[source_table])
+                if kind != "m":
+                    self.sources[label].add(source_table)
+
+    def dependants(self, labels: Iterable[str]) -> Set[str]:
+        """Views along with all views, that depend on them."""
+        result = set(labels)
+        while True:
+            more = {
+                label
+                for label, deps in self.dependencies.items()
+                if deps & result and label not in result
+            }
+            if not more:
+                return result
+            result |= more
+
+    @staticmethod
+    def counters(tables: Iterable[str]) -> Dict[str, int]:
+        """Changes counters of the tables."""
+        with connection.cursor() as cursor:
+            cursor.execute(COUNTERS_SQL, [sorted(tables)])
+            return dict(cursor.fetchall())
+
+    def is_stale(self, label: str) -> bool:
+        """Check, if view sources have changed since its last refresh."""
+        latest = self.latest.get(label)
+        if latest is None:
+            return True
+        if latest.sources != self.counters(self.sources[label]):
+            return True
+        # source views, refreshed in this run or afterwards the last time
+        return any(
+            dep in self.refreshed
+            or dep not in self.latest
+            or self.latest[dep].finished_at > latest.started_at
+            for dep in self.dependencies[label]
+        )
+
+    def refresh_view(self, label: str):
+        """Refresh single view, record the refresh."""
+        try:
+            if self.cleaned_data["stale_only"] and not self.is_stale(label):
+                log.info("matview %s is up to date", label)
+                return
+
+            model = self.matviews[label]
+            refresh = MaterializedViewRefresh.objects.create(
+                view=label,
+                trigger=self.cleaned_data["trigger"] or MaterializedViewRefresh.Trigger.COMMAND,
+                started_at=timezone.now(),
+                concurrently=getattr(model, "_concurrent_index", None) is not None
+                and self.is_populated(model),
+                sources=self.counters(self.sources[label]),
+            )
+            log.info("matview %s refresh started", label)
+            try:
+                # savepoint keeps the connection usable to record the failure
+                with transaction.atomic():
+                    model.refresh(concurrently=refresh.concurrently)
+            except Exception as exc:
+                refresh.error = str(exc)
+                refresh.save()
+                raise
+
+            refresh.finished_at = timezone.now()
+            refresh.row_count = model.objects.count()
+            refresh.save()
+            self.refreshed.add(label)
+            log.info(
+                "matview %s refreshed in %s, %d rows",
+                label,
+                refresh.duration,
+                refresh.row_count,
+            )
+        finally:
+            if self.cleaned_data["concurrency"] > 1:
+                # worker threads have their own connections
+                connections.close_all()
+
+    @staticmethod
+    def is_populated(model: Type[Model]) -> bool:
+        """Check, that view was populated, it can't be refreshed concurrently otherwise."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relispopulated FROM pg_class WHERE relname = %s",
+                [model._meta.db_table],  # pylint: disable=protected-access
+            )
+            return cursor.fetchone()[0]
+
+    def process(self):
+        """Refresh the views, return labels of refreshed ones."""
+        self.cleaned_data["concurrency"] = self.cleaned_data["concurrency"] or 1
+        self.load_graph()
+        self.latest = MaterializedViewRefresh.objects.latest_by_view()
+
+        labels = self.dependants(self.cleaned_data["views"] or self.matviews)
+        dependencies = {label: self.dependencies[label] for label in labels}
+
+        if self.cleaned_data["concurrency"] == 1:
+            # run in the calling thread, on its connection and transaction
+            errors = {}
+            for label in self.topological_order(dependencies):
+                if not any(dep in errors for dep in dependencies[label]):
+                    try:
+                        self.refresh_view(label)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        errors[label] = exc
+        else:
+            errors = run_in_order(dependencies, self.refresh_view, self.cleaned_data["concurrency"])
+
+        for label, exc in errors.items():
+            log.error("matview %s refresh failed: %s", label, exc)
+        if errors:
+            raise RuntimeError(f"failed to refresh materialized views: {', '.join(sorted(errors))}")
+
+        return self.refreshed
+
+    @staticmethod
+    def topological_order(dependencies: Dict[str, Set[str]]) -> List[str]:
+        """Order nodes, so that each one goes after its dependencies."""
+        order: List[str] = []
+        done: Set[str] = set()
+
+        def visit(node):
+            if node in done:
+                return
+            done.add(node)
+            for dep in sorted(dependencies[node] & dependencies.keys()):
+                visit(dep)
+            order.append(node)
+
+        for node in sorted(dependencies):
+            visit(node)
+        return order
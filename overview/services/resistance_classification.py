@@ -0,0 +1,54 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from genphen.models import Drug
+from submission.models import GenotypeResistance
+from ..models import SampleDrugResult
+from ..resistance import DRUG_GROUPS, ResistanceClassifier, ResistanceType, check_drug_ids
+
+
+def classify_samples(sample_ids: Sequence[int]) -> List[dict]:
+    """
+    Resistant drugs and resistance types of the samples, in the same order.
+
+    Samples are classified by their results, the same way GlobalResistanceStats counts them.
+    """
+    sample_ids = list(sample_ids)
+    drug_names = dict(Drug.objects.values_list("drug_id", "drug_name"))
+    check_drug_ids(drug_names)
+    classifier = ResistanceClassifier(drug_names)
+
+    resistant_pairs = list(
+        SampleDrugResult.objects.filter(sample_id__in=sample_ids, test_result="R")
+        .order_by("sample_id", "drug_id")
+        .values_list("sample_id", "drug_id"),
+    )
+    genotypic = set(
+        GenotypeResistance.objects.filter(
+            sample_id__in=sample_ids,
+            version=1,
+            resistance_flag="R",
+            drug_id__in=DRUG_GROUPS["rifampicin"],
+        ).values_list("sample_id", flat=True),
+    )
+    types = classifier.classify(
+        classifier.resistance_matrix(sample_ids, resistant_pairs),
+        np.array([sample_id in genotypic for sample_id in sample_ids], dtype=bool),
+    )
+
+    resistant_drugs: Dict[int, List[int]] = {sample_id: [] for sample_id in sample_ids}
+    for sample_id, drug_id in resistant_pairs:
+        resistant_drugs[sample_id].append(drug_id)
+    return [
+        {
+            "sample_id": sample_id,
+            "resistant_drugs": resistant_drugs[sample_id],
+            "resistance_types": [
+                resistance_type
+                for resistance_type in ResistanceType
+                if types[resistance_type][row]
+            ],
+        }
+        for row, sample_id in enumerate(sample_ids)
+    ]
@@ -0,0 +1,167 @@
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from ..models import GeneSearchHistory
+from ..serializers import GeneSearchSerializer
+
+log = logging.getLogger(__name__)
+
+# batch of counters is added atomically, so concurrent flushes of web workers never lose
+# increments; rows are locked in the same order to avoid deadlocks
+UPSERT_SQL = """
+INSERT INTO overview_genesearchhistory (gene_db_crossref_id, counter, date)
+SELECT gene_db_crossref_id, counter, date
+FROM unnest(%s::integer[], %s::integer[], %s::timestamptz[])
+    AS batch(gene_db_crossref_id, counter, date)
+ORDER BY gene_db_crossref_id
+ON CONFLICT (gene_db_crossref_id) DO UPDATE
+    SET counter = overview_genesearchhistory.counter + excluded.counter,
+        date = greatest(overview_genesearchhistory.date, excluded.date)
+"""
+
+HISTORY_LISTS_CACHE_KEY = "overview:gene-search-history"
+HISTORY_LIST_LENGTH = 10
+
+
+def history_lists() -> Dict[str, list]:
+    """Most and recently searched genes, serialized, from cache if possible."""
+    lists = cache.get(HISTORY_LISTS_CACHE_KEY)
+    if lists is None:
+        lists = refresh_history_lists()
+    return lists
+
+
+def refresh_history_lists() -> Dict[str, list]:
+    """
+    Serialize most and recently searched genes and cache them.
+
+    Lists are kept for a flush interval, so processes which don't share the cache
+    catch up with each other flushes in that time.
+    """
+    queryset = GeneSearchHistory.objects.select_related("gene_db_crossref__data")
+    lists = {
+        name: [
+            dict(row)
+            for row in GeneSearchSerializer(
+                queryset.order_by(*ordering)[:HISTORY_LIST_LENGTH],
+                many=True,
+            ).data
+        ]
+        for name, ordering in (
+            ("most", ("-counter", "-date")),
+            ("recently", ("-date",)),
+        )
+    }
+    cache.set(HISTORY_LISTS_CACHE_KEY, lists, settings.GENE_SEARCH_FLUSH_INTERVAL)
+    return lists
+
+
+class SearchCounterBuffer:
+    """
+    Gene search counters, collected in process memory and written in batches.
+
+    Batch is flushed by the search, which finds it older than GENE_SEARCH_FLUSH_INTERVAL
+    or larger than GENE_SEARCH_FLUSH_SIZE genes, by the background thread
+    every interval, so idle workers don't hold searches, and at process exit.
+    Searches of the last interval are lost, when the worker is killed.
+    """
+
+    def __init__(self):
+        """Start with empty batch."""
+        self.lock = threading.Lock()
+        self.counts: Dict[int, Tuple[int, datetime]] = {}
+        self.started = time.monotonic()
+        self.flusher: Optional[threading.Thread] = None
+
+    def add(self, gene_db_crossref_id: int):
+        """Count single search of a gene, flush the batch if it is due."""
+        with self.lock:
+            counter, _ = self.counts.get(gene_db_crossref_id, (0, None))
+            self.counts[gene_db_crossref_id] = (counter + 1, timezone.now())
+            self.start_flusher()
+            due = (
+                len(self.counts) >= settings.GENE_SEARCH_FLUSH_SIZE
+                or time.monotonic() - self.started >= settings.GENE_SEARCH_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+
+    def start_flusher(self):
+        """
+        Start background flushes, unless they are running.
+
+        Thread is started by the first search, so it is started again in forked workers.
+        """
+        if settings.GENE_SEARCH_FLUSH_INTERVAL <= 0:
+            # every search is flushed right away
+            return
+        if self.flusher is None or not self.flusher.is_alive():
+            self.flusher = threading.Thread(
+                target=self.flush_periodically,
+                name="gene-search-flusher",
+                daemon=True,
+            )
+            self.flusher.start()
+
+    def flush_periodically(self):
+        """Flush the batch every interval, even if no more searches come."""
+        while (interval := settings.GENE_SEARCH_FLUSH_INTERVAL) > 0:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Could not flush gene search counters")
+            finally:
+                # the thread has its own connection, don't keep it between flushes
+                connection.close()
+
+    def flush(self):
+        """Add collected counters to the search history, then refresh cached lists."""
+        with self.lock:
+            counts, self.counts = self.counts, {}
+            self.started = time.monotonic()
+        if not counts:
+            return
+
+        ids = sorted(counts)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    UPSERT_SQL,
+                    [
+                        ids,
+                        [counts[pk][0] for pk in ids],
+                        [counts[pk][1] for pk in ids],
+                    ],
+                )
+        except DatabaseError:
+            # searches are not failed for the sake of statistics,
+            # counters stay in the buffer for the next flush
+            log.exception("Could not flush %s gene search counters", len(counts))
+            with self.lock:
+                for pk, (counter, date) in counts.items():
+                    pending, pending_date = self.counts.get(pk, (0, date))
+                    self.counts[pk] = (counter + pending, max(date, pending_date))
+            return
+        refresh_history_lists()
+
+
+search_counters = SearchCounterBuffer()
+
+
+@atexit.register
+def flush_search_counters():
+    """Don't lose buffered searches on worker shutdown."""
+    try:
+        search_counters.flush()
+    except Exception:  # pylint: disable=broad-except
+        log.exception("Could not flush gene search counters at exit")
@@ -82,3 +82,18 @@ def annotations(alice_package, drugs):
     GeneDrugStats.refresh()
 
     return annotations_list
+
+
+@pytest.fixture
+def variants(db):  # pylint: disable=unused-argument,invalid-name
+    """Two bare variants, with ids 1 and 2, to genotype samples with."""
+    return [
+        Variant.objects.create(
+            variant_id=variant_id,
+            chromosome="NC_000962.3",
+            position=1000 + variant_id,
+            reference_nucleotide="A",
+            alternative_nucleotide="G",
+        )
+        for variant_id in (1, 2)
+    ]
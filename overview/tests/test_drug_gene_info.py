@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.reverse import reverse
 
 
@@ -55,3 +57,91 @@ def test_drug_gene_info_without_pagination(
 
     assert data[0]["variantName"] == "2160001-TAGA-GTAA"
     assert data[1]["variantName"] == "2160002-TAGA-GTAA"
+
+
+def test_drug_gene_info_cursor_pagination(
+    client_of,
+    alice,
+    annotations,  # pylint: disable=unused-argument
+):
+    """Drug gene infos are listed by position with a cursor."""
+    endpoint = reverse("v1:overview:drug-gene-infos-list")
+    client = client_of(alice)
+
+    data = client.get(endpoint, data={"cursor": "", "pageSize": 1}).json()
+    assert "count" not in data
+    assert [row["variantName"] for row in data["results"]] == ["2160001-TAGA-GTAA"]
+
+    data = client.get(data["next"]).json()
+    assert [row["variantName"] for row in data["results"]] == ["2160002-TAGA-GTAA"]
+    assert data["next"] is None
+
+
+def test_drug_gene_info_cursor_ordering_rejected(
+    client_of,
+    alice,
+    annotations,  # pylint: disable=unused-argument
+):
+    """Cursor pages are ordered by position only, other ordering is an error."""
+    response = client_of(alice).get(
+        reverse("v1:overview:drug-gene-infos-list"),
+        data={"cursor": "", "order": "-resistantCount"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["attr"] == "order"
+
+
+def test_drug_gene_info_search(
+    client_of,
+    alice,
+    annotations,  # pylint: disable=unused-argument
+):
+    """Drug gene infos are searched by variant name with typos, best matches first."""
+    endpoint = reverse("v1:overview:drug-gene-infos-list")
+    data = client_of(alice).get(endpoint, data={"search": "2160002-TAGA-GTAX"}).json()
+
+    assert [row["variantName"] for row in data][0] == "2160002-TAGA-GTAA"
+
+
+def test_drug_gene_info_autocomplete(
+    client_of,
+    alice,
+    annotations,  # pylint: disable=unused-argument
+):
+    """Distinct variant names are completed by prefix."""
+    endpoint = reverse("v1:overview:drug-gene-infos-autocomplete")
+    client = client_of(alice)
+
+    assert client.get(endpoint, data={"q": "216000"}).json() == [
+        "2160001-TAGA-GTAA",
+        "2160002-TAGA-GTAA",
+    ]
+    assert client.get(endpoint, data={"q": "2160002"}).json() == ["2160002-TAGA-GTAA"]
+    assert client.get(endpoint, data={"q": "2", "field": "unknown"}).status_code == 400
+
+
+def test_drug_gene_info_cursor_index_scan(
+    client_of,
+    alice,
+    annotations,  # pylint: disable=unused-argument
+):
+    """Cursor page is sought by keyset index range, no earlier rows are aggregated or sorted."""
+    endpoint = reverse("v1:overview:drug-gene-infos-list")
+    client = client_of(alice)
+    first = client.get(endpoint, data={"cursor": "", "pageSize": 1}).json()
+
+    with CaptureQueriesContext(connection) as context:
+        client.get(first["next"])
+    [sql] = [query["sql"] for query in context.captured_queries if "ROW(" in query["sql"]]
+
+    with connection.cursor() as cursor:
+        # the table is tiny, make planner show what it does with a big one
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN {sql}")
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+
+    assert "Index Scan using overview_gds_keyset" in plan
+    assert "Index Cond: (ROW(" in plan
+    assert "Aggregate" not in plan
+    assert "Sort" not in plan
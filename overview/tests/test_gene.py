@@ -1,3 +1,6 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.reverse import reverse
 
 from overview.models import Gene, DrugGene
@@ -93,3 +96,93 @@ def test_gene_genome(client_of, alice):
         assert data[0]["startPos"] <= data[1]["startPos"]
         assert data[0]["endPos"] <= data[-1]["endPos"]
     assert response.status_code == 200
+
+
+def test_gene_cursor_pagination(client_of, alice):
+    """Genes are listed page by page with a cursor, without counting them."""
+    client = client_of(alice)
+    endpoint = reverse("v1:overview:gene-list")
+    expected = list(Gene.objects.order_by("dbxref").values_list("dbxref_id", flat=True))
+
+    ids = []
+    url, params = endpoint, {"cursor": "", "pageSize": 500}
+    while url:
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(url, data=params).json()
+        assert not any("COUNT(" in query["sql"] for query in context.captured_queries)
+        assert "count" not in data
+        ids.extend(gene["geneDbCrossrefId"] for gene in data["results"])
+        url, params = data["next"], None
+
+    assert ids == expected
+
+
+def test_gene_invalid_cursor(client_of, alice):
+    """Broken cursor is rejected."""
+    endpoint = reverse("v1:overview:gene-list")
+    response = client_of(alice).get(endpoint, data={"cursor": "broken"})
+    assert response.status_code == 404
+
+
+def test_gene_genome_overlap(client_of, alice):
+    """Genes, overlapping padded window, are found, limit cuts them by position."""
+    client = client_of(alice)
+    endpoint = reverse("v1:overview:gene-genomecontext")
+
+    def found(**params):
+        response = client.get(endpoint, data={"startPos": 100000, "endPos": 200000, **params})
+        assert response.status_code == 200
+        return [gene["geneDbCrossrefId"] for gene in response.json()]
+
+    def expected(start_pos, end_pos):
+        return list(
+            Gene.objects.filter(start_pos__lte=end_pos, end_pos__gte=start_pos)
+            .order_by("start_pos", "dbxref")
+            .values_list("dbxref_id", flat=True),
+        )
+
+    assert found() == expected(100000, 200000)
+    assert found(padding=50000) == expected(50000, 250000)
+    assert len(found(padding=50000)) > len(found())
+    assert found(limit=3) == expected(100000, 200000)[:3]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"startPos": 200, "endPos": 100},
+        {"startPos": 100, "endPos": 200, "limit": 0},
+        {"startPos": 100, "endPos": 200, "padding": -1},
+        {"startPos": "a", "endPos": 200},
+    ],
+)
+def test_gene_genome_invalid(client_of, alice, params):
+    """Wrong genome context params are rejected."""
+    endpoint = reverse("v1:overview:gene-genomecontext")
+    assert client_of(alice).get(endpoint, data=params).status_code == 400
+
+
+def test_gene_fuzzy_search(client_of, alice):
+    """Misspelled gene names are found, best matches first."""
+    endpoint = reverse("v1:overview:gene-fuzzysearch")
+    client = client_of(alice)
+
+    data = client.get(endpoint, data={"q": "dnaM"}).json()
+    assert {gene["geneName"] for gene in data} == {"dnaA", "dnaN"}
+
+    data = client.get(endpoint, data={"q": "Rv002", "limit": 2}).json()
+    assert [gene["locusTag"] for gene in data] == ["Rv0002", "Rv0020"]
+
+    assert client.get(endpoint).status_code == 400
+
+
+def test_gene_autocomplete(client_of, alice):
+    """Genes are completed by name or locus tag prefix."""
+    endpoint = reverse("v1:overview:gene-autocomplete")
+    client = client_of(alice)
+
+    data = client.get(endpoint, data={"q": "dna"}).json()
+    assert [gene["geneName"] for gene in data] == ["dnaA", "dnaN"]
+
+    data = client.get(endpoint, data={"q": "rv000", "limit": 3}).json()
+    assert [gene["locusTag"] for gene in data] == ["Rv0001", "Rv0002", "Rv0003"]
@@ -1,9 +1,13 @@
+import time
 from datetime import timedelta
 
+import pytest
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.reverse import reverse
 
 from overview.models import GeneSearchHistory
+from overview.services.search_history import SearchCounterBuffer, search_counters
 
 
 def test_gene_search_history(client_of, alice, mocker):
@@ -77,3 +81,74 @@ def test_gene_search_history_recently_search(client_of, alice, mocker):
             "locusTag": "Rv0002",
         },
     ]
+
+
+@pytest.fixture
+def write_behind(settings):
+    """Buffer gene searches until flushed."""
+    settings.GENE_SEARCH_FLUSH_INTERVAL = 60
+    settings.GENE_SEARCH_FLUSH_SIZE = 2
+    cache.clear()
+    search_counters.flush()
+    yield
+    search_counters.counts.clear()
+    cache.clear()
+
+
+def test_gene_search_write_behind(
+    write_behind,
+    client_of,
+    alice,
+):  # pylint: disable=redefined-outer-name,unused-argument
+    """Searches are added to history in batches, lists are cached until the next flush."""
+    GeneSearchHistory.objects.create(gene_db_crossref_id=7, counter=5)
+    client = client_of(alice)
+    genes = reverse("v1:overview:gene-list")
+    most_searched = reverse("v1:overview:gene-search-history-list")
+    assert [row["counter"] for row in client.get(most_searched).json()] == [5]
+
+    for _ in range(3):
+        client.get(genes, data={"search": "dnaA"})
+    assert GeneSearchHistory.objects.get(pk=7).counter == 5
+    assert [row["counter"] for row in client.get(most_searched).json()] == [5]
+
+    # second gene fills the batch up
+    client.get(genes, data={"search": "dnaN"})
+    assert dict(GeneSearchHistory.objects.values_list("pk", "counter")) == {7: 8, 8: 1}
+    data = client.get(most_searched).json()
+    assert [(row["geneName"], row["counter"]) for row in data] == [("dnaA", 8), ("dnaN", 1)]
+
+    recently = client.get(reverse("v1:overview:gene-search-history-recently")).json()
+    assert [row["geneName"] for row in recently] == ["dnaN", "dnaA"]
+
+
+def test_gene_search_history_not_modified(
+    write_behind,
+    client_of,
+    alice,
+    django_assert_num_queries,
+):  # pylint: disable=redefined-outer-name,unused-argument
+    """Cached list is revalidated without database queries."""
+    GeneSearchHistory.objects.create(gene_db_crossref_id=7, counter=1)
+    client = client_of(alice)
+    endpoint = reverse("v1:overview:gene-search-history-list")
+    etag = client.get(endpoint)["ETag"]
+
+    with django_assert_num_queries(0):
+        response = client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+def test_idle_worker_flushes_searches(mocker, settings):
+    """Buffered searches are flushed in background, without waiting for the next search."""
+    settings.GENE_SEARCH_FLUSH_INTERVAL = 0.05
+    buffer = SearchCounterBuffer()
+    flush = mocker.patch.object(buffer, "flush")
+
+    buffer.add(7)
+    flush.assert_not_called()
+
+    deadline = time.monotonic() + 5
+    while not flush.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert flush.called
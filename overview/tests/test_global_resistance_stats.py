@@ -1,6 +1,7 @@
 from rest_framework.reverse import reverse
 
-from overview.models import GlobalResistanceStats
+from overview.models import GlobalResistanceStats, MaterializedViewRefresh, SampleDrugResult
+from overview.services.materialized_views import RefreshMaterializedViewsService
 
 
 def test_endpoint_response(client_of, alice, new_sample):
@@ -27,3 +28,83 @@ def test_endpoint_response(client_of, alice, new_sample):
             "totalSum": 2,
         },
     }
+
+
+def test_data_refreshed_at_header(client_of, alice, new_sample):
+    """Response tells, when the stats were refreshed."""
+    endpoint = reverse("v1:overview:global-resistance-stats")
+    new_sample()
+
+    response = client_of(alice).get(endpoint)
+    assert "X-Data-Refreshed-At" not in response
+
+    RefreshMaterializedViewsService.execute(
+        {"views": ["overview.GlobalResistanceStats"], "concurrency": 1},
+    )
+    refresh = MaterializedViewRefresh.objects.get(view="overview.GlobalResistanceStats")
+
+    response = client_of(alice).get(endpoint)
+    assert response["X-Data-Refreshed-At"] == refresh.finished_at.isoformat()
+
+
+def test_not_modified(client_of, alice, new_sample):
+    """Stats, not refreshed since the last request, are answered with 304."""
+    endpoint = reverse("v1:overview:global-resistance-stats")
+    new_sample()
+    RefreshMaterializedViewsService.execute(
+        {"views": ["overview.GlobalResistanceStats"], "concurrency": 1},
+    )
+    client = client_of(alice)
+
+    response = client.get(endpoint)
+    assert "ETag" in response
+    assert "Last-Modified" in response
+
+    response = client.get(endpoint, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+
+    response = client.get(endpoint, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+    assert response.status_code == 304
+
+    etag = response["ETag"]
+    RefreshMaterializedViewsService.execute(
+        {"views": ["overview.GlobalResistanceStats"], "concurrency": 1},
+    )
+    response = client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+
+def test_resistance_types_by_country(client_of, alice_package, drugs, countries):
+    """Samples are classified by their resistant drugs set, stats are broken down by country."""
+    # pylint: disable=unused-argument
+    drug = {d.drug_name: d for d in drugs}
+    for country, yoi, resistant in (
+        ("FRA", 2020, ["Isoniazid"]),
+        ("FRA", 2021, ["Isoniazid", "Rifampicin"]),
+        ("FRA", 2021, ["Rifampicin", "Isoniazid", "Fluoroquinolones", "Amikacin"]),
+        ("KAZ", 2020, ["Ethambutol", "Pyrazinamide"]),
+        ("KAZ", 2020, ["Rifampicin", "Streptomycin"]),
+        (None, None, []),
+    ):
+        alice_package.new_sample(country, yoi)
+        alice_package.new_alias(f"A{alice_package.sample.pk}", alice_package.sample)
+        for name in resistant:
+            alice_package.new_pds_test("R", drug=drug[name], staging=False)
+        alice_package.new_pds_test("S", drug=drug["Kanamycin"], staging=False)
+    SampleDrugResult.objects.rebuild()
+    GlobalResistanceStats.refresh()
+
+    assert set(
+        GlobalResistanceStats.objects.values_list("country", "sampling_year", "total_samples"),
+    ) == {("FRA", 2020, 1), ("FRA", 2021, 2), ("KAZ", 2020, 2), (None, None, 1)}
+
+    data = client_of(alice_package.package.owner).get(
+        reverse("v1:overview:global-resistance-stats"),
+    ).json()
+    sums = ("totalSum", "monoResSum", "polyResSum", "multiDrugResSum", "extDrugResSum", "rifResSum")
+    assert [[row["countryId"]] + [row[name] for name in sums] for row in data["countries"]] == [
+        ["FRA", 3, 1, 1, 2, 1, 2],
+        ["KAZ", 2, 0, 1, 0, 0, 1],
+    ]
+    assert [data["total"][name] for name in sums] == [6, 1, 2, 2, 1, 3]
+    assert data["total"]["ratioMultiDrugRes"] == 2 * 100.0 / 6
@@ -0,0 +1,134 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from overview.models import MaterializedViewRefresh, SampleDrugResult, SampleDrugResultStats
+from overview.services.materialized_views import (
+    RefreshMaterializedViewsService,
+    materialized_views,
+    run_in_order,
+)
+
+
+def test_run_in_order():
+    """Every node goes after its dependencies, dependants of failed nodes are skipped."""
+    dependencies = {
+        "a": set(),
+        "b": {"a"},
+        "c": {"a", "b"},
+        "d": set(),
+        "e": {"d"},
+        "f": {"e"},
+    }
+    done = []
+
+    def func(node):
+        if node == "d":
+            raise ValueError(node)
+        assert dependencies[node] <= set(done)
+        done.append(node)
+
+    errors = run_in_order(dependencies, func, concurrency=3)
+
+    assert done == ["a", "b", "c"]
+    assert list(errors) == ["d"]
+
+
+def test_refresh_all_views(db):
+    """All views are refreshed once, dependencies first."""
+    # pylint: disable=unused-argument,invalid-name
+    refreshed = RefreshMaterializedViewsService.execute({"concurrency": 1})
+
+    assert refreshed == set(materialized_views())
+    order = list(MaterializedViewRefresh.objects.order_by("pk").values_list("view", flat=True))
+    assert order.index("overview.Gene") < order.index("overview.GeneDrugStats")
+    assert order.index("overview.SampleDrugResultStats") < order.index(
+        "overview.GlobalResistanceStats",
+    )
+    assert order.index("overview.SampleDrugResult") < order.index(
+        "overview.SampleDrugResultStats",
+    )
+    assert order.index("genphen.RankedAnnotation") < order.index("genphen.PreferredAnnotation")
+    assert not MaterializedViewRefresh.objects.filter(finished_at__isnull=True).exists()
+
+
+def test_refresh_log(alice_package, drugs, countries):
+    """Refresh log records trigger, duration and row count."""
+    # pylint: disable=unused-argument
+    alice_package.new_sample(countries[0].three_letters_code, 2020)
+    alice_package.new_alias("A1", alice_package.sample)
+    alice_package.new_pds_test("R", drug=drugs[0], staging=False)
+    SampleDrugResult.objects.rebuild(sample_ids=[alice_package.sample.pk])
+
+    RefreshMaterializedViewsService.execute(
+        {
+            "views": ["overview.SampleDrugResultStats"],
+            "trigger": MaterializedViewRefresh.Trigger.GDRA_IMPORT,
+            "concurrency": 1,
+        },
+    )
+
+    refresh = MaterializedViewRefresh.objects.get(view="overview.SampleDrugResultStats")
+    assert refresh.trigger == MaterializedViewRefresh.Trigger.GDRA_IMPORT
+    assert refresh.row_count == 1
+    assert refresh.duration == refresh.finished_at - refresh.started_at
+    assert refresh.error == ""
+
+
+def test_refresh_view_with_dependants(db):
+    """Views, depending on the requested one, are refreshed too."""
+    # pylint: disable=unused-argument,invalid-name
+    refreshed = RefreshMaterializedViewsService.execute(
+        {"views": ["overview.SampleDrugResultStats"], "concurrency": 1},
+    )
+
+    assert refreshed == {"overview.SampleDrugResultStats", "overview.GlobalResistanceStats"}
+
+
+def test_refresh_stale_only(alice_package, drugs, countries):
+    """Only views with changed sources, and their dependants, are refreshed."""
+    # pylint: disable=unused-argument
+    RefreshMaterializedViewsService.execute({"concurrency": 1})
+
+    refreshed = RefreshMaterializedViewsService.execute({"stale_only": True, "concurrency": 1})
+    assert refreshed == set()
+
+    alice_package.new_sample(countries[0].three_letters_code, 2020)
+    alice_package.new_alias("A1", alice_package.sample)
+    alice_package.new_pds_test("R", drug=drugs[0], staging=False)
+    SampleDrugResult.objects.rebuild(sample_ids=[alice_package.sample.pk])
+
+    refreshed = RefreshMaterializedViewsService.execute({"stale_only": True, "concurrency": 1})
+    assert "overview.SampleDrugResultStats" in refreshed
+    assert "overview.GlobalResistanceStats" in refreshed
+    assert "overview.Gene" not in refreshed
+
+
+def test_refresh_command_unknown_view():
+    """Unknown view labels are rejected."""
+    with pytest.raises(CommandError):
+        call_command("refresh_matviews", "overview.Unknown", "--concurrency=1")
+
+
+def test_refresh_rebuilds_sample_drug_results(alice_package, drugs, countries):
+    """Sample drug results, loaded past package acceptance, are rebuilt before their views."""
+    # pylint: disable=unused-argument
+    RefreshMaterializedViewsService.execute({"concurrency": 1})
+    last_pk = MaterializedViewRefresh.objects.latest("pk").pk
+    alice_package.new_sample(countries[0].three_letters_code, 2020)
+    alice_package.new_alias("A1", alice_package.sample)
+    # production test, loaded directly
+    alice_package.new_pds_test("R", drug=drugs[0], staging=False)
+
+    call_command("refresh_matviews", "--stale-only", "--concurrency=1")
+
+    assert SampleDrugResult.objects.filter(sample=alice_package.sample).count() == 1
+    assert SampleDrugResultStats.objects.filter(drug=drugs[0]).exists()
+    order = list(
+        MaterializedViewRefresh.objects.filter(pk__gt=last_pk)
+        .order_by("pk")
+        .values_list("view", flat=True),
+    )
+    assert order.index("overview.SampleDrugResult") < order.index(
+        "overview.SampleDrugResultStats",
+    )
@@ -0,0 +1,99 @@
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.reverse import reverse
+
+from genphen.models import GeneDrugResistanceAssociation
+from overview.models import Gene, GeneSearchHistory
+from overview.services.materialized_views import RefreshMaterializedViewsService
+from overview.views.mixins import response_cache_key
+
+
+@pytest.fixture
+def response_cache(settings):
+    """Enable overview responses cache."""
+    settings.OVERVIEW_CACHE_TIMEOUT = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def refresh_global_stats():
+    """Refresh global resistance stats through the refresh service."""
+    RefreshMaterializedViewsService.execute(
+        {"views": ["overview.SampleDrugResultStats"], "concurrency": 1},
+    )
+
+
+def test_cache_key_normalized():
+    """Params order and empty params don't change the key."""
+    factory = RequestFactory()
+    key = response_cache_key(factory.get("/a/", {"b": ["2", "1"], "a": "x"}), "v1")
+
+    assert response_cache_key(factory.get("/a/?a=x&b=1&b=2&c="), "v1") == key
+    assert response_cache_key(factory.get("/a/?a=x&b=1"), "v1") != key
+    assert response_cache_key(factory.get("/a/?a=x&b=1&b=2"), "v2") != key
+
+
+def test_response_cached_until_refresh(
+    response_cache,
+    api_client,
+    new_sample,
+    django_assert_num_queries,
+):
+    """Cached response is served without querying the data, until views are refreshed."""
+    # pylint: disable=unused-argument,redefined-outer-name
+    endpoint = reverse("v1:overview:global-resistance-stats")
+    new_sample()
+    refresh_global_stats()
+
+    response = api_client.get(endpoint)
+    assert response.json()["total"]["totalSum"] == 1
+
+    # data version only
+    with django_assert_num_queries(1):
+        cached = api_client.get(endpoint)
+    assert cached.content == response.content
+    assert cached["X-Data-Refreshed-At"] == response["X-Data-Refreshed-At"]
+
+    new_sample()
+    assert api_client.get(endpoint).json()["total"]["totalSum"] == 1
+
+    refresh_global_stats()
+    assert api_client.get(endpoint).json()["total"]["totalSum"] == 2
+
+
+def test_gene_search_not_cached(response_cache, api_client):
+    """Gene searches go through the view, to be counted in search history."""
+    # pylint: disable=unused-argument,redefined-outer-name
+    RefreshMaterializedViewsService.execute({"views": ["overview.Gene"], "concurrency": 1})
+    endpoint = reverse("v1:overview:gene-list")
+
+    for _ in range(2):
+        assert api_client.get(endpoint, {"search": "Rv0001"}).status_code == 200
+
+    assert GeneSearchHistory.objects.get(gene_db_crossref_id=7).counter == 2
+
+
+def test_gene_detail_fresh_after_associations_refresh(response_cache, api_client, drugs):
+    """Gene details are not served from cache, once drug associations are refreshed."""
+    # pylint: disable=unused-argument,redefined-outer-name
+    RefreshMaterializedViewsService.execute(
+        {"views": ["overview.Gene", "overview.DrugGene"], "concurrency": 1},
+    )
+    gene = Gene.objects.order_by("gene_db_crossref").first()
+    endpoint = reverse("v1:overview:gene-detail", (gene.dbxref_id,))
+    response = api_client.get(endpoint)
+    assert drugs[0].drug_name not in response.json()["genes"][gene.gene_name]
+
+    GeneDrugResistanceAssociation.objects.create(
+        gene_db_crossref_id=gene.dbxref_id,
+        drug=drugs[0],
+        tier=1,
+    )
+    RefreshMaterializedViewsService.execute({"views": ["overview.DrugGene"], "concurrency": 1})
+
+    fresh = api_client.get(endpoint, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert fresh.status_code == 200
+    assert fresh["ETag"] != response["ETag"]
+    assert drugs[0].drug_name in fresh.json()["genes"][gene.gene_name]
@@ -0,0 +1,89 @@
+from overview.models import SampleDrugResult
+from submission.util.datagen import PackageGenerator
+
+
+def result_rows():
+    """Sample drug results as comparable tuples."""
+    return set(
+        SampleDrugResult.objects.values_list(
+            "sample_id",
+            "drug_id",
+            "country_id",
+            "sampling_date",
+            "test_result",
+        ),
+    )
+
+
+def test_partial_rebuild_matches_full_rebuild(alice_package, drugs, countries):
+    """Results, recalculated sample by sample, are the same as full rebuild."""
+    # pylint: disable=unused-argument
+    inh, rif, *_ = drugs
+    for idx, results in enumerate(("S", "R", "SR", "RR")):
+        alice_package.new_sample(countries[idx].three_letters_code, 2020 + idx)
+        alice_package.new_alias(f"A{idx}", alice_package.sample)
+        for result in results:
+            alice_package.new_pds_test(result, drug=inh, staging=False)
+        alice_package.new_pds_test("S", drug=rif, staging=False)
+    # staging test doesn't count
+    alice_package.new_pds_test("R", drug=rif, staging=True)
+
+    SampleDrugResult.refresh()
+    full = result_rows()
+    # contradictory results are left out
+    assert len(full) == 7
+
+    SampleDrugResult.objects.all().delete()
+    for sample in alice_package.package.samples.all():
+        SampleDrugResult.objects.rebuild(sample_ids=[sample.pk])
+
+    assert result_rows() == full
+
+
+def test_tests_without_result_ignored(alice_package, drugs, countries):
+    """Test without a result doesn't contradict the other one, nor breaks the rebuild."""
+    # pylint: disable=unused-argument
+    drug = drugs[0]
+    alice_package.new_sample(countries[0].three_letters_code, 2020)
+    alice_package.new_alias("A1", alice_package.sample)
+    alice_package.new_pds_test(None, drug=drug, staging=False)
+    alice_package.new_pds_test("R", drug=drug, staging=False)
+
+    SampleDrugResult.refresh()
+    assert list(SampleDrugResult.objects.values_list("drug_id", "test_result")) == [
+        (drug.pk, "R"),
+    ]
+
+    SampleDrugResult.objects.rebuild(sample_ids=[alice_package.sample.pk])
+    assert SampleDrugResult.objects.get().test_result == "R"
+
+
+def test_accepted_package_samples_recalculated(alice, drugs, countries):
+    """On package acceptance only its samples are recalculated."""
+    # pylint: disable=unused-argument
+    drug = drugs[0]
+    other = PackageGenerator(alice, name="Other")
+    other.new_sample(countries[0].three_letters_code, 2020)
+    other.new_alias("OTHER", other.sample)
+    other.new_pds_test("S", drug=drug, staging=False)
+
+    accepted = PackageGenerator(alice, name="Accepted")
+    accepted.new_sample(countries[1].three_letters_code, 2021)
+    accepted.new_alias("ACCEPTED", accepted.sample)
+    accepted.new_pds_test("R", drug=drug, staging=True)
+
+    package = accepted.package
+    package.matching_state = package.MatchingState.MATCHED
+    package.to_pending()
+    package.pending_to_accepted()
+
+    # other package sample is left as is, until full rebuild
+    assert result_rows() == {
+        (
+            accepted.sample.pk,
+            drug.pk,
+            countries[1].pk,
+            accepted.sample.sampling_date,
+            "R",
+        ),
+    }
@@ -0,0 +1,187 @@
+import random
+import re
+from pathlib import Path
+
+import numpy as np
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.reverse import reverse
+
+import genphen
+from genphen.models import Drug
+
+from overview.models import GlobalResistanceStats, SampleDrugResult
+from overview.models.views.global_resistance import COUNTERS
+from overview.resistance import DRUG_GROUPS, DRUG_NAMES, ResistanceClassifier, ResistanceType
+from overview.services.resistance_classification import classify_samples
+from submission.models import GenotypeResistance
+
+COUNTER_OF_TYPE = {
+    ResistanceType.MONO: "mono_resistant",
+    ResistanceType.POLY: "poly_resistant",
+    ResistanceType.MULTIDRUG: "multidrug_resistant",
+    ResistanceType.EXTENSIVE: "extensive_drug_resistant",
+    ResistanceType.RIFAMPICIN: "rifampicin_resistant",
+}
+
+# resistance rules drugs, and a couple of others
+RANDOM_DRUGS = (
+    "Isoniazid",
+    "Rifampicin",
+    "Ethambutol",
+    "Pyrazinamide",
+    "Fluoroquinolones",
+    "Capreomycin",
+    "Kanamycin",
+    "Amikacin",
+    "Streptomycin",
+    "Linezolid",
+)
+
+
+def test_classifier_matrix():
+    """Samples × drugs matrix is classified by drug groups."""
+    # isoniazid, rifampicin, amikacin, fluoroquinolones, ethambutol and linezolid
+    classifier = ResistanceClassifier([1, 2, 7, 25, 4, 16])
+    resistant = classifier.resistance_matrix(
+        [10, 20, 30, 40],
+        [(10, 1), (20, 1), (20, 2), (30, 1), (30, 2), (30, 7), (30, 25)]
+        + [(40, 1), (40, 4), (40, 16)],
+    )
+    types = classifier.classify(resistant, np.array([False, False, False, True]))
+
+    assert {t: list(types[t]) for t in ResistanceType} == {
+        ResistanceType.MONO: [True, False, False, False],
+        ResistanceType.POLY: [False, False, True, True],
+        ResistanceType.MULTIDRUG: [False, True, True, False],
+        ResistanceType.EXTENSIVE: [False, False, True, False],
+        ResistanceType.RIFAMPICIN: [False, True, True, True],
+    }
+
+
+def test_classifier_agrees_with_sql(alice_package, drugs, countries):
+    """Python classifier and GlobalResistanceStats view count the same samples."""
+    # pylint: disable=unused-argument
+    rnd = random.Random(42)
+    named = [d for d in drugs if d.drug_name in RANDOM_DRUGS]
+    rifampicin = next(d for d in drugs if d.drug_name == "Rifampicin")
+    sample_ids = []
+    for index in range(80):
+        sample = alice_package.new_sample(rnd.choice(["FRA", "KAZ", None]), 2020)
+        alice_package.new_alias(f"A{index}", sample)
+        for drug in rnd.sample(named, rnd.randint(0, 5)):
+            alice_package.new_pds_test(rnd.choice("RRS"), drug=drug, staging=False)
+        if rnd.random() < 0.2:
+            GenotypeResistance.objects.create(
+                sample=sample,
+                drug=rifampicin,
+                variant="",
+                resistance_flag="R",
+            )
+        sample_ids.append(sample.pk)
+    SampleDrugResult.objects.rebuild()
+    GlobalResistanceStats.refresh()
+
+    classified = classify_samples(sample_ids)
+    counts = {
+        COUNTER_OF_TYPE[resistance_type]: sum(
+            resistance_type in sample["resistance_types"] for sample in classified
+        )
+        for resistance_type in ResistanceType
+    }
+    counts["total_samples"] = len(classified)
+
+    totals = GlobalResistanceStats.objects.totals()
+    assert counts == {name: totals[name] for name in COUNTERS}
+    assert counts["multidrug_resistant"] > 0
+
+
+def test_sample_resistance_endpoint(client_of, alice_package, drugs, countries):
+    """Samples with results are listed with their resistant drugs and resistance types."""
+    # pylint: disable=unused-argument
+    drug = {d.drug_name: d for d in drugs}
+    sample = alice_package.new_sample("FRA", 2020)
+    alice_package.new_alias("A1", sample)
+    for name in ("Isoniazid", "Rifampicin"):
+        alice_package.new_pds_test("R", drug=drug[name], staging=False)
+    alice_package.new_pds_test("S", drug=drug["Ethambutol"], staging=False)
+    susceptible = alice_package.new_sample("FRA", 2020)
+    alice_package.new_alias("A2", susceptible)
+    alice_package.new_pds_test("S", drug=drug["Ethambutol"], staging=False)
+    # no results at all
+    alice_package.new_sample("FRA", 2020)
+    SampleDrugResult.objects.rebuild()
+    client = client_of(alice_package.package.owner)
+
+    data = client.get(reverse("v1:overview:sample-resistance-list")).json()
+    assert data["count"] == 2
+    assert data["results"] == [
+        {
+            "sampleId": sample.pk,
+            "resistantDrugs": sorted([drug["Isoniazid"].pk, drug["Rifampicin"].pk]),
+            "resistanceTypes": ["mdr", "rr"],
+        },
+        {"sampleId": susceptible.pk, "resistantDrugs": [], "resistanceTypes": []},
+    ]
+
+    data = client.get(
+        reverse("v1:overview:sample-resistance-detail", args=[sample.pk]),
+    ).json()
+    assert data["resistanceTypes"] == ["mdr", "rr"]
+
+
+def test_unaccepted_package_samples_not_listed(api_client, alice_package, drugs, countries):
+    """Samples of packages, not accepted yet, are not disclosed."""
+    # pylint: disable=unused-argument
+    sample = alice_package.new_sample("FRA", 2020)
+    alice_package.new_alias("A1", sample)
+    alice_package.new_pds_test("R", drug=drugs[0])
+    SampleDrugResult.objects.rebuild()
+
+    data = api_client.get(reverse("v1:overview:sample-resistance-list")).json()
+    assert data["count"] == 0
+    response = api_client.get(
+        reverse("v1:overview:sample-resistance-detail", args=[sample.pk]),
+    )
+    assert response.status_code == 404
+
+
+def test_drug_groups_match_initial_data():
+    """Drug ids of resistance rules are the ones genphen initial data gives the drugs."""
+    sql_path = Path(genphen.__file__).parent / "sql" / "0007_initial_data.sql"
+    sql = sql_path.read_text(encoding="utf-8")
+    values = sql.split("VALUES", 1)[1].split(") x(", 1)[0]
+    # drugs are numbered in the order they are inserted
+    names = re.findall(r"\('[^']*',\s*'([^']*)',\s*'[^']*'\)", values)
+    drug_ids = {name: drug_id for drug_id, name in enumerate(names, 1)}
+    assert DRUG_GROUPS == {
+        "ethambutol": (drug_ids["Ethambutol"],),
+        "isoniazid": (drug_ids["Isoniazid"],),
+        "pyrazinamide": (drug_ids["Pyrazinamide"],),
+        "rifampicin": (drug_ids["Rifampicin"],),
+        "fluoroquinolones": (drug_ids["Fluoroquinolones"],),
+        "injectables": (drug_ids["Capreomycin"], drug_ids["Amikacin"], drug_ids["Kanamycin"]),
+    }
+    assert DRUG_NAMES == {drug_ids[name]: name for name in DRUG_NAMES.values()}
+
+
+def test_mismatched_drug_ids_fail(drugs):
+    """Resistance rules are not applied to drug ids, naming other drugs."""
+    drug = next(d for d in drugs if d.drug_id == DRUG_GROUPS["rifampicin"][0])
+    drug.drug_name = "Renamed"
+    drug.save()
+
+    with pytest.raises(ImproperlyConfigured, match="2 'Renamed'"):
+        GlobalResistanceStats.refresh()
+    with pytest.raises(ImproperlyConfigured, match="2 'Renamed'"):
+        classify_samples([])
+
+
+def test_moved_drug_ids_fail(drugs):
+    """Resistance rules are not applied, when the drugs they name have other ids."""
+    drug = next(d for d in drugs if d.drug_name == "Isoniazid")
+    Drug.objects.filter(pk=drug.pk).delete()
+    Drug.objects.create(drug_id=100, drug_name="Isoniazid")
+
+    with pytest.raises(ImproperlyConfigured, match="100 'Isoniazid'"):
+        GlobalResistanceStats.refresh()
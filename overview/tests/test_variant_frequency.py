@@ -0,0 +1,59 @@
+from overview.models import GenotypedSampleCount, VariantFrequency
+from submission.models import Genotype
+
+
+def frequency_rows():
+    """Variant frequencies as comparable tuples."""
+    return set(VariantFrequency.objects.values_list("variant_id", "sample_count"))
+
+
+def test_frequency_follows_genotypes(alice_package, variants):
+    """Frequencies and sample total are updated on genotypes insert and delete."""
+    # pylint: disable=unused-argument
+    samples = []
+    for _ in range(4):
+        alice_package.new_sample()
+        samples.append(alice_package.sample)
+
+    def new_genotypes(pairs):
+        Genotype.objects.bulk_create(
+            Genotype(
+                sample=samples[sample_idx],
+                variant_id=variant_id,
+                genotyper="freebayes",
+                quality=quality,
+                reference_ad=1,
+                alternative_ad=1,
+                total_dp=2,
+                genotype_value="A",
+            )
+            for sample_idx, variant_id, quality in pairs
+        )
+
+    new_genotypes([(0, 1, 150), (1, 1, 150), (2, 1, 100), (0, 2, 150)])
+    assert frequency_rows() == {(1, 2), (2, 1)}
+    assert GenotypedSampleCount.get() == 3
+
+    new_genotypes([(3, 1, 150), (1, 2, 150)])
+    assert frequency_rows() == {(1, 3), (2, 2)}
+    assert GenotypedSampleCount.get() == 4
+
+    assert list(VariantFrequency.objects.frequency_gte(75).values_list("variant", flat=True)) == [
+        1,
+    ]
+    assert VariantFrequency.objects.with_frequency().get(pk=2).frequency == 50.0
+
+    Genotype.objects.filter(sample=samples[0]).delete()
+    assert frequency_rows() == {(1, 2), (2, 1)}
+    assert GenotypedSampleCount.get() == 3
+
+    Genotype.objects.filter(variant_id=2).delete()
+    assert frequency_rows() == {(1, 2)}
+    # the sample still has low quality genotype
+    Genotype.objects.filter(sample=samples[2]).update(quality=130)
+    assert frequency_rows() == {(1, 3)}
+    assert GenotypedSampleCount.get() == 3
+
+    VariantFrequency.refresh()
+    assert frequency_rows() == {(1, 3)}
+    assert GenotypedSampleCount.get() == 3
@@ -0,0 +1,73 @@
+from overview.models import VariantSampleSummary
+from submission.models import Genotype
+
+
+def summary_rows():
+    """Variant sample summary as comparable tuples."""
+    return set(VariantSampleSummary.objects.values_list("variant_id", "sample_id", "qualified"))
+
+
+def new_genotype(sample, variant_id, genotyper="freebayes", quality=150):
+    """Create genotype of the sample."""
+    return Genotype.objects.create(
+        sample=sample,
+        variant_id=variant_id,
+        genotyper=genotyper,
+        quality=quality,
+        reference_ad=530,
+        alternative_ad=510,
+        total_dp=900,
+        genotype_value="ABCDEF",
+    )
+
+
+def test_summary_follows_genotypes(alice_package, variants):
+    """Summary is kept up to date with genotypes inserts, updates and deletes."""
+    # pylint: disable=unused-argument
+    samples = []
+    for _ in range(3):
+        alice_package.new_sample()
+        samples.append(alice_package.sample)
+
+    low = new_genotype(samples[0], 1, quality=100)
+    new_genotype(samples[0], 1, genotyper="gatk")
+    assert summary_rows() == {(1, samples[0].pk, False)}
+
+    Genotype.objects.bulk_create(
+        [
+            Genotype(
+                sample=sample,
+                variant_id=2,
+                genotyper="freebayes",
+                quality=130,
+                reference_ad=1,
+                alternative_ad=1,
+                total_dp=2,
+                genotype_value="A",
+            )
+            for sample in samples
+        ],
+    )
+    assert summary_rows() == {
+        (1, samples[0].pk, False),
+        (2, samples[0].pk, True),
+        (2, samples[1].pk, True),
+        (2, samples[2].pk, True),
+    }
+
+    low.quality = 200
+    low.save()
+    assert (1, samples[0].pk, True) in summary_rows()
+
+    low.delete()
+    assert (1, samples[0].pk, False) in summary_rows()
+
+    Genotype.objects.filter(sample=samples[0]).delete()
+    assert summary_rows() == {
+        (2, samples[1].pk, True),
+        (2, samples[2].pk, True),
+    }
+
+    expected = summary_rows()
+    VariantSampleSummary.refresh()
+    assert summary_rows() == expected
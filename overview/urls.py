@@ -30,6 +30,11 @@ router.register(
     basename="drug-gene-infos",
 )
 router.register(r"genes", views.GeneViewSet, basename="gene")
+router.register(
+    r"sample-resistance",
+    views.SampleResistanceViewSet,
+    basename="sample-resistance",
+)
 router.register(
     r"gene-search-history",
     views.GeneSearchHistoryViewSet,
@@ -7,3 +7,4 @@ from .global_drug import (
     ResistanceStatsByCountryViewSet,
 )
 from .global_resistance_stats import GlobalResistanceStatsView
+from .sample_resistance import SampleResistanceViewSet
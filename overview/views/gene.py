@@ -1,22 +1,32 @@
-from django.db.models import Q
+from psycopg2.extras import NumericRange
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from ..filters import GeneSearchFilter
+from ..filters import GeneSearchFilter, prefix_search, trigram_search
 from ..models import Gene
-from ..paginations import PageSizePageNumberPagination
-from ..serializers import GeneSerializer, GeneRetrieveSerializer
+from ..paginations import GenePagination
+from ..serializers import (
+    GeneSerializer,
+    GeneRetrieveSerializer,
+    GenomeContextQuerySerializer,
+    SearchQuerySerializer,
+)
+from .mixins import CachedResponseMixin, DataRefreshedAtMixin
 
 
 class GeneViewSet(
+    DataRefreshedAtMixin,
+    CachedResponseMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
     viewsets.mixins.RetrieveModelMixin,
 ):
     """Genes viewset."""
 
-    pagination_class = PageSizePageNumberPagination
+    # gene details list drugs associated with the gene
+    refreshed_views = ("overview.Gene", "overview.DrugGene")
+    pagination_class = GenePagination
     queryset = (
         Gene.objects.all()
         .select_related("dbxref")
@@ -27,6 +37,16 @@ class GeneViewSet(
     filter_backends = (GeneSearchFilter,)
     search_fields = ["gene_name", "locus_tag", "ncbi_id"]
 
+    def is_cacheable(self, request) -> bool:
+        """Searches go through the view, to count them in gene search history."""
+        return super().is_cacheable(request) and not request.GET.get("search")
+
+    def get_validators(self, request):
+        """Searches are never answered with 304, for the same reason."""
+        if request.GET.get("search"):
+            return None, None
+        return super().get_validators(request)
+
     def get_serializer_class(self):
         """
         Use custom serializer for single gene retrieve.
@@ -45,18 +65,66 @@ class GeneViewSet(
         url_name="genomecontext",
     )
     def genome_context(self, request, **kwargs):  # pylint: disable=unused-argument
-        """List of genes by locations."""
-        start_pos = request.GET.get("start_pos", None)
-        end_pos = request.GET.get("end_pos", None)
-        if not start_pos or not end_pos:
+        """
+        List of genes, overlapping genome positions window, optionally padded on both sides.
+
+        Looked up by GiST index on gene locations.
+        """
+        if not request.GET.get("start_pos") or not request.GET.get("end_pos"):
             result = {
                 "detail": "Please add genome positions.",
             }
             return Response(result)
-        queryset = Gene.objects.filter(
-            Q(start_pos__lte=end_pos, end_pos__gte=end_pos)
-            | Q(end_pos__gte=start_pos, start_pos__lte=start_pos)
-            | Q(start_pos__gte=start_pos, end_pos__lte=end_pos),
-        ).order_by("start_pos")
+        params = GenomeContextQuerySerializer(data=request.GET)
+        params.is_valid(raise_exception=True)
+        padding = params.validated_data["padding"]
+        window = NumericRange(
+            max(params.validated_data["start_pos"] - padding, 0),
+            params.validated_data["end_pos"] + padding,
+            "[]",
+        )
+        queryset = Gene.objects.filter(location__overlap=window).order_by(
+            "start_pos",
+            "dbxref",
+        )
+        if "limit" in params.validated_data:
+            queryset = queryset[: params.validated_data["limit"]]
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="fuzzy-search",
+        url_name="fuzzysearch",
+    )
+    def fuzzy_search(self, request, **kwargs):  # pylint: disable=unused-argument
+        """Genes, best matching possibly misspelled search fields, looked up by trigram indexes."""
+        params = SearchQuerySerializer(data=request.GET)
+        params.is_valid(raise_exception=True)
+        queryset = trigram_search(
+            self.get_queryset(),
+            self.search_fields,
+            params.validated_data["q"],
+        )
+        serializer = self.get_serializer(
+            queryset[: params.validated_data["limit"]],
+            many=True,
+        )
+        return Response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def autocomplete(self, request, **kwargs):  # pylint: disable=unused-argument
+        """Genes with name or locus tag, starting with given prefix, for search-as-you-type."""
+        params = SearchQuerySerializer(data=request.GET)
+        params.is_valid(raise_exception=True)
+        queryset = prefix_search(
+            Gene.objects.all(),
+            ("gene_name", "locus_tag"),
+            params.validated_data["q"],
+        ).order_by("locus_tag", "dbxref")
+        serializer = self.get_serializer(
+            queryset[: params.validated_data["limit"]],
+            many=True,
+        )
+        return Response(serializer.data)
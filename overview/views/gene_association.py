@@ -4,6 +4,7 @@ from rest_framework.generics import get_object_or_404
 
 from genphen.models import GeneDrugResistanceAssociation
 from genphen.serializers import DrugReadSerializer
+from .mixins import DataRefreshedAtMixin
 
 
 # TODO remove together with DrugGene matview after FE switched on new endpoint
@@ -46,6 +47,7 @@ class LegacyGeneDrugResistanceAssociationSerializer(serializers.ModelSerializer)
 
 
 class GeneAssociationViewSet(
+    DataRefreshedAtMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
     viewsets.mixins.RetrieveModelMixin,
@@ -56,6 +58,8 @@ class GeneAssociationViewSet(
     Must be switched to GeneDrugResistanceAssociationsViewSet (FE work required).
     """
 
+    # associations are imported along with DrugGene refresh
+    refreshed_views = ("overview.Gene", "overview.DrugGene")
     queryset = (
         GeneDrugResistanceAssociation.objects.distinct("gene_db_crossref")
         .select_related("gene_db_crossref__data")
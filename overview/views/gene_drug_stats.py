@@ -1,20 +1,46 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
-from ..filters import GeneDrugStatsFilter
+from ..filters import GeneDrugStatsFilter, prefix_search
 from ..models.views import GeneDrugStats
-from ..paginations import PluggablePageSizePageNumberPagination
-from ..serializers import GeneDrugStatsSerializer
+from ..paginations import GeneDrugStatsPagination
+from ..serializers import GeneDrugStatsSerializer, VariantAutocompleteQuerySerializer
+from .mixins import CachedResponseMixin, DataRefreshedAtMixin
 
 
 class GeneDrugStatsViewSet(
+    DataRefreshedAtMixin,
+    CachedResponseMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
 ):
     """Gene drug resistance stats data (table at the bottom of drugs/genes tabs)."""
 
+    refreshed_views = ("overview.GeneDrugStats",)
     queryset = GeneDrugStats.objects.with_stats()
     serializer_class = GeneDrugStatsSerializer
-    pagination_class = PluggablePageSizePageNumberPagination
+    pagination_class = GeneDrugStatsPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = GeneDrugStatsFilter
+
+    def get_queryset(self):
+        """Rows are read by index in cursor mode, and summed up otherwise."""
+        if self.paginator.cursor_query_param in self.request.GET:
+            return GeneDrugStats.objects.rows()
+        return super().get_queryset()
+
+    @action(methods=["GET"], detail=False)
+    def autocomplete(self, request, **kwargs):  # pylint: disable=unused-argument
+        """Distinct variant names or annotations, starting with given prefix."""
+        params = VariantAutocompleteQuerySerializer(data=request.GET)
+        params.is_valid(raise_exception=True)
+        field = params.validated_data["field"]
+        values = (
+            prefix_search(GeneDrugStats.objects.all(), (field,), params.validated_data["q"])
+            .order_by(field)
+            .values_list(field, flat=True)
+            .distinct()
+        )
+        return Response(list(values[: params.validated_data["limit"]]))
@@ -1,21 +1,48 @@
+import json
+from hashlib import sha256
+from typing import List
+
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from tbkb.views import ConditionalGetMixin
 from ..models import GeneSearchHistory
 from ..serializers import GeneSearchSerializer
+from ..services.search_history import history_lists
 
 
 # TODO make use of pagination and sorting (requires FE work)
 class GeneSearchHistoryViewSet(
+    ConditionalGetMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
 ):
-    """GeneMostSearched views."""
+    """
+    GeneMostSearched views.
+
+    Lists are served from cache, refreshed after every flush of search counters.
+    """
 
     queryset = GeneSearchHistory.objects.all().order_by("-counter")[:10]
     serializer_class = GeneSearchSerializer
 
+    @staticmethod
+    def history_list(action_name: str) -> List[dict]:
+        """Cached list, served by the action."""
+        return history_lists()["recently" if action_name == "recently_search" else "most"]
+
+    def get_validators(self, request):
+        """Version of the served list, no database query needed."""
+        # validators are checked before DRF resolves the action
+        action_name = self.action_map.get(request.method.lower())
+        data = json.dumps(self.history_list(action_name), sort_keys=True, default=str)
+        return sha256(data.encode()).hexdigest(), None
+
+    def list(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        """List of most searched genes, ordered by counter."""
+        return Response(self.history_list(self.action))
+
     @action(
         methods=["GET"],
         detail=False,
@@ -24,6 +51,4 @@ class GeneSearchHistoryViewSet(
     )
     def recently_search(self, request, **kwargs):  # pylint: disable=unused-argument
         """List of recently searched genes, ordered by date."""
-        queryset = GeneSearchHistory.objects.all().order_by("-date")[:10]
-        serializer = self.serializer_class(queryset, many=True)
-        return Response(serializer.data)
+        return Response(self.history_list(self.action))
@@ -7,14 +7,18 @@ from ..serializers import (
     ResistanceStatsByDrugSerializer,
     ResistanceStatsByCountrySerializer,
 )
+from .mixins import CachedResponseMixin, DataRefreshedAtMixin
 
 
 class ResistanceStatsByDrugViewSet(
+    DataRefreshedAtMixin,
+    CachedResponseMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
 ):
     """Resistance stats by drug (drug tab graph)."""
 
+    refreshed_views = ("overview.SampleDrugResultStats",)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ResistanceStatsFilter
     serializer_class = ResistanceStatsByDrugSerializer
@@ -25,11 +29,14 @@ class ResistanceStatsByDrugViewSet(
 
 
 class ResistanceStatsByCountryViewSet(
+    DataRefreshedAtMixin,
+    CachedResponseMixin,
     viewsets.GenericViewSet,
     viewsets.mixins.ListModelMixin,
 ):
     """Resistance stats by country (overview tab graph)."""
 
+    refreshed_views = ("overview.SampleDrugResultStats",)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = ResistanceStatsFilter
     serializer_class = ResistanceStatsByCountrySerializer
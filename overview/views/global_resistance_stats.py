@@ -2,11 +2,36 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from ..models import GlobalResistanceStats
+from ..models.views.global_resistance import COUNTERS
+from .mixins import CachedResponseMixin, DataRefreshedAtMixin
 
 
-class GlobalResistanceStatsView(APIView):
+def stats_data(counters: dict) -> dict:
+    """Resistance counters and their ratios to total samples, follow old naming."""
+    total = counters["total_samples"]
+
+    def ratio(name: str) -> float:
+        return counters[name] * 100.0 / total if total else 0.0
+
+    return {
+        "totalSum": total,
+        "monoResSum": counters["mono_resistant"],
+        "polyResSum": counters["poly_resistant"],
+        "multiDrugResSum": counters["multidrug_resistant"],
+        "extDrugResSum": counters["extensive_drug_resistant"],
+        "rifResSum": counters["rifampicin_resistant"],
+        "ratioMonoRes": ratio("mono_resistant"),
+        "ratioPolyRes": ratio("poly_resistant"),
+        "ratioMultiDrugRes": ratio("multidrug_resistant"),
+        "ratioExtDrugRes": ratio("extensive_drug_resistant"),
+        "ratioRifRes": ratio("rifampicin_resistant"),
+    }
+
+
+class GlobalResistanceStatsView(DataRefreshedAtMixin, CachedResponseMixin, APIView):
     """Global resistance statistics for samples."""
 
+    refreshed_views = ("overview.GlobalResistanceStats",)
     permission_classes = []
 
     def get(
@@ -14,22 +39,17 @@ class GlobalResistanceStatsView(APIView):
         request,
         format=None,
     ):  # pylint: disable=redefined-builtin,unused-argument
-        """Return single record with global resistance statistics numbers."""
-        record = GlobalResistanceStats.objects.with_ratios().all()[0]
+        """Return global resistance statistics numbers, in total and by country."""
+        stats = GlobalResistanceStats.objects
+        countries = [
+            {
+                "countryId": record["country"],
+                **stats_data({name: record[f"{name}_sum"] for name in COUNTERS}),
+            }
+            for record in stats.by_country()
+        ]
         data = {
-            "countries": [],
-            "total": {
-                "totalSum": record["total_samples"],
-                "monoResSum": record["mono_resistant"],
-                "polyResSum": record["poly_resistant"],
-                "multiDrugResSum": record["multidrug_resistant"],
-                "extDrugResSum": record["extensive_drug_resistant"],
-                "rifResSum": record["rifampicin_resistant"],
-                "ratioMonoRes": record["ratio_mono_res"],
-                "ratioPolyRes": record["ratio_poly_res"],
-                "ratioMultiDrugRes": record["ratio_multi_drug_res"],
-                "ratioExtDrugRes": record["ratio_ext_drug_res"],
-                "ratioRifRes": record["ratio_rif_res"],
-            },
+            "countries": countries,
+            "total": stats_data(stats.totals()),
         }
         return Response(data)
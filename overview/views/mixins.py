@@ -0,0 +1,120 @@
+from datetime import datetime
+from hashlib import sha256
+from typing import Dict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from tbkb.views import ConditionalGetMixin
+from ..models import MaterializedViewRefresh
+
+
+class DataRefreshedAtMixin(ConditionalGetMixin):
+    """
+    Tell clients how fresh the served data is.
+
+    Adds `X-Data-Refreshed-At` header with the time of the latest refresh
+    of the materialized views, listed in `refreshed_views`.
+    If there are several, the oldest refresh is reported.
+    Refreshes also version the data for conditional requests.
+    """
+
+    refreshed_views: tuple = ()
+
+    def last_refreshes(self) -> Dict[str, datetime]:
+        """Latest refresh time of every view, queried once per request."""
+        if not hasattr(self, "_last_refreshes"):
+            # pylint: disable=attribute-defined-outside-init
+            self._last_refreshes = MaterializedViewRefresh.objects.last_refreshes(
+                self.refreshed_views,
+            )
+        return self._last_refreshes
+
+    def data_version(self) -> str:
+        """Version stamp of the data, changed by every refresh of any of the views."""
+        return ";".join(
+            f"{view}={last.timestamp()}"
+            for view, last in sorted(self.last_refreshes().items())
+        )
+
+    def get_validators(self, request):
+        """Version the data by views refreshes."""
+        refreshes = self.last_refreshes()
+        if not refreshes:
+            return None, None
+        return self.data_version(), max(refreshes.values())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Add data refresh time header to successful responses."""
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code < 400:
+            refreshes = self.last_refreshes()
+            if refreshes:
+                refreshed_at = min(refreshes.values())
+                response["X-Data-Refreshed-At"] = refreshed_at.isoformat()
+        return response
+
+
+def response_cache_key(request, version: str) -> str:
+    """
+    Cache key of the request response.
+
+    Query params are normalized, so that their order or empty values
+    don't produce different keys for the same response.
+    """
+    params = urlencode(
+        [
+            (name, value)
+            for name, values in sorted(request.GET.lists())
+            for value in sorted(values)
+            if value != ""
+        ],
+    )
+    key = "\n".join((request.path, request.META.get("HTTP_ACCEPT", ""), params, version))
+    return f"overview:response:{sha256(key.encode()).hexdigest()}"
+
+
+class CachedResponseMixin:
+    """
+    Cache public GET responses, until `refreshed_views` are refreshed.
+
+    Goes after DataRefreshedAtMixin, which versions the data.
+    Responses are keyed by normalized query params and the data version,
+    so any refresh makes previous responses unreachable.
+    Requests with credentials always go through the view.
+    """
+
+    def is_cacheable(self, request) -> bool:
+        """Check, if the request response could be cached."""
+        return (
+            settings.OVERVIEW_CACHE_TIMEOUT > 0
+            and request.method == "GET"
+            and "HTTP_AUTHORIZATION" not in request.META
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        """Return cached response, or cache the one produced by the view."""
+        if not self.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = response_cache_key(request, self.data_version())  # pylint: disable=no-member
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            return HttpResponse(content, headers=headers)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200 or not isinstance(response, Response):
+            return response
+        # content type is known once rendered
+        response.render()
+        if response["Content-Type"].startswith("application/json"):
+            cache.set(
+                key,
+                (response.content, dict(response.headers)),
+                settings.OVERVIEW_CACHE_TIMEOUT,
+            )
+        return response
@@ -0,0 +1,35 @@
+from rest_framework import viewsets
+from rest_framework.response import Response
+
+from submission.models import Sample
+from ..models import SampleDrugResult
+from ..paginations import PageSizePageNumberPagination
+from ..serializers import SampleResistanceSerializer
+from ..services.resistance_classification import classify_samples
+
+
+class SampleResistanceViewSet(
+    viewsets.GenericViewSet,
+    viewsets.mixins.ListModelMixin,
+    viewsets.mixins.RetrieveModelMixin,
+):
+    """Resistance types of samples, every page is classified in one batch."""
+
+    # only samples with production results, staging data of packages is not disclosed
+    queryset = Sample.objects.filter(
+        pk__in=SampleDrugResult.objects.values("sample_id"),
+    ).order_by("pk")
+    serializer_class = SampleResistanceSerializer
+    pagination_class = PageSizePageNumberPagination
+
+    def list(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        """Classify the page of samples."""
+        page = self.paginate_queryset(self.get_queryset().values_list("pk", flat=True))
+        serializer = self.get_serializer(classify_samples(page), many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        """Classify single sample."""
+        sample = self.get_object()
+        serializer = self.get_serializer(classify_samples([sample.pk])[0])
+        return Response(serializer.data)
@@ -2,6 +2,7 @@
 from . import (
     attachment,
     communication,
+    job,
     package,
     sample,
     sample_alias,
@@ -0,0 +1,33 @@
+from django.contrib import admin
+
+from submission.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Background job admin page."""
+
+    list_display = [
+        "pk",
+        "kind",
+        "state",
+        "package",
+        "owner",
+        "created_at",
+        "finished_at",
+    ]
+    list_filter = ["kind", "state"]
+    readonly_fields = [
+        "kind",
+        "state",
+        "package",
+        "owner",
+        "payload",
+        "file",
+        "result",
+        "errors",
+        "attempts",
+        "created_at",
+        "started_at",
+        "finished_at",
+    ]
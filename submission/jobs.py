@@ -0,0 +1,297 @@
+"""
+Background jobs.
+
+Long running package operations are queued as Job records by API endpoints,
+and executed by `runjobs` management command workers.
+"""
+import logging
+import time
+from datetime import timedelta
+from typing import Callable, Dict, Optional, Type
+
+from botocore.exceptions import BotoCoreError
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from drf_standardized_errors.settings import package_settings
+from rest_framework import exceptions, serializers
+
+from identity.models import User
+from submission.models import (
+    Job,
+    Package,
+    PackageSequencingData,
+    PackageStats,
+    SequencingData,
+)
+from submission.services import Service
+from submission.services.file_import.mic import PackageFileMICImportService
+from submission.services.file_import.pdst import PackageFilePDSTImportService
+from submission.services.matching import MatchingService
+from submission.services.s3bucket import SequencingDataS3BucketService
+from submission.util.tag import clear_s3_tag
+
+log = logging.getLogger(__name__)
+
+HANDLERS: Dict[str, Callable[[Job], Optional[dict]]] = {}
+
+# network and storage failures, the job is queued again on them
+TRANSIENT_ERRORS = (OSError, BotoCoreError)
+
+
+def handler(kind: Job.Kind):
+    """Register function as a handler of jobs of the kind."""
+
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+
+    return decorator
+
+
+def enqueue(
+    kind: Job.Kind,
+    package: Optional[Package],
+    owner: User,
+    file=None,
+    **payload,
+) -> Job:
+    """Queue new job, package-less jobs are not listed in any package jobs."""
+    job = Job.objects.create(
+        kind=kind,
+        package=package,
+        owner=owner,
+        file=file,
+        payload=payload,
+    )
+    log.info("job queued: %s by %s", job, owner)
+    return job
+
+
+def lock_editable_package(job: Job) -> Package:
+    """Lock job package for the rest of the transaction, fail the job if it can't be edited."""
+    package = Package.objects.editable().select_for_update().filter(pk=job.package_id).first()
+    if package is None:
+        # the package was submitted while the job was waiting
+        raise serializers.ValidationError("The package cannot be edited.")
+    return package
+
+
+@handler(Job.Kind.FETCH_FASTQ)
+def fetch_fastq(job: Job) -> dict:
+    """Fetch file from S3, validate it, generate MD5 hash and attach to the package."""
+    filename = job.payload["filename"]
+    service = SequencingDataS3BucketService(filename=filename, user=job.owner)
+
+    try:
+        md5_hash, file_size = service.validate_uploaded_file()
+    except serializers.ValidationError:
+        # remove invalid FASTQ file from S3
+        service.remove_tmp_file()
+        raise
+
+    # search for existing FASTQ by MD5
+    seq_data: SequencingData | None = SequencingData.objects.filter(
+        hashes__algorithm__iexact="MD5",
+        hashes__value__iexact=md5_hash,
+    ).first()
+
+    if not seq_data:
+        # not found - create SequencingData and its hash
+        with transaction.atomic():
+            # make sure we only create new objects
+            # if the file is successfully persisted
+            seq_data = SequencingData.objects.create(
+                data_location="TB-Kb",  # origin of a file
+                filename=service.persisted_filename,
+                file_path=service.persisted_path,
+                file_size=file_size,
+                sequencing_platform="ILLUMINA",
+                library_preparation_strategy="WGS",
+                library_layout="PAIRED",
+            )
+            seq_data_hash = seq_data.hashes.create(
+                algorithm="MD5",
+                value=md5_hash,
+            )
+            # persist fastq file on S3
+            service.persist_file(
+                SequencingDataId=str(seq_data.id),
+                OriginalFilename=clear_s3_tag(service.filename),
+                MD5Hash=md5_hash,
+            )
+        log.info("new fastq uploaded: %s by %s", seq_data, job.owner)
+    else:
+        seq_data_hash = seq_data.hashes.get(
+            algorithm="MD5",
+            value=md5_hash,
+        )
+        if seq_data.file_size is None:
+            # if file is found but has no file size - updating
+            # TODO may be confusing for Sequencing Data with multiple hashes
+            # better to save it along with sequencing data hash
+            seq_data.file_size = file_size
+            seq_data.save()
+
+        log.info("existing fastq uploaded: %s by %s", seq_data, job.owner)
+
+    # remove temporary file from S3
+    service.remove_tmp_file()
+
+    with transaction.atomic():
+        package = lock_editable_package(job)
+
+        if PackageSequencingData.objects.filter(
+            package=package,
+            sequencing_data=seq_data,
+            sequencing_data_hash=seq_data_hash,
+        ).exists():
+            raise serializers.ValidationError(
+                "The file is already attached to the package.",
+            )
+
+        # we save original filename within fastq-package M2M
+        # in order to match it later by prefix with sample alases
+        package_fastq: PackageSequencingData = PackageSequencingData.objects.create(
+            package=package,
+            sequencing_data=seq_data,
+            sequencing_data_hash=seq_data_hash,
+            filename=filename,
+        )
+
+        package.mark_changed(cnt_sequencing_data=1)
+
+    stats = service.stats
+    log.info(
+        "fastq %s of %s: %s reads, %s bases, mean read length %.1f%s",
+        seq_data,
+        package,
+        stats.reads,
+        stats.bases,
+        stats.mean_read_length,
+        " (sampled)" if stats.sampled else "",
+    )
+    return {
+        "package_sequencing_data": package_fastq.pk,
+        "fastq_stats": {
+            "reads": stats.reads,
+            "bases": stats.bases,
+            "mean_read_length": stats.mean_read_length,
+            "sampled": stats.sampled,
+        },
+    }
+
+
+@handler(Job.Kind.MATCH)
+def match_package(job: Job) -> None:
+    """Perform package data matching."""
+    package = job.package
+
+    if package.matching_state != package.MatchingState.MATCHED:
+        # do not perform any matching at all,
+        # if there were no changes to its data since it was matched
+        MatchingService().execute(
+            dict(
+                package=package,
+                bulk=True,
+            ),
+        )
+        log.info("package match done: %s by %s", package, package.owner)
+
+
+def import_file(job: Job, service_class: Type[Service]) -> None:
+    """Import uploaded Excel file with the service."""
+    with transaction.atomic():
+        package = lock_editable_package(job)
+
+        if not job.file:
+            # let the service report the missing file
+            service_class().execute(dict(package=package), {})
+            return
+
+        with job.file.open("rb") as handle:
+            # keep original filename, it is shown on attachment
+            file = File(handle, name=job.payload["filename"])
+            service_class().execute(dict(package=package), {"file": file})
+
+
+@handler(Job.Kind.MIC_IMPORT)
+def import_mic_file(job: Job) -> None:
+    """Import Excel file with MIC tests data."""
+    import_file(job, PackageFileMICImportService)
+
+
+@handler(Job.Kind.PDS_IMPORT)
+def import_pds_file(job: Job) -> None:
+    """Import Excel file with PDS tests data."""
+    import_file(job, PackageFilePDSTImportService)
+
+
+@handler(Job.Kind.REFRESH_STATS)
+def refresh_stats(job: Job) -> dict:
+    """Recalculate stats of a batch of packages, listed in the payload."""
+    count = PackageStats.objects.filter(package__in=job.payload["package_ids"]).recalculate()
+    return {"packages": count}
+
+
+def format_errors(exc: exceptions.APIException) -> dict:
+    """Represent exception the same way API does."""
+    formatter_class = package_settings.EXCEPTION_FORMATTER_CLASS
+    return formatter_class(exc, {}, exc).run()
+
+
+def run_job(job: Job):
+    """Execute claimed job, save its outcome."""
+    log.info("job started: %s", job)
+    try:
+        job.result = HANDLERS[job.kind](job)
+        job.state = Job.State.DONE
+    except exceptions.APIException as exc:
+        job.errors = format_errors(exc)
+        job.state = Job.State.FAILED
+    except TRANSIENT_ERRORS:
+        if job.attempts < settings.JOBS_MAX_ATTEMPTS:
+            log.warning("job interrupted, queued again: %s", job, exc_info=True)
+            job.state = Job.State.QUEUED
+            # give the network or storage some time to recover
+            job.run_after = timezone.now() + timedelta(
+                seconds=settings.JOBS_RETRY_DELAY * job.attempts,
+            )
+            job.save()
+            return
+        log.exception("job crashed: %s", job)
+        job.errors = format_errors(exceptions.APIException())
+        job.state = Job.State.FAILED
+    except Exception:  # pylint: disable=broad-except
+        log.exception("job crashed: %s", job)
+        job.errors = format_errors(exceptions.APIException())
+        job.state = Job.State.FAILED
+
+    if job.file:
+        job.file.delete(save=False)
+    job.finished_at = timezone.now()
+    job.save()
+    log.info("job finished: %s", job)
+
+
+def run_pending() -> int:
+    """Execute queued jobs one by one, until the queue is empty. Return jobs count."""
+    stale_after = timedelta(seconds=settings.JOBS_STALE_AFTER)
+    max_attempts = settings.JOBS_MAX_ATTEMPTS
+
+    Job.objects.fail_exhausted(stale_after, max_attempts)
+    count = 0
+    while (job := Job.objects.claim(stale_after, max_attempts)) is not None:
+        run_job(job)
+        count += 1
+    return count
+
+
+def work(poll_interval: float):
+    """Execute jobs forever, poll the queue when it is empty."""
+    while True:
+        # worker runs for days, do not keep broken or expired connections
+        close_old_connections()
+        if not run_pending():
+            time.sleep(poll_interval)
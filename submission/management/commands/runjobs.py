@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from submission.jobs import run_pending, work
+
+
+class Command(BaseCommand):
+    """
+    Execute queued background jobs.
+
+    Any amount of workers could be started, each job is executed by exactly one of them.
+    """
+
+    def add_arguments(self, parser):
+        """Add arguments to the command."""
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Execute queued jobs and exit, instead of waiting for new ones",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help="Seconds to wait before checking an empty queue again",
+        )
+
+    def handle(self, *args, **options):  # pylint: disable=unused-argument
+        """Handle the command."""
+        if options["once"]:
+            count = run_pending()
+            self.stdout.write(f"{count} jobs executed")
+            return
+
+        work(options["poll_interval"])
@@ -0,0 +1,38 @@
+# Generated by Django 4.1.10 on 2026-10-18 11:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+import submission.models.job
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('identity', '0002_delete_profile'),
+        ('submission', '0010_alter_package_matching_state_alter_package_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('FETCH_FASTQ', 'Fetch Fastq'), ('MATCH', 'Match'), ('MIC_IMPORT', 'Mic Import'), ('PDS_IMPORT', 'Pds Import')], max_length=32)),
+                ('state', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='QUEUED', max_length=32)),
+                ('payload', models.JSONField(default=dict)),
+                ('file', models.FileField(null=True, upload_to=submission.models.job.uniq_name_job_file)),
+                ('result', models.JSONField(null=True)),
+                ('errors', models.JSONField(null=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(null=True)),
+                ('finished_at', models.DateTimeField(null=True)),
+                ('owner', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='identity.user')),
+                ('package', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='submission.package')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('state__in', ('QUEUED', 'RUNNING'))), fields=['created_at'], name='job__queued__idx'),
+        ),
+    ]
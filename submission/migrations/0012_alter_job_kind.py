@@ -0,0 +1,18 @@
+# Generated by Django 4.1.10 on 2026-10-18 12:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission', '0011_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.CharField(choices=[('FETCH_FASTQ', 'Fetch Fastq'), ('MATCH', 'Match'), ('MIC_IMPORT', 'Mic Import'), ('PDS_IMPORT', 'Pds Import'), ('REFRESH_STATS', 'Refresh Stats')], max_length=32),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.10 on 2026-10-18 13:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submission', '0013_job_run_after'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='package',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='submission.package'),
+        ),
+    ]
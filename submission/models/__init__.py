@@ -2,6 +2,7 @@ from .attachment import Attachment
 from .contributor import Contributor
 from .genotype import Genotype
 from .genotype_resistance import GenotypeResistance
+from .job import Job
 from .message import Message
 from .mic_test import MICTest
 from .package import Package
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from typing import Optional
+from uuid import uuid4
+
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from identity.models import User
+from .package import Package
+
+
+def uniq_name_job_file(instance, filename):  # pylint: disable=unused-argument
+    """Generate unique job input file name, preserving file extension."""
+    ext = filename.split(".", 1)[-1]
+    return f"jobs/{uuid4().hex}.{ext}"
+
+
+class JobQuerySet(models.QuerySet):
+    """Custom queryset class for Job model."""
+
+    def claim(self, stale_after: timedelta, max_attempts: int) -> Optional["Job"]:
+        """
+        Take the oldest queued job and mark it as running.
+
+        Rows, locked by other workers, are skipped, so any amount of workers
+        could poll the same table without waiting for each other.
+        Jobs, which are running for too long (the worker died), are taken again,
+        until attempts are exhausted.
+        Jobs, queued again after a transient error, wait until their retry time comes.
+        """
+        with transaction.atomic():
+            job = (
+                self.select_for_update(skip_locked=True)
+                .filter(
+                    Q(state=Job.State.QUEUED, run_after__lte=timezone.now())
+                    | Q(
+                        state=Job.State.RUNNING,
+                        started_at__lt=timezone.now() - stale_after,
+                        attempts__lt=max_attempts,
+                    ),
+                )
+                .order_by("created_at", "pk")
+                .first()
+            )
+            if job is None:
+                return None
+            self.filter(pk=job.pk).update(
+                state=Job.State.RUNNING,
+                started_at=timezone.now(),
+                attempts=F("attempts") + 1,
+            )
+        job.refresh_from_db()
+        return job
+
+    def fail_exhausted(self, stale_after: timedelta, max_attempts: int) -> int:
+        """Give up on jobs, that were dropped by workers too many times."""
+        return self.filter(
+            state=Job.State.RUNNING,
+            started_at__lt=timezone.now() - stale_after,
+            attempts__gte=max_attempts,
+        ).update(
+            state=Job.State.FAILED,
+            finished_at=timezone.now(),
+            errors={
+                "type": "server_error",
+                "errors": [
+                    {"code": "error", "detail": "The job was interrupted.", "attr": None},
+                ],
+            },
+        )
+
+
+class Job(models.Model):
+    """
+    Long running package operation, executed by background worker.
+
+    Jobs are queued by API endpoints and picked up by `runjobs` management command.
+    """
+
+    objects: JobQuerySet = JobQuerySet.as_manager()
+
+    class Meta:
+        """Job model options."""
+
+        indexes = [
+            # for workers to find next job fast
+            models.Index(
+                fields=["created_at"],
+                name="job__queued__idx",
+                condition=Q(state__in=("QUEUED", "RUNNING")),
+            ),
+        ]
+
+    class Kind(models.TextChoices):
+        """What the job does."""
+
+        FETCH_FASTQ = "FETCH_FASTQ"
+        MATCH = "MATCH"
+        MIC_IMPORT = "MIC_IMPORT"
+        PDS_IMPORT = "PDS_IMPORT"
+        REFRESH_STATS = "REFRESH_STATS"
+
+    class State(models.TextChoices):
+        """Job execution state."""
+
+        QUEUED = "QUEUED"
+        RUNNING = "RUNNING"
+        DONE = "DONE"
+        FAILED = "FAILED"
+
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    state = models.CharField(max_length=32, choices=State.choices, default=State.QUEUED)
+
+    package = models.ForeignKey(Package, models.CASCADE, null=True, related_name="jobs")
+    """Package the job works on, none for jobs over several packages of the owner."""
+    owner = models.ForeignKey(User, models.SET_NULL, null=True, related_name="jobs")
+
+    payload = models.JSONField(default=dict)
+    """Job arguments."""
+    file = models.FileField(upload_to=uniq_name_job_file, null=True)
+    """Uploaded file to process, removed once the job is finished."""
+
+    result = models.JSONField(null=True)
+    """Job outcome, specific to job kind."""
+    errors = models.JSONField(null=True)
+    """Validation errors, in the same format API returns them."""
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    """Job is not taken before that time, used to back off retries."""
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    def __str__(self):
+        """Represent job instance."""
+        return f"<Job #{self.pk} {self.kind} {self.state}>"
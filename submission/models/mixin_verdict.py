@@ -1,8 +1,68 @@
 import enum
 
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple, Type
+
 from django.db import models
 
 
+class VerdictBuffer:
+    """
+    Verdict accumulation context.
+
+    While active, VerdictMixin.add_verdict doesn't save records,
+    verdicts are collected in memory and written with one bulk_update per model
+    on flush() and on context exit.
+
+    Same database record could be fetched several times during the run,
+    all such instances share the verdict list of the first buffered one,
+    so no verdict is lost on flush.
+    """
+
+    BATCH_SIZE = 2_000
+
+    _active: ContextVar[Optional["VerdictBuffer"]] = ContextVar(
+        "verdict_buffer",
+        default=None,
+    )
+
+    def __init__(self):
+        """Create empty buffer."""
+        self.records: Dict[Tuple[Type["VerdictMixin"], int], "VerdictMixin"] = {}
+        self._token = None
+
+    @classmethod
+    def active(cls) -> Optional["VerdictBuffer"]:
+        """Return currently active buffer, if any."""
+        return cls._active.get()
+
+    def __enter__(self):
+        """Activate the buffer."""
+        self._token = self._active.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Deactivate the buffer, flush verdicts unless an exception occurred."""
+        self._active.reset(self._token)
+        if exc_type is None:
+            self.flush()
+
+    def add(self, record: "VerdictMixin", verdict: dict):
+        """Append verdict to the record, postponing the save."""
+        buffered = self.records.setdefault((type(record), record.pk), record)
+        buffered.verdicts.append(verdict)
+        record.verdicts = buffered.verdicts
+
+    def flush(self):
+        """Save all buffered verdicts, one query batch per model."""
+        by_model = {}
+        for (model, _), record in self.records.items():
+            by_model.setdefault(model, []).append(record)
+        for model, records in by_model.items():
+            model.objects.bulk_update(records, ["verdicts"], batch_size=self.BATCH_SIZE)
+        self.records = {}
+
+
 class VerdictMixin(models.Model):
     """Mixin class for django model, that adds validation messages storage capabilities."""
 
@@ -25,7 +85,13 @@ class VerdictMixin(models.Model):
         Add verdict to a model record.
 
         This verdict could be used later to see, what's wrong with this particular record.
+        Inside VerdictBuffer context the record is saved on buffer flush.
         """
         self.verdicts: list
-        self.verdicts.append({"verdict": verdict, "level": level.value})
+        verdict = {"verdict": verdict, "level": level.value}
+        buffer = VerdictBuffer.active()
+        if buffer is not None:
+            buffer.add(self, verdict)
+            return
+        self.verdicts.append(verdict)
         self.save()
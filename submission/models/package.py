@@ -106,18 +106,23 @@ class Package(models.Model):
     sequencing_datas: Any  # RelatedManager[SequencingData]
     # one to one PackageStats
     stats: Any  # RelatedManager[PackageStats]
+    jobs: Any  # RelatedManager[Job]
 
-    def mark_changed(self):
+    def mark_changed(self, **stats_deltas: int):
         """
         Mark package as changed, if it was matched before.
 
         Also, if the package is being rejected when it is changed,
         it goes back to draft.
         Every time package is marked as changed,
-        package stats are recalculated.
+        package stats are recalculated, or just shifted by given deltas,
+        when the change is known to affect only those counters.
         """
         log.debug("updating package stats")
-        self.stats.update()
+        if stats_deltas:
+            self.stats.increment(**stats_deltas)
+        else:
+            self.stats.update()
         log.debug("package stats updated")
 
         if self.matching_state == self.MatchingState.MATCHED:
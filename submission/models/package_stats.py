@@ -1,10 +1,70 @@
+from django.contrib.postgres.aggregates import JSONBAgg
 from django.db import models as m
-from django.db.models import OuterRef, Exists
+from django.db.models import Count, F, Func, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 
 from genphen.models import Drug
+from .message import Message
 from .mic_test import MICTest
 from .package import Package
+from .package_sequencingdata import PackageSequencingData
 from .pds_test import PDSTest
+from .sample import Sample
+from .sample_alias import SampleAlias
+
+
+def _per_package(queryset: m.QuerySet, aggregate, default):
+    """Subquery of a single aggregate over package rows of the queryset."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(package=OuterRef("package"))
+            .order_by()
+            .values("package")
+            .annotate(value=aggregate)
+            .values("value"),
+        ),
+        default,
+    )
+
+
+class PackageStatsQuerySet(m.QuerySet):
+    """Package stats custom queryset."""
+
+    def recalculate(self) -> int:
+        """Recalculate stats of all the packages in the queryset, with a single UPDATE."""
+        no_drugs = Value([], output_field=m.JSONField())
+        return self.update(
+            cnt_mic_tests=_per_package(MICTest.objects, Count("*"), 0),
+            cnt_pds_tests=_per_package(PDSTest.objects, Count("*"), 0),
+            cnt_messages=_per_package(Message.objects, Count("*"), 0),
+            cnt_sample_aliases=_per_package(SampleAlias.objects, Count("*"), 0),
+            cnt_samples_created=_per_package(Sample.objects, Count("*"), 0),
+            cnt_samples_matched=_per_package(
+                SampleAlias.objects.filter(sample__isnull=False),
+                Count("*"),
+                0,
+            ),
+            cnt_sequencing_data=_per_package(PackageSequencingData.objects, Count("*"), 0),
+            cnt_pds_drug_concentration=_per_package(
+                PDSTest.objects,
+                Count(Func(F("drug"), F("concentration"), function="ROW"), distinct=True),
+                0,
+            ),
+            list_mic_drugs=_per_package(
+                MICTest.objects,
+                JSONBAgg("drug", distinct=True, ordering="drug"),
+                no_drugs,
+            ),
+            list_pds_drugs=_per_package(
+                PDSTest.objects,
+                JSONBAgg("drug", distinct=True, ordering="drug"),
+                no_drugs,
+            ),
+        )
+
+    def increment(self, **deltas: int) -> int:
+        """Shift counters of the packages in place, for changes not affecting the rest."""
+        return self.update(**{name: F(name) + delta for name, delta in deltas.items()})
 
 
 # pylint: disable=too-many-instance-attributes
@@ -15,7 +75,7 @@ class PackageStats(m.Model):
     Stats are updated every time package is changed.
     """
 
-    objects: m.Manager
+    objects = PackageStatsQuerySet.as_manager()
 
     package: Package = m.OneToOneField("Package", m.CASCADE, related_name="stats")
 
@@ -79,46 +139,11 @@ class PackageStats(m.Model):
     list_pds_drug_codes.fget.short_description = "PDS drugs list"
 
     def update(self):
-        """Update package stats."""
-        # pylint: disable=no-member
-        package: Package = self.package
-
-        self.cnt_mic_tests = package.mic_tests.count()
-        self.cnt_pds_tests = package.pds_tests.count()
-        self.cnt_messages = package.messages.count()
-        self.cnt_sample_aliases = package.sample_aliases.count()
-        self.cnt_samples_created = package.samples.count()
-        self.cnt_samples_matched = package.sample_aliases.filter(
-            sample__isnull=False,
-        ).count()
-        self.cnt_sequencing_data = package.assoc_sequencing_datas.count()
-        self.cnt_pds_drug_concentration = (
-            package.pds_tests.values(
-                "drug",
-                "concentration",
-            )
-            .distinct()
-            .count()
-        )
-
-        self.list_mic_drugs = list(
-            Drug.objects.filter(
-                Exists(
-                    MICTest.objects.filter(
-                        package=package,
-                        drug=OuterRef("drug_id"),
-                    ),
-                ),
-            ).values_list("drug_id", flat=True),
-        )
-        self.list_pds_drugs = list(
-            Drug.objects.filter(
-                Exists(
-                    PDSTest.objects.filter(
-                        package=package,
-                        drug=OuterRef("drug_id"),
-                    ),
-                ),
-            ).values_list("drug_id", flat=True),
-        )
-        self.save()
+        """Recalculate package stats."""
+        PackageStats.objects.filter(pk=self.pk).recalculate()
+        self.refresh_from_db()
+
+    def increment(self, **deltas: int):
+        """Shift package stats counters, like `cnt_messages=1`, without full recalculation."""
+        PackageStats.objects.filter(pk=self.pk).increment(**deltas)
+        self.refresh_from_db(fields=list(deltas))
@@ -0,0 +1,54 @@
+from typing import Optional
+
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from submission.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Background job serializer."""
+
+    url = serializers.SerializerMethodField()
+    location = serializers.SerializerMethodField()
+
+    class Meta:
+        """Meta class."""
+
+        model = Job
+        fields = (
+            "pk",
+            "url",
+            "kind",
+            "state",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "errors",
+            "location",
+        )
+        read_only_fields = fields
+
+    def get_url(self, job: Job) -> str:
+        """Job resource URL, to poll for its state."""
+        return reverse(
+            "submission:job-detail",
+            (job.package_id, job.pk),
+            request=self.context.get("request"),
+        )
+
+    def get_location(self, job: Job) -> Optional[str]:
+        """URL of the resource, affected by finished job."""
+        if job.state != Job.State.DONE:
+            return None
+        if job.kind == Job.Kind.FETCH_FASTQ:
+            return reverse(
+                "submission:packagesequencingdata-detail",
+                (job.package_id, job.result["package_sequencing_data"]),
+                request=self.context.get("request"),
+            )
+        return reverse(
+            "submission:package-detail",
+            (job.package_id,),
+            request=self.context.get("request"),
+        )
@@ -0,0 +1,371 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import F, OuterRef, Q, Subquery
+from django.db.models.functions import Upper
+
+from biosql.models import Taxon
+from submission.models import (
+    MICTest,
+    Package,
+    PackageSequencingData,
+    PDSTest,
+    Sample,
+    SampleAlias,
+    SequencingData,
+)
+from submission.models.mixin_verdict import VerdictMixin
+
+SampleRef = int
+"""Existing sample primary key, or negative index of a sample to be created."""
+
+
+# pylint: disable=too-many-instance-attributes
+class BulkMatcher:
+    """
+    Set-based implementation of the MatchingService matching stages.
+
+    Every candidate the per-alias path would look up with a separate query
+    (NCBI/SRA aliases, FASTQ library names, earlier user aliases)
+    is fetched up front with a single query per source.
+    The stages are then replayed in memory in the same order as the per-alias path,
+    so the outcome is identical, and the results are written back
+    with bulk updates and one UPDATE per test table.
+    """
+
+    BATCH_SIZE = 2_000
+
+    def __init__(self, service):
+        """Prepare matcher for a package, already locked and reset by the service."""
+        self.service = service
+        self.package: Package = service.cleaned_data["package"]
+
+        self.aliases: List[SampleAlias] = list(
+            self.package.sample_aliases.annotate(
+                name_upper=Upper("name"),
+                prefix_upper=Upper("fastq_prefix"),
+            ).order_by("pk"),
+        )
+        self.fastqs: List[PackageSequencingData] = list(
+            self.package.assoc_sequencing_datas.annotate(
+                filename_upper=Upper("filename"),
+                seqdata_sample_id=F("sequencing_data__sample"),
+                seqdata_location=F("sequencing_data__data_location"),
+            ).order_by("pk"),
+        )
+
+        # current sample of every package sequencing data, changes during prefix stages
+        self.seqdata_samples: Dict[int, Optional[SampleRef]] = {
+            fastq.sequencing_data_id: fastq.seqdata_sample_id for fastq in self.fastqs
+        }
+        self.changed_seqdatas = set()
+
+        # fastqs indexed by every "{prefix}_" their uppercased filename starts with
+        self.fastqs_by_prefix = defaultdict(list)
+        delimiter = service.SAMPLE_PREFIX_DELIMITER
+        for fastq in self.fastqs:
+            filename: str = fastq.filename_upper
+            pos = filename.find(delimiter)
+            while pos != -1:
+                self.fastqs_by_prefix[filename[:pos]].append(fastq)
+                pos = filename.find(delimiter, pos + 1)
+
+        self.new_samples: List[Sample] = []
+        self.associated: List[SampleAlias] = []
+
+        self.candidates = self.fetch_candidates()
+        self.local_candidates = defaultdict(lambda: defaultdict(dict))
+        for alias in self.aliases:
+            if alias.sample_id is not None:
+                self.offer_local_candidate(alias)
+
+    def names_subquery(self):
+        """Uppercased names of all package aliases, to narrow down candidate queries."""
+        return self.package.sample_aliases.annotate(
+            name_upper=Upper("name"),
+        ).values("name_upper")
+
+    def latest_by_name(self, queryset, name_field: str, date_field: str):
+        """Map uppercased name to (date, sample) of the latest record with such name."""
+        rows = (
+            queryset.annotate(key=Upper(name_field))
+            .filter(key__in=self.names_subquery(), sample__isnull=False)
+            .order_by("key", f"-{date_field}")
+            .distinct("key")
+            .values_list("key", date_field, "sample_id")
+        )
+        return {key: (date, sample_id) for key, date, sample_id in rows}
+
+    def fetch_candidates(self) -> Dict[str, Dict[str, Tuple]]:
+        """Fetch latest matching sample for every alias name, per candidate source."""
+        other_aliases = SampleAlias.objects.exclude(package=self.package)
+        return {
+            "biosample": self.latest_by_name(
+                other_aliases.filter(origin="BioSample"),
+                "name",
+                "created_at",
+            ),
+            "srs": self.latest_by_name(
+                other_aliases.filter(origin="SRS"),
+                "name",
+                "created_at",
+            ),
+            "ncbi": self.latest_by_name(
+                other_aliases.filter(
+                    Q(package__origin__iexact="NCBI") | Q(package__origin__iexact="SRA"),
+                ),
+                "name",
+                "created_at",
+            ),
+            "libname": self.latest_by_name(
+                SequencingData.objects.all(),
+                "library_name",
+                "created_at",
+            ),
+            "user": self.latest_by_name(
+                other_aliases.filter(
+                    package__owner=self.package.owner,
+                    package__state=Package.State.ACCEPTED,
+                ),
+                "name",
+                "created_at",
+            ),
+        }
+
+    def local_sources(self, alias: SampleAlias):
+        """Candidate sources, that an alias of the matched package itself belongs to."""
+        sources = []
+        if alias.origin == "BioSample":
+            sources.append("biosample")
+        if alias.origin == "SRS":
+            sources.append("srs")
+        if self.package.origin.upper() in ("NCBI", "SRA"):
+            sources.append("ncbi")
+        return sources
+
+    def offer_local_candidate(self, alias: SampleAlias):
+        """
+        Register package own alias as a candidate for later lookups.
+
+        The per-alias path queries the database after every association,
+        so aliases matched earlier within the same run are visible to later ones.
+        """
+        for source in self.local_sources(alias):
+            self.local_candidates[source][alias.name_upper][alias.pk] = (
+                alias.created_at,
+                alias.sample_id,
+            )
+
+    def lookup(self, source: str, name_upper: str) -> Optional[SampleRef]:
+        """Return sample of the latest candidate with such name, if any."""
+        found = [
+            *self.local_candidates[source][name_upper].values(),
+            *filter(None, [self.candidates[source].get(name_upper)]),
+        ]
+        if not found:
+            return None
+        return max(found, key=lambda candidate: candidate[0])[1]
+
+    @staticmethod
+    def add_verdict(obj: VerdictMixin, verdict: str, level: VerdictMixin.VerdictLevel):
+        """Add verdict to a record in memory, records are saved in bulk later."""
+        obj.verdicts.append({"verdict": verdict, "level": level.value})
+
+    def match(self):
+        """Replay all matching stages in memory, then save the results."""
+        name_sources = (
+            ("ncbi", SampleAlias.MatchSource.NCBI),
+            ("libname", SampleAlias.MatchSource.FASTQ_EXISTING),
+            ("user", SampleAlias.MatchSource.USER_ALIAS),
+        )
+
+        # Step 0: match aliases by name with specific pattern
+        self.match_by_origin_pattern()
+
+        # Step 1: try to match all aliases by their name
+        for alias in self.unmatched():
+            for source, match_source in name_sources:
+                sample = self.lookup(source, alias.name_upper)
+                if sample is not None:
+                    self.associate(sample, alias, match_source)
+                    break
+
+        # Step 2: match by fastq prefix, then by sample id for those without prefix
+        for alias in self.unmatched(with_prefix=True):
+            self.match_by_prefix(alias, alias.prefix_upper)
+        for alias in self.unmatched(with_prefix=False):
+            self.match_by_prefix(alias, alias.name_upper)
+
+        # Step 3: mark all that left unmatched
+        for alias in self.unmatched():
+            alias.match_source = SampleAlias.MatchSource.NO_MATCH
+
+        # mark all unused fastq files
+        for fastq in self.fastqs:
+            if not fastq.verdicts:
+                self.add_verdict(
+                    fastq,
+                    "was not used in matching",
+                    fastq.VerdictLevel.WARNING,
+                )
+
+        self.save()
+
+    def match_by_origin_pattern(self):
+        """Match aliases, named as NCBI/SRA or FASTQ library ids, to the samples they refer to."""
+        patterns = (
+            (self.service.BIOSAMPLE_ORIGIN_PATTERN, "biosample"),
+            (self.service.SRS_ORIGIN_PATTERN, "srs"),
+            (self.service.LIBRARY_NAME_PATTERN, "libname"),
+        )
+        for alias in self.aliases:
+            for pattern, source in patterns:
+                if pattern.match(alias.name):
+                    sample = self.lookup(source, alias.name_upper)
+                    if sample is None:
+                        self.add_verdict(
+                            alias,
+                            "Detected NCBI ID is not yet available, re-match later",
+                            alias.VerdictLevel.ERROR,
+                        )
+                        alias.match_source = SampleAlias.MatchSource.NO_MATCH
+                    else:
+                        self.associate(sample, alias, SampleAlias.MatchSource.NCBI)
+                    break
+
+    def unmatched(self, with_prefix: bool = None) -> List[SampleAlias]:
+        """Snapshot aliases, not matched so far, optionally filtered by prefix presence."""
+        return [
+            alias
+            for alias in self.aliases
+            if alias.match_source is None
+            and (with_prefix is None or (alias.fastq_prefix is not None) is with_prefix)
+        ]
+
+    def match_by_prefix(self, alias: SampleAlias, prefix: str):
+        """Same as MatchingService.match_alias_by_prefix_or_sample_id, in memory."""
+        group: List[PackageSequencingData] = self.fastqs_by_prefix.get(prefix, [])
+
+        if not group:
+            self.add_verdict(
+                alias,
+                "No FASTQ files with such prefix provided",
+                alias.VerdictLevel.WARNING,
+            )
+            return
+
+        fastq_count = len(group)
+        if fastq_count not in (2, 4, 6):
+            verdict = f"Wrong FASTQ files count for a prefix: {fastq_count}"
+            self.add_verdict(alias, verdict, alias.VerdictLevel.ERROR)
+            for fastq in group:
+                self.add_verdict(fastq, verdict, fastq.VerdictLevel.ERROR)
+            return
+
+        group_samples = [self.seqdata_samples[fastq.sequencing_data_id] for fastq in group]
+        if len(set(group_samples) - {None}) > 1:
+            self.add_verdict(
+                alias,
+                "Some of FASTQ files with such prefix point to different samples",
+                alias.VerdictLevel.ERROR,
+            )
+            for fastq in group:
+                self.add_verdict(
+                    fastq,
+                    "Some of files with same prefix point to different samples",
+                    fastq.VerdictLevel.ERROR,
+                )
+            alias.match_source = alias.MatchSource.NO_MATCH
+            return
+
+        fastq_with_sample = next(
+            (fastq for fastq, sample in zip(group, group_samples) if sample is not None),
+            None,
+        )
+        if fastq_with_sample:
+            sample = self.seqdata_samples[fastq_with_sample.sequencing_data_id]
+            if fastq_with_sample.seqdata_location == SequencingData.DataLocation.NCBI:
+                match_source = SampleAlias.MatchSource.NCBI_FASTQ
+            else:
+                match_source = SampleAlias.MatchSource.FASTQ_UPLOADED
+        else:
+            sample = self.new_sample(alias)
+            match_source = SampleAlias.MatchSource.FASTQ_UPLOADED_NEW_SAMPLE
+
+        for fastq in group:
+            if self.seqdata_samples[fastq.sequencing_data_id] is None:
+                self.seqdata_samples[fastq.sequencing_data_id] = sample
+                self.changed_seqdatas.add(fastq.sequencing_data_id)
+
+        for fastq in group:
+            self.add_verdict(fastq, "was used in matching", fastq.VerdictLevel.INFO)
+
+        self.associate(sample, alias, match_source)
+
+    def new_sample(self, alias: SampleAlias) -> SampleRef:
+        """Plan a new sample creation from alias data, return its temporary reference."""
+        self.new_samples.append(
+            Sample(
+                country_id=alias.country_id,
+                sampling_date=alias.sampling_date,
+                package=self.package,
+            ),
+        )
+        return -len(self.new_samples)
+
+    def associate(
+        self,
+        sample: SampleRef,
+        alias: SampleAlias,
+        match_source: SampleAlias.MatchSource,
+    ):
+        """Associate alias with the sample, its tests are updated when saving."""
+        alias.sample_id = sample
+        alias.match_source = match_source
+        self.associated.append(alias)
+        self.offer_local_candidate(alias)
+
+    def save(self):
+        """Write matching results into the database."""
+        if self.new_samples:
+            taxon = Taxon.objects.first()  # TODO what to put here?
+            for sample in self.new_samples:
+                sample.ncbi_taxon = taxon
+            Sample.objects.bulk_create(self.new_samples, batch_size=self.BATCH_SIZE)
+
+        def resolve(sample: Optional[SampleRef]) -> Optional[int]:
+            if sample is not None and sample < 0:
+                return self.new_samples[-sample - 1].pk
+            return sample
+
+        SequencingData.objects.bulk_update(
+            [
+                SequencingData(pk=pk, sample_id=resolve(self.seqdata_samples[pk]))
+                for pk in self.changed_seqdatas
+            ],
+            ["sample"],
+            batch_size=self.BATCH_SIZE,
+        )
+
+        for alias in self.aliases:
+            alias.sample_id = resolve(alias.sample_id)
+        SampleAlias.objects.bulk_update(
+            self.aliases,
+            ["sample", "match_source", "verdicts"],
+            batch_size=self.BATCH_SIZE,
+        )
+        PackageSequencingData.objects.bulk_update(
+            self.fastqs,
+            ["verdicts"],
+            batch_size=self.BATCH_SIZE,
+        )
+
+        # propagate alias sample to all alias-related mic/pds tests
+        alias_sample = SampleAlias.objects.filter(pk=OuterRef("sample_alias")).values(
+            "sample",
+        )[:1]
+        associated_pks = [alias.pk for alias in self.associated]
+        for model in (MICTest, PDSTest):
+            model.objects.filter(sample_alias__in=associated_pks).update(
+                sample=Subquery(alias_sample),
+            )
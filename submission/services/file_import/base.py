@@ -1,16 +1,18 @@
 import re
 import tempfile
+import zipfile
 from abc import ABCMeta, abstractmethod
 from io import BytesIO
 from pathlib import Path
-from typing import Type, Iterable, Optional
-from datetime import date
+from typing import Any, Callable, Dict, Type, Iterable, Iterator, List, Optional
+from datetime import date, datetime
 from dateutil import parser
 from pydantic import BaseModel
 
 from psycopg2.extras import DateRange
 import openpyxl
 import openpyxl.drawing.image
+from openpyxl.utils.exceptions import InvalidFileException
 import pandas as pd
 from django import forms
 from django.contrib.staticfiles import finders
@@ -29,6 +31,7 @@ from genphen.models import (
 
 from submission.models import Package, SampleAlias
 from submission.services import Service
+from tbkb.db import copy_insert, copy_update
 
 
 class BaseRow(BaseModel):
@@ -56,6 +59,9 @@ class PackageFileImportService(Service, metaclass=ABCMeta):
     MODEL_CLASS: Type[Model]
     """MICTest/PDSTest"""
 
+    ROW_CLASS: Type[BaseRow]
+    """MICRow/PDSTRow"""
+
     SHEET_NAME: str = None
 
 
@@ -114,6 +120,8 @@ class PackageFileImportService(Service, metaclass=ABCMeta):
                 self._countries[country.country_official_name.upper()] = country
 
         self.test_columns = {}
+        self._dataframe: Optional[pd.DataFrame] = None
+        self._rows: Optional[List[BaseRow]] = None
 
 
     def get_sampling_date(self, val: str) -> Optional[DateRange]:
@@ -166,13 +174,46 @@ class PackageFileImportService(Service, metaclass=ABCMeta):
         return None
 
     def get_dataframe(self, file: File) -> pd.DataFrame:
-        """Parse file into valid dataframe."""
-        return pd.read_excel(
-            file,
-            sheet_name=self.SHEET_NAME,
-            dtype="string",
-            mangle_dupe_cols=True,
-        ).fillna("")
+        """
+        Parse file into valid dataframe.
+
+        The sheet is parsed once per service run, and cached for the import stage.
+        """
+        if self._dataframe is None:
+            self._dataframe = read_sheet(file, self.SHEET_NAME)
+        return self._dataframe
+
+    def iter_rows(self, dataframe: pd.DataFrame) -> Iterator[BaseRow]:
+        """
+        Yield parsed dataframe rows.
+
+        Cell values are parsed column by column first,
+        and only then assembled into row structures.
+        """
+        named = self.parse_named_columns(dataframe)
+        tests = self.parse_test_columns(dataframe)
+        metadata = {
+            colname: list(dataframe[colname])
+            for colname in dataframe.columns
+            if colname not in self.named_columns and colname not in tests
+        }
+
+        for idx in range(dataframe.shape[0]):
+            yield self.ROW_CLASS(
+                **{data_col: values[idx] for data_col, values in named.items()},
+                tests=[values[idx] for values in tests.values() if values[idx]],
+                metadata={colname: values[idx] for colname, values in metadata.items()},
+            )
+
+    def get_rows(self, dataframe: pd.DataFrame) -> List[BaseRow]:
+        """
+        Return parsed dataframe rows.
+
+        Rows are parsed once at validation stage, and reused for the import.
+        """
+        if self._rows is None:
+            self._rows = list(self.iter_rows(dataframe))
+        return self._rows
 
     def validate_dataframe(self, dataframe: pd.DataFrame):
         """
@@ -212,14 +253,19 @@ class PackageFileImportService(Service, metaclass=ABCMeta):
                     f"{mandatory_col}: Empty values in mandatory column.",
                 )
 
-        for fc_col in self.FORCE_CASE_COLUMNS:
-            # UPPERCASE column values to detect case sensitive duplicates
-            dataframe[fc_col] = dataframe[fc_col].str.upper()
+        # UPPERCASE column values to detect case sensitive duplicates,
+        # the dataframe itself is kept intact for the import stage
+        uppercased = dataframe.assign(
+            **{
+                fc_col: dataframe[fc_col].str.upper()
+                for fc_col in self.FORCE_CASE_COLUMNS
+            },
+        )
 
         unique_col: Iterable
         for unique_col in self.UNIQUE_COLUMNS:
             if len(unique_col)==len(list(set(unique_col) & set(dataframe.columns))):
-                group = dataframe.groupby(unique_col).size().reset_index(name="_freq_")
+                group = uppercased.groupby(unique_col).size().reset_index(name="_freq_")
                 freq_gt_1 = group["_freq_"] > 1
                 all_non_empty = group[unique_col].apply(all, axis=1)
                 dupes = group[freq_gt_1 & all_non_empty]
@@ -228,33 +274,66 @@ class PackageFileImportService(Service, metaclass=ABCMeta):
                         f"{unique_col}: Duplicated values in unique column(s).",
                     )
 
-    def parse_row_named_columns(self, row):
-        """Parse row common attributes for MIC and PDST"""
+    @staticmethod
+    def parse_column(
+        dataframe: pd.DataFrame,
+        colname: str,
+        parse_func: Callable[[str], Any],
+        error_message: str = "{colname}: Wrong value at {sample_id}: {value}.",
+    ) -> list:
+        """
+        Parse dataframe column with parse_func, return list of parsed values.
+
+        Every distinct value is parsed only once,
+        as countries, dates, mediums, ranges etc. are mostly repeated across rows.
+        Error message is formatted with colname, sample_id, value and exc
+        of the first row, that failed to parse.
+        """
+        column = dataframe[colname]
+        parsed = {}
+        for val in column.unique():
+            try:
+                parsed[val] = parse_func(val)
+            except Exception as exc:
+                sample_id = dataframe["Sample Id"][column == val].iloc[0]
+                raise ValidationError(
+                    error_message.format(
+                        colname=colname,
+                        sample_id=sample_id,
+                        value=val,
+                        exc=exc,
+                    ),
+                ) from exc
+        return [parsed[val] for val in column]
+
+    def parse_named_columns(self, dataframe: pd.DataFrame) -> Dict[str, list]:
+        """Parse columns, common for MIC and PDST, into row attribute values."""
         data = {
-            "sample_id": row["Sample Id"],
-            "medium": row["DST Method"],
-            "fastq_prefix":
-              row["FASTQ prefix"].strip().rstrip("_") if row.get("FASTQ prefix")
-               else None,
-            "tests": [],
-            "metadata" : {},
+            "sample_id": list(dataframe["Sample Id"]),
+            "medium": list(dataframe["DST Method"]),
+            "fastq_prefix": [
+                val.strip().rstrip("_") or None if val else None
+                for val in dataframe.get("FASTQ prefix", [None] * dataframe.shape[0])
+            ],
         }
 
         for row_col, (data_col, parse_func) in self.named_columns.items():
-            if row_col in row:
-                if parse_func:
-                    if isinstance(parse_func, str):
-                        parse_func = getattr(self, parse_func)
-                    try:
-                        data[data_col] = parse_func(data.get(data_col, row[row_col]))
-                    except Exception as exc:
-                        raise ValidationError(
-                            f"{row_col}: Wrong value at {row['Sample Id']}: {row[row_col]}.",
-                        ) from exc
-                else:
-                    data[data_col] = data.get(data_col, row[row_col]) or None
+            if row_col not in dataframe.columns:
+                continue
+            if parse_func:
+                if isinstance(parse_func, str):
+                    parse_func = getattr(self, parse_func)
+                data[data_col] = self.parse_column(dataframe, row_col, parse_func)
+            else:
+                data[data_col] = [
+                    val or None for val in data.get(data_col, dataframe[row_col])
+                ]
         return data
 
+    @abstractmethod
+    def parse_test_columns(self, dataframe: pd.DataFrame) -> Dict[str, list]:
+        """Parse test columns, return every row test (or None, if no test) per column."""
+
     @abstractmethod
     def import_dataframe(self, dataframe: pd.DataFrame):
         """Perform actual data import."""
@@ -271,9 +350,14 @@ class PackageFileImportService(Service, metaclass=ABCMeta):
     def process(self):
         """Import data into a corresponding model table in a single transaction."""
         package = self.cleaned_data["package"]
-        self.cleaned_data["package"] = Package.objects.select_for_update(
-            nowait=True,
-        ).get(pk=package.pk)
+        self.cleaned_data["package"] = (
+            Package.objects.editable()
+            .select_for_update(nowait=True)
+            .filter(pk=package.pk)
+            .first()
+        )
+        if self.cleaned_data["package"] is None:
+            raise serializers.ValidationError("The package cannot be edited.")
 
         dataframe = self.get_dataframe(self.cleaned_data["file"])
         self.import_dataframe(dataframe)
@@ -288,24 +372,14 @@ class PackageFileImportService(Service, metaclass=ABCMeta):
         aliases_to_create,
         tests,
     ):
-        """Import all the created models into database."""
+        """Import all the created models into database with COPY FROM STDIN."""
         try:
-            SampleAlias.objects.bulk_update(
-                aliases_to_update,
-                aliases_fields_to_update,
-                batch_size=5_000,
-            )
-            SampleAlias.objects.bulk_create(
-                aliases_to_create,
-                batch_size=5_000,
-            )
+            copy_update(SampleAlias, aliases_to_update, aliases_fields_to_update)
+            copy_insert(SampleAlias, aliases_to_create)
         except IntegrityError as exc:
             raise detect_error(exc)  # pylint: disable=raise-missing-from
 
-        self.MODEL_CLASS.objects.bulk_create(
-            tests,
-            batch_size=5_000,
-        )
+        copy_insert(self.MODEL_CLASS, tests)
 
     @staticmethod
     def watermark_excel_file(file: File) -> File:
@@ -331,6 +405,78 @@ class PackageFileImportService(Service, metaclass=ABCMeta):
                 return File(BytesIO(file_handler.read()), file.name)
 
 
+def _cell_to_str(value) -> str:
+    """Represent a worksheet cell value as a string, the same way pandas does."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return str(pd.Timestamp(value))
+    return str(value)
+
+
+def read_sheet(file: File, sheet_name: str) -> pd.DataFrame:
+    """
+    Read Excel worksheet into a dataframe of strings.
+
+    Workbook is opened in read-only mode and its cells are streamed row by row,
+    so the workbook model is never built in memory, only the resulting dataframe is.
+    First row is a header, kept as written, duplicated column names are mangled
+    like "X", "X.1", fully empty rows are skipped, empty cells become empty strings.
+    """
+    file.seek(0)
+    try:
+        workbook = openpyxl.load_workbook(
+            file,
+            read_only=True,
+            data_only=True,
+        )
+    except (zipfile.BadZipFile, InvalidFileException, KeyError) as exc:
+        raise ValueError("Excel file format cannot be determined") from exc
+
+    try:
+        try:
+            worksheet = workbook[sheet_name]
+        except KeyError as exc:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found") from exc
+
+        rows = worksheet.iter_rows(values_only=True)
+        header = [_cell_to_str(value) for value in next(rows, ())]
+        records = []
+        for row in rows:
+            record = [_cell_to_str(value) for value in row]
+            while record and not record[-1]:
+                record.pop()
+            if record:
+                records.append(record)
+    finally:
+        workbook.close()
+
+    while header and not header[-1]:
+        header.pop()
+    width = max([len(header), *map(len, records)])
+
+    columns = []
+    seen = {}
+    for idx in range(width):
+        name = (header[idx:idx + 1] or [""])[0] or f"Unnamed: {idx}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+
+    return pd.DataFrame(
+        [record + [""] * (width - len(record)) for record in records],
+        columns=columns,
+        dtype=object,
+    )
+
+
 def detect_error(exc):
     """Detect specific validation error from general database error."""
     match = re.search(
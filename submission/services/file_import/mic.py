@@ -1,4 +1,4 @@
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 import pandas as pd
 from django.core.exceptions import ValidationError
 from psycopg2.extras import NumericRange, DateRange
@@ -51,6 +51,7 @@ class PackageFileMICImportService(PackageFileImportService):
     """Import MIC data from Excel file (xls/xlsx) into specified package."""
 
     MODEL_CLASS = MICTest
+    ROW_CLASS = MICRow
     SHEET_NAME = "MIC"
 
     def __init__(self, *args, **kwargs):
@@ -72,30 +73,28 @@ class PackageFileMICImportService(PackageFileImportService):
                     f"{colname}: Unknown drug code. Please check the column header values."
                 )
 
-    def parse_row(self, row: pd.Series) -> MICRow:
-        """Parse raw dataframe row to a valid structure."""
-        data = self.parse_row_named_columns(row)
-
-        for colname, val in row.items():
+    def parse_test_columns(self, dataframe: pd.DataFrame) -> Dict[str, list]:
+        """Parse MIC ranges of every drug column, each distinct value is parsed once."""
+        tests = {}
+        for colname in dataframe.columns:
             if colname in self.named_columns:
                 continue
 
             # we already assured columns in .locate_columns
             drug = self._drugs[colname.upper()]
 
-            try:
-                mic_range = parse_numeric_range(val)
-            except Exception as exc:
-                raise ValidationError(
-                    f"{colname}: Wrong range at {data['sample_id']}: {exc}.",
-                ) from exc
-
-            if mic_range is None:
-                # don't add tests without range
-                continue
-
-            data["tests"].append((drug, mic_range))
-        return MICRow(**data)
+            ranges = self.parse_column(
+                dataframe,
+                colname,
+                parse_numeric_range,
+                "{colname}: Wrong range at {sample_id}: {exc}.",
+            )
+            # don't add tests without range
+            tests[colname] = [
+                (drug, mic_range) if mic_range is not None else None
+                for mic_range in ranges
+            ]
+        return tests
 
     def validate_dataframe(self, dataframe: pd.DataFrame):
         """Validate dataframe."""
@@ -105,12 +104,7 @@ class PackageFileMICImportService(PackageFileImportService):
         self.locate_columns(dataframe)
 
         # asserting data
-        empty = True
-        for _, row in dataframe.iterrows():
-            data = self.parse_row(row)
-            if data.tests:
-                empty = False
-        if empty:
+        if not any(row.tests for row in self.get_rows(dataframe)):
             raise ValidationError("No data found.")
 
     def import_dataframe(self, dataframe: pd.DataFrame):
@@ -126,8 +120,8 @@ class PackageFileMICImportService(PackageFileImportService):
 
         # 1 iteration - create non-existing samples,
         # update fastq prefix for existing
-        for _, raw in dataframe.iterrows():
-            row = self.parse_row(raw)
+        row: MICRow
+        for row in self.get_rows(dataframe):
 
             # update or create alias
             if row.sample_id in existing_aliases:
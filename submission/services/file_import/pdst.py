@@ -104,8 +104,12 @@ class PackageFilePDSTImportService(PackageFileImportService):
     """
 
     MODEL_CLASS = PDSTest
+    ROW_CLASS = PDSTRow
     SHEET_NAME = "PDST"
 
+    TEST_RESULTS = tuple(PDSTest.TestResult.values)
+    NO_TEST_RESULTS = ("NA", "N/A", r"N\A", "NONE", "NO", "")
+
 
     COLNAME_REGEX = re.compile(
         r"^([\w\-\/]+)\s*?(?:\(\s*?(?:(\d+(?:[.,]\d+)?)(?:\s*mg/L)?|CC)\s*?\))?$",
@@ -170,46 +174,28 @@ class PackageFilePDSTImportService(PackageFileImportService):
             return None
         return self._assessment_methods[val.strip().upper()]
 
-    def get_test_result(self, val: str) -> Optional[str]:
-        """Parse value as a test result."""
-        result = val.strip().upper()
-
-        if result in ("NA", "N/A", r"N\A", "NONE", "NO", ""):
-            return None
-
-        if result not in tuple("SRI"):
-            raise ValueError("Unknown test result.")
-
-        return result
-
-    def parse_row(self, row: pd.Series) -> PDSTRow:
-        """Parse raw dataframe row to a valid structure."""
-        data = self.parse_row_named_columns(row)
-
-        for colname, val in row.items():
-            if colname in self.named_columns:
-                continue
+    def parse_test_columns(self, dataframe: pd.DataFrame) -> Dict[str, list]:
+        """
+        Parse test results (S/R/I) of every test column at once.
 
-            if colname not in self.test_columns:
-                # add to metadata if it's not a tests column
-                data["metadata"][colname] = val
-                continue
+        Test-less results (NA, None, empty etc.) give no test.
+        """
+        allowed = {*self.TEST_RESULTS, *self.NO_TEST_RESULTS}
+        tests = {}
+        for colname, (drug, concentration) in self.test_columns.items():
+            results = dataframe[colname].str.strip().str.upper()
 
-            try:
-                result = self.get_test_result(val)
-            except Exception as exc:
+            wrong = ~results.map(allowed.__contains__)
+            if wrong.any():
                 raise ValidationError(
-                    f"{colname}: Wrong test result at {row['Sample Id']}.",
-                ) from exc
-
-            if not result:
-                # do not add tests without result
-                continue
-
-            drug, concentration = self.test_columns[colname]
-            data["tests"].append((drug, concentration, result))
+                    f"{colname}: Wrong test result at {dataframe['Sample Id'][wrong].iloc[0]}.",
+                )
 
-        return PDSTRow(**data)
+            tests[colname] = [
+                (drug, concentration, result) if result in self.TEST_RESULTS else None
+                for result in results
+            ]
+        return tests
 
     def validate_dataframe(self, dataframe: pd.DataFrame):
         """Validate dataframe."""
@@ -217,12 +203,7 @@ class PackageFilePDSTImportService(PackageFileImportService):
 
         self.locate_test_columns(dataframe)
 
-        empty = True
-        for _, row in dataframe.iterrows():
-            row = self.parse_row(row)
-            if row.tests:
-                empty = False
-        if empty:
+        if not any(row.tests for row in self.get_rows(dataframe)):
             raise ValidationError("No data found.")
 
     def import_dataframe(self, dataframe: pd.DataFrame):
@@ -235,8 +216,8 @@ class PackageFilePDSTImportService(PackageFileImportService):
         aliases_to_update = []
         tests = []
 
-        for _, raw in dataframe.iterrows():
-            row: PDSTRow = self.parse_row(raw)
+        row: PDSTRow
+        for row in self.get_rows(dataframe):
             if row.sample_id in existing_aliases:
                 # alias already exist, update
                 alias: SampleAlias = existing_aliases[row.sample_id]
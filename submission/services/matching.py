@@ -2,6 +2,7 @@ import re
 
 from contextlib import contextmanager
 
+from django import forms
 from django.db import DatabaseError
 from django.db.models import Count, Q
 from rest_framework.exceptions import PermissionDenied, ValidationError
@@ -15,7 +16,9 @@ from submission.models import (
     Sample,
     SequencingData,
 )
+from submission.models.mixin_verdict import VerdictBuffer
 from . import Service
+from .bulk_matching import BulkMatcher
 
 
 class MatchingService(Service):
@@ -26,6 +29,9 @@ class MatchingService(Service):
     package = f.ModelField(Package, required=True)
     """Package in a DRAFT|REJECTED state."""
 
+    bulk = forms.BooleanField(required=False)
+    """Use set-based matching, with same outcome, but much fewer queries on big packages."""
+
     BIOSAMPLE_ORIGIN_PATTERN = re.compile(r"^SAM(N|EA)\d+$", re.IGNORECASE)
     SRS_ORIGIN_PATTERN = re.compile(r"^[ES]RS\d+$", re.IGNORECASE)
     LIBRARY_NAME_PATTERN = re.compile(r"^[SED]RR\d+$", re.IGNORECASE)
@@ -106,53 +112,61 @@ class MatchingService(Service):
         # remove previous run results
         self.reset_match_state(package)
 
-        # Step 0: match aliases by name with specific pattern
-        alias: SampleAlias
-        for alias in package.sample_aliases.all():
-            self.match_alias_by_pattern(alias)
-
-        # Step 1: try to match all aliases by their name
-        alias: SampleAlias
-        for alias in package.sample_aliases.filter(match_source__isnull=True):
-            self.match_alias_by_name(alias)
-
-        # Step 2: for those, who hasn't matched and have fastq prefix,
-        # try to match by prefix
-        unmatched_with_prefix = package.sample_aliases.filter(
-            fastq_prefix__isnull=False,
-            match_source__isnull=True,
-        )
-        alias: SampleAlias
-        for alias in unmatched_with_prefix:
-            self.match_alias_by_prefix_or_sample_id(alias)
-
-        # Step 2a: for those who have not yet matched
-        # use the sample id as fastq prefix
+        if self.cleaned_data.get("bulk"):
+            BulkMatcher(self).match()
+            return
 
-        unmatched_no_prefix = package.sample_aliases.filter(
-            fastq_prefix__isnull=True,
-            match_source__isnull=True,
-        )
+        # collect verdicts in memory, and write them in bulk at the end
+        with VerdictBuffer() as verdict_buffer:
+            # Step 0: match aliases by name with specific pattern
+            alias: SampleAlias
+            for alias in package.sample_aliases.all():
+                self.match_alias_by_pattern(alias)
+
+            # Step 1: try to match all aliases by their name
+            alias: SampleAlias
+            for alias in package.sample_aliases.filter(match_source__isnull=True):
+                self.match_alias_by_name(alias)
+
+            # Step 2: for those, who hasn't matched and have fastq prefix,
+            # try to match by prefix
+            unmatched_with_prefix = package.sample_aliases.filter(
+                fastq_prefix__isnull=False,
+                match_source__isnull=True,
+            )
+            alias: SampleAlias
+            for alias in unmatched_with_prefix:
+                self.match_alias_by_prefix_or_sample_id(alias)
 
-        alias: SampleAlias
-        for alias in unmatched_no_prefix:
-            self.match_alias_by_prefix_or_sample_id(alias, prefix="name")
+            # Step 2a: for those who have not yet matched
+            # use the sample id as fastq prefix
 
+            unmatched_no_prefix = package.sample_aliases.filter(
+                fastq_prefix__isnull=True,
+                match_source__isnull=True,
+            )
 
-        # Step 3: mark all that left unmatched
-        package.sample_aliases.filter(match_source__isnull=True).update(
-            match_source=SampleAlias.MatchSource.NO_MATCH,
-        )
+            alias: SampleAlias
+            for alias in unmatched_no_prefix:
+                self.match_alias_by_prefix_or_sample_id(alias, prefix="name")
 
-        # mark all unused fastq files
-        package_fastq: PackageSequencingData
-        for package_fastq in package.assoc_sequencing_datas.filter(verdicts=[]):
-            # TODO find more convenient way to separate used/not used fastqs
-            package_fastq.add_verdict(
-                "was not used in matching",
-                package_fastq.VerdictLevel.WARNING,
+            # Step 3: mark all that left unmatched
+            package.sample_aliases.filter(match_source__isnull=True).update(
+                match_source=SampleAlias.MatchSource.NO_MATCH,
             )
 
+            # verdicts given so far must be visible to the database query below
+            verdict_buffer.flush()
+
+            # mark all unused fastq files
+            package_fastq: PackageSequencingData
+            for package_fastq in package.assoc_sequencing_datas.filter(verdicts=[]):
+                # TODO find more convenient way to separate used/not used fastqs
+                package_fastq.add_verdict(
+                    "was not used in matching",
+                    package_fastq.VerdictLevel.WARNING,
+                )
+
     def match_alias_by_prefix_or_sample_id(self, alias: SampleAlias, prefix="fastq_prefix"):
         """
         Handle sample alias that have fastq prefix.
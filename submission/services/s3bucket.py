@@ -1,13 +1,11 @@
 import gzip
 import hashlib
 import logging
-import os
-import tempfile
 import uuid
-from typing import Tuple
+import zlib
+from typing import BinaryIO, Optional, Tuple
 
 import boto3
-from Bio.SeqIO.QualityIO import FastqGeneralIterator
 from botocore.config import Config
 from django.conf import settings
 from rest_framework import serializers
@@ -15,19 +13,25 @@ from rest_framework.exceptions import NotFound
 
 from identity.models import User
 from submission.exceptions import Conflict
+from submission.util.fastq import FastqStats, FastqValidator
 from submission.util.storage import FastqTMPStorage, FastqPermanentStorage
+from submission.util.stream import HashingReader, RangedReader
 
 log = logging.getLogger(__name__)
 
 
+# pylint: disable=too-many-instance-attributes
 class SequencingDataS3BucketService:
     """Service for handling sequencing data files on S3."""
 
+    CHUNK_SIZE = 1024 * 512
+
     def __init__(self, filename: str, user: User):
         """Serve single file."""
         self.filename = filename
         self.user = user
         self._persisted_filename = None
+        self.stats: Optional[FastqStats] = None
         self.bucket_name = settings.AWS_SEQUENCING_DATA_BUCKET_NAME
         self.client = boto3.client("s3", config=Config(signature_version="s3v4"))
         self.tmp_storage = FastqTMPStorage(
@@ -79,48 +83,72 @@ class SequencingDataS3BucketService:
             ),
         )
 
+    def fetch_range(self, start: int, end: int) -> bytes:
+        """Download bytes range of the temporary file, both ends inclusive."""
+        response = self.client.get_object(
+            Bucket=self.tmp_storage.bucket_name,  # pylint: disable=no-member
+            Key=self.tmp_path,
+            Range=f"bytes={start}-{end}",
+        )
+        return response["Body"].read()
+
+    def open_tmp_file(self) -> BinaryIO:
+        """
+        Open uploaded temporary file for reading.
+
+        Files bigger than a single chunk are downloaded by byte ranges in parallel,
+        so the download is bound by bandwidth, not by single connection throughput.
+        """
+        chunk_size = settings.FASTQ_DOWNLOAD_CHUNK_SIZE
+        concurrency = settings.FASTQ_DOWNLOAD_CONCURRENCY
+        if concurrency > 1:
+            size = self.client.head_object(
+                Bucket=self.tmp_storage.bucket_name,  # pylint: disable=no-member
+                Key=self.tmp_path,
+            )["ContentLength"]
+            if size > chunk_size:
+                return RangedReader(self.fetch_range, size, chunk_size, concurrency)
+        return self.tmp_storage.open(self.tmp_filename)
+
     def validate_uploaded_file(self) -> Tuple[str, int]:
-        """Validate uploaded file, return MD5 hash of the contents of the file."""
+        """
+        Validate uploaded file, return MD5 hash and size of the file.
+
+        Reads count and bases of the file are left in .stats.
+        """
         if not self.tmp_storage.exists(self.tmp_filename):
             raise NotFound("file is not found on S3.")
 
         # pylint: disable=unexpected-keyword-arg
         md5_hash = hashlib.md5(usedforsecurity=False) # nosemgrep: bandit.B303-1
 
-        # download the file, calculate MD5 in parallel
-        with (
-            self.tmp_storage.open(self.tmp_filename) as cloud_file,
-            tempfile.NamedTemporaryFile(mode="wb", delete=False) as t_file,
-        ):
-            while chunk := cloud_file.read(1024 * 512):
-                t_file.write(chunk)
-                # calculate MD5 on GZIPPED file
-                md5_hash.update(chunk)
-
-            md5_hex_digest = md5_hash.hexdigest()
-            local_tmp_file_path = t_file.name
-
-        # verifying file structure
-        sequences = 0
-        file_size = os.path.getsize(local_tmp_file_path)
-        file = gzip.open(local_tmp_file_path, mode="rt", encoding="utf-8")
-
-        try:
-            for _ in FastqGeneralIterator(file):
-                sequences += 1
-
-            if not sequences:
-                raise ValueError("no sequences found in the FASTQ file")
-
-        except Exception as exc:
-            raise serializers.ValidationError({"uploaded_file": str(exc)}) from exc
-
-        finally:
-            # close and remove temporary file
-            file.close()
-            os.remove(local_tmp_file_path)
-
-        return md5_hex_digest, file_size
+        # single pass over the S3 stream:
+        # MD5 is calculated on GZIPPED bytes, while they're being decompressed
+        # and verified, so no local copy of the file is ever made
+        validator = FastqValidator(settings.FASTQ_VALIDATION_MODE)
+        with self.open_tmp_file() as cloud_file:
+            source = HashingReader(cloud_file, md5_hash)
+            try:
+                with gzip.GzipFile(fileobj=source, mode="rb") as file:
+                    while data := file.read(self.CHUNK_SIZE):
+                        validator.feed(data)
+                self.stats = validator.close()
+
+            # only the file contents are reported as invalid,
+            # S3 and network errors are left to fail the job, which is retried then
+            except (
+                gzip.BadGzipFile,
+                EOFError,
+                zlib.error,
+                ValueError,
+            ) as exc:
+                raise serializers.ValidationError({"uploaded_file": str(exc)}) from exc
+
+            # make sure every byte is hashed, even if decompressor stopped early
+            while source.read(self.CHUNK_SIZE):
+                pass
+
+        return md5_hash.hexdigest(), source.size
 
     def persist_file(self, **tags):
         """
@@ -3,7 +3,7 @@ import logging
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from submission.models import Message
+from submission.models import Message, PackageStats
 
 log = logging.getLogger(__name__)
 
@@ -16,7 +16,7 @@ def update_package_stats_on_new_message(
     if kwargs["created"]:
         # only on creation time
         message: Message = kwargs["instance"]
-        message.package.stats.update()
+        PackageStats.objects.filter(package=message.package_id).increment(cnt_messages=1)
 
 
 @receiver(post_save, sender=Message)
@@ -2,12 +2,18 @@ from django.dispatch import receiver
 from django_fsm.signals import post_transition
 
 from identity.models import User
-from submission.models import Package
+from overview.models import SampleDrugResult
+from submission.jobs import enqueue
+from submission.models import Job, Package
 
 
 @receiver([post_transition], sender=Package)
 def unstage_accepted_package_data(sender, **kwargs):  # pylint: disable=unused-argument
-    """Mark accepted package MIC/PDS tests, that have matched with sample, as production ready."""
+    """
+    Mark accepted package MIC/PDS tests, that have matched with sample, as production ready.
+
+    Drug results of the samples, touched by the package, are recalculated right away.
+    """
     target: Package.State = kwargs["target"]
     if target != Package.State.ACCEPTED:
         return
@@ -16,6 +22,15 @@ def unstage_accepted_package_data(sender, **kwargs):  # pylint: disable=unused-a
     package.mic_tests.filter(sample__isnull=False).update(staging=False)
     package.pds_tests.filter(sample__isnull=False).update(staging=False)
 
+    # package aliases could change sample country as well
+    SampleDrugResult.objects.rebuild(
+        sample_ids=package.sample_aliases.filter(sample__isnull=False)
+        .values_list("sample_id", flat=True)
+        .union(
+            package.pds_tests.filter(sample__isnull=False).values_list("sample_id", flat=True),
+        ),
+    )
+
 
 @receiver([post_transition], sender=Package)
 def mark_other_user_packages_as_changed(
@@ -27,6 +42,8 @@ def mark_other_user_packages_as_changed(
     This needed in order to preserve data integrity.
     Accepted package can contain data,
     that could be used to match data in other user packages.
+    States are switched with set-based updates, and package stats
+    are recalculated for all of them by a single background job.
     """
     target: Package.State = kwargs["target"]
     if target != Package.State.ACCEPTED:
@@ -35,6 +52,16 @@ def mark_other_user_packages_as_changed(
     package: Package = kwargs["instance"]
     user: User = package.owner
 
-    editable_package: Package
-    for editable_package in user.packages.editable():
-        editable_package.mark_changed()
+    package_ids = list(user.packages.editable().values_list("pk", flat=True))
+    if not package_ids:
+        return
+
+    packages = Package.objects.filter(pk__in=package_ids)
+    packages.filter(matching_state=Package.MatchingState.MATCHED).update(
+        matching_state=Package.MatchingState.CHANGED,
+    )
+    # same as Package.mark_changed(), bypassing transitions on purpose
+    packages.filter(state=Package.State.REJECTED).update(state=Package.State.DRAFT)
+
+    # the job is about other packages, it is not listed in accepted package jobs
+    enqueue(Job.Kind.REFRESH_STATS, None, user, package_ids=package_ids)
@@ -1,7 +1,14 @@
+import logging
 import uuid
+from hashlib import md5
 
+from django.utils import timezone
 from rest_framework.reverse import reverse
 
+from submission.models import Job
+from submission.services.s3bucket import SequencingDataS3BucketService
+from submission.util.stream import RangedReader
+
 VALID_FILE_NAME = "valid.fastq.gz"
 INVALID_FILE = "invalid.fastq.gz"
 
@@ -12,12 +19,16 @@ def test_validate_uploaded_file(
     alice,
     shared_datadir,
     mocker,
-):  # pylint: disable=too-many-arguments
+    run_jobs,
+    util,
+    caplog,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
     """
     S3 uploaded file fetched from TMP and validated successfully.
 
     SequencingData object created respectively.
     File moved to FINAL location.
+    Reads stats are logged and kept in the job result.
     """
     endpoint = reverse(
         "v1:submission:packagesequencingdata-fetch",
@@ -27,11 +38,11 @@ def test_validate_uploaded_file(
 
     # in order to not actually move the file inside S3
     persist_mock = mocker.patch(
-        "submission.views.sequencing_data.SequencingDataS3BucketService.persist_file",
+        "submission.services.s3bucket.SequencingDataS3BucketService.persist_file",
     )
     # to not actually remove tmp file from S3
     mocker.patch(
-        "submission.views.sequencing_data.SequencingDataS3BucketService.remove_tmp_file",
+        "submission.services.s3bucket.SequencingDataS3BucketService.remove_tmp_file",
     )
     mocker.patch(
         "submission.services.s3bucket.FastqTMPStorage.exists",
@@ -39,14 +50,21 @@ def test_validate_uploaded_file(
     )
 
     with open(shared_datadir / VALID_FILE_NAME, "rb") as body:
+        content = body.read()
         mocker.patch(
             "submission.util.storage.FastqStorage.open",
-            mocker.mock_open(read_data=body.read()),
+            mocker.mock_open(read_data=content),
         )
         uuid_name = uuid.uuid4()
         mocker.patch("submission.services.s3bucket.uuid.uuid4", return_value=uuid_name)
 
         response = client_of(alice).post(endpoint, {"filename": filename})
+        # nothing is done within the request
+        assert response.status_code == 202
+        assert not package_of(alice).sequencing_datas.exists()
+
+        with caplog.at_level(logging.INFO, logger="submission.jobs"):
+            assert run_jobs() == 1
 
     obj = package_of(alice).sequencing_datas.first()
     full_filename = f"{uuid_name.hex}.{filename.split('.', 1)[1]}"
@@ -54,11 +72,28 @@ def test_validate_uploaded_file(
     assert obj.file_path == f"persistent/{full_filename}"
     assert obj.data_location == "TB-Kb"
     assert obj.hashes.count() == 1
+    assert obj.hashes.get().value == md5(content, usedforsecurity=False).hexdigest()
+    assert obj.file_size == len(content)
 
     persist_mock.assert_called_once()
 
-    # redirect to newly created SequencingData object
-    assert response.status_code == 302
+    assert Job.objects.get().result["fastq_stats"] == {
+        "reads": 4,
+        "bases": 1003,
+        "mean_read_length": 250.75,
+        "sampled": False,
+    }
+    assert "4 reads, 1003 bases, mean read length 250.8" in caplog.text
+
+    # finished job refers to newly created SequencingData object
+    job = client_of(alice).get(response.headers["location"]).json()
+    assert job["state"] == "DONE"
+    assert job["location"] == util.abs_uri(
+        reverse(
+            "v1:submission:packagesequencingdata-detail",
+            (package_of(alice).pk, package_of(alice).assoc_sequencing_datas.get().pk),
+        ),
+    )
 
 
 def test_failed_validate_uploaded_file(
@@ -67,7 +102,8 @@ def test_failed_validate_uploaded_file(
     alice,
     shared_datadir,
     mocker,
-):  # pylint: disable=too-many-arguments
+    run_jobs,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
     """S3 file does not pass validation, and deleted from TMP."""
     endpoint = reverse(
         "v1:submission:packagesequencingdata-fetch",
@@ -80,7 +116,7 @@ def test_failed_validate_uploaded_file(
         return_value=True,
     )
     remove_tmp_mock = mocker.patch(
-        "submission.views.sequencing_data.SequencingDataS3BucketService.remove_tmp_file",
+        "submission.services.s3bucket.SequencingDataS3BucketService.remove_tmp_file",
     )
 
     with open(shared_datadir / INVALID_FILE, "rb") as body:
@@ -90,10 +126,14 @@ def test_failed_validate_uploaded_file(
         )
 
         response = client_of(alice).post(endpoint, {"filename": filename})
+        assert response.status_code == 202
+        run_jobs()
 
     remove_tmp_mock.assert_called_once()
-    assert response.status_code == 400
-    assert response.json() == {
+    job = client_of(alice).get(response.headers["location"]).json()
+    assert job["state"] == "FAILED"
+    assert job["location"] is None
+    assert job["errors"] == {
         "errors": [
             {
                 "attr": "uploadedFile",
@@ -104,3 +144,131 @@ def test_failed_validate_uploaded_file(
         ],
         "type": "validation_error",
     }
+
+
+def test_validate_uploaded_file_by_ranges(
+    alice,
+    shared_datadir,
+    mocker,
+    settings,
+    s3_stub,
+):  # pylint: disable=too-many-arguments
+    """Big file is downloaded by ranges in parallel, hash and size are the same."""
+    settings.AWS_SEQUENCING_DATA_BUCKET_NAME = "sequencing-data"
+    settings.FASTQ_DOWNLOAD_CHUNK_SIZE = 64
+    settings.FASTQ_DOWNLOAD_CONCURRENCY = 4
+
+    with open(shared_datadir / VALID_FILE_NAME, "rb") as body:
+        content = body.read()
+
+    mocker.patch(
+        "submission.services.s3bucket.FastqTMPStorage.exists",
+        return_value=True,
+    )
+    s3_stub.add_response("head_object", {"ContentLength": len(content)})
+    mocker.patch(
+        "submission.services.s3bucket.SequencingDataS3BucketService.fetch_range",
+        side_effect=lambda start, end: content[start : end + 1],
+    )
+
+    service = SequencingDataS3BucketService("anything.fastq.gz", alice)
+    assert service.validate_uploaded_file() == (
+        md5(content, usedforsecurity=False).hexdigest(),
+        len(content),
+    )
+
+
+def test_interrupted_download_keeps_uploaded_file(
+    package_of,
+    client_of,
+    alice,
+    shared_datadir,
+    mocker,
+    settings,
+    run_jobs,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Connection lost in the middle of the download doesn't remove the file, the job is retried."""
+    settings.FASTQ_DOWNLOAD_CHUNK_SIZE = 64
+    settings.FASTQ_DOWNLOAD_CONCURRENCY = 4
+    settings.JOBS_MAX_ATTEMPTS = 2
+    endpoint = reverse(
+        "v1:submission:packagesequencingdata-fetch",
+        (package_of(alice).pk,),
+    )
+
+    with open(shared_datadir / VALID_FILE_NAME, "rb") as body:
+        content = body.read()
+
+    def fetch_range(start, end):
+        """Lose connection after the first ranges."""
+        if start >= 128:
+            raise ConnectionResetError("connection reset by peer")
+        return content[start : end + 1]
+
+    mocker.patch(
+        "submission.services.s3bucket.FastqTMPStorage.exists",
+        return_value=True,
+    )
+    mocker.patch(
+        "submission.services.s3bucket.SequencingDataS3BucketService.open_tmp_file",
+        lambda service: RangedReader(fetch_range, len(content), 64, 4),
+    )
+    remove_tmp_mock = mocker.patch(
+        "submission.services.s3bucket.SequencingDataS3BucketService.remove_tmp_file",
+    )
+
+    response = client_of(alice).post(endpoint, {"filename": "anything.fastq.gz"})
+    assert response.status_code == 202
+    # queued again after the first failure, but not taken right away
+    assert run_jobs() == 1
+    job = Job.objects.get()
+    assert job.state == Job.State.QUEUED
+    assert job.run_after > timezone.now()
+    assert run_jobs() == 0
+
+    # retry time has come, taken again, then given up
+    Job.objects.update(run_after=timezone.now())
+    assert run_jobs() == 1
+
+    remove_tmp_mock.assert_not_called()
+    job = client_of(alice).get(response.headers["location"]).json()
+    assert job["state"] == "FAILED"
+    assert job["errors"]["type"] == "server_error"
+
+
+def test_package_submitted_before_fetch(
+    package_of,
+    client_of,
+    alice,
+    shared_datadir,
+    mocker,
+    run_jobs,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """File is not attached, if the package was submitted while the job was queued."""
+    package = package_of(alice)
+    mocker.patch("submission.services.s3bucket.SequencingDataS3BucketService.persist_file")
+    mocker.patch("submission.services.s3bucket.SequencingDataS3BucketService.remove_tmp_file")
+    mocker.patch(
+        "submission.services.s3bucket.FastqTMPStorage.exists",
+        return_value=True,
+    )
+
+    with open(shared_datadir / VALID_FILE_NAME, "rb") as body:
+        mocker.patch(
+            "submission.util.storage.FastqStorage.open",
+            mocker.mock_open(read_data=body.read()),
+        )
+        response = client_of(alice).post(
+            reverse("v1:submission:packagesequencingdata-fetch", (package.pk,)),
+            {"filename": "anything.fastq.gz"},
+        )
+        assert response.status_code == 202
+
+        package.state = package.State.PENDING
+        package.save()
+        assert run_jobs() == 1
+
+    assert not package.sequencing_datas.exists()
+    job = client_of(alice).get(response.headers["location"]).json()
+    assert job["state"] == "FAILED"
+    assert job["errors"]["errors"][0]["detail"] == "The package cannot be edited."
@@ -9,9 +9,10 @@ def test_successful_upload_redirects_back(
     alice,
     shared_datadir,
     util,
+    run_jobs,
     drugs,
     countries,
-):  # pylint: disable=unused-argument,too-many-arguments
+):  # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
     """Successful upload redirects back to endpoint."""
     endpoint = reverse("v1:submission:mictest-list", (package_of(alice).pk,))
     with open(shared_datadir / MIC_VALID, "rb") as file:
@@ -22,8 +23,13 @@ def test_successful_upload_redirects_back(
             },
             follow=False,
         )
-    assert response.status_code == 302, response.json()
-    assert response.headers["location"] == util.abs_uri(
+    assert response.status_code == 202, response.json()
+    assert response.json()["state"] == "QUEUED"
+    assert run_jobs() == 1
+
+    job = client_of(alice).get(response.headers["location"]).json()
+    assert job["state"] == "DONE", job["errors"]
+    assert job["location"] == util.abs_uri(
         reverse(
             "v1:submission:package-detail",
             (package_of(alice).pk,),
@@ -1,5 +1,8 @@
 from rest_framework.reverse import reverse
 
+from submission.jobs import enqueue
+from submission.models import Job
+
 
 def test_package_list_endpoint_200_response(package_of, alice, client_of, util):
     """Package list endpoint returns list of package data."""
@@ -103,14 +106,15 @@ def test_package_detail_endpoint_200_response(package_of, alice, client_of, util
     }
 
 
-def test_package_match_endpoint_302_response(
+def test_package_match_endpoint_202_response(
     package_of,
     alice,
     client_of,
     new_alias_of,
     util,
-):
-    """Successful package match response redirects to package details endpoint."""
+    run_jobs,
+):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    """Package match is queued, finished job refers to package details endpoint."""
     package = package_of(alice)
     new_alias_of(package, "A1")  # to make package non-empty
 
@@ -118,8 +122,19 @@ def test_package_match_endpoint_302_response(
         reverse("v1:submission:package-match", (package.pk,)),
         follow=False,
     )
-    assert response.status_code == 302
-    assert response.headers["location"] == util.abs_uri(
+    assert response.status_code == 202
+    # repeated request doesn't queue the same work twice
+    assert client_of(alice).post(
+        reverse("v1:submission:package-match", (package.pk,)),
+    ).json()["pk"] == response.json()["pk"]
+
+    assert run_jobs() == 1
+    package.refresh_from_db()
+    assert package.matching_state == package.MatchingState.MATCHED
+
+    job = client_of(alice).get(response.headers["location"]).json()
+    assert job["state"] == "DONE"
+    assert job["location"] == util.abs_uri(
         reverse("v1:submission:package-detail", (package.pk,)),
     )
 
@@ -147,6 +162,20 @@ def test_package_submit_endpoint_302_response(
     )
 
 
+def test_package_submit_with_unfinished_jobs(package_of, client_of, alice):
+    """Package can't be submitted, until its queued jobs are done."""
+    package = package_of(alice)
+    package.matching_state = package.MatchingState.MATCHED
+    package.save()
+    enqueue(Job.Kind.PDS_IMPORT, package, alice, filename="pdst.xlsx")
+
+    response = client_of(alice).post(reverse("v1:submission:package-submit", (package.pk,)))
+
+    assert response.status_code == 400
+    package.refresh_from_db()
+    assert package.state == package.State.DRAFT
+
+
 def test_package_create_endpoint(client_of, alice, util):
     """Create a package."""
     response = client_of(alice).post(
@@ -19,11 +19,12 @@ def test_upload_valid(
     shared_datadir,
     filename,
     util,
+    run_jobs,
     drugs,
     growth_mediums,
     countries,
     assessment_methods,
-):  # pylint: disable=unused-argument,too-many-arguments
+):  # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
     """Successful upload redirects back to endpoint."""
     endpoint = reverse("v1:submission:pdstest-list", (package_of(alice).pk,))
 
@@ -36,8 +37,13 @@ def test_upload_valid(
             follow=False,
         )
 
-    assert response.status_code == 302, response.json()
-    assert response.headers["location"] == util.abs_uri(
+    assert response.status_code == 202, response.json()
+    assert response.json()["state"] == "QUEUED"
+    assert run_jobs() == 1
+
+    job = client_of(alice).get(response.headers["location"]).json()
+    assert job["state"] == "DONE", job["errors"]
+    assert job["location"] == util.abs_uri(
         reverse(
             "v1:submission:package-detail",
             (package_of(alice).pk,),
@@ -60,7 +66,18 @@ def test_pdstest_clear_endpoint_302_response(package_of, client_of, alice, util)
     "filename",
     (FILE_VALID, FILE_VALID_2),
 )
-def test_clear_pds_data(package_of, client_of, alice, shared_datadir, filename):
+def test_clear_pds_data(
+    package_of,
+    client_of,
+    alice,
+    shared_datadir,
+    filename,
+    run_jobs,
+    drugs,
+    growth_mediums,
+    countries,
+    assessment_methods,
+):  # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
     """PDS tests are cleared along with attachments and aliases."""
     clear_endpoint = reverse("v1:submission:pdstest-clear", (package_of(alice).pk,))
     list_endpoint = reverse("v1:submission:pdstest-list", (package_of(alice).pk,))
@@ -72,6 +89,8 @@ def test_clear_pds_data(package_of, client_of, alice, shared_datadir, filename):
                 "file": file,
             },
         )
+    run_jobs()
+    assert package_of(alice).pds_tests.exists()
 
     # clear uploaded data
     client_of(alice).post(clear_endpoint, follow=False)
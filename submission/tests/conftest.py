@@ -2,10 +2,12 @@ from hashlib import md5
 from uuid import uuid4
 
 import pytest
+from django.core.files.storage import Storage
 from psycopg2.extras import DateRange
 
 from genphen.models import Country
 from identity.models import User
+from submission.jobs import run_pending
 from submission.models import (
     Package,
     Sample,
@@ -116,3 +118,17 @@ def package_of(
         return _package_of.data[user.pk]
 
     return _package_of
+
+
+@pytest.fixture
+def run_jobs(db, mocker, settings, tmp_path):  # pylint: disable=invalid-name,unused-argument
+    """Execute queued background jobs, as runjobs worker does."""
+    # uploaded files are passed to jobs through the storage, it must really keep them
+    settings.MEDIA_ROOT = str(tmp_path)
+    mocker.patch("django.core.files.storage.FileSystemStorage.save", Storage.save)
+
+    def _run_jobs() -> int:
+        """Workload function."""
+        return run_pending()
+
+    return _run_jobs
@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from submission.models import Message, PackageStats
+
+
+def test_stats_recalculated_in_single_query(
+    alice_package,
+    drugs,
+    countries,
+    new_fastq_of,
+    django_assert_num_queries,
+):
+    """Package stats are recalculated with one UPDATE, and read back."""
+    # pylint: disable=unused-argument
+    package = alice_package.package
+    alice_package.new_sample("FRA", 2020)
+    alice_package.new_alias("A1", alice_package.sample)
+    alice_package.new_alias("A2")
+    alice_package.new_pds_test("R", 0.5, drug=drugs[1])
+    alice_package.new_pds_test("S", 1.0, drug=drugs[1])
+    alice_package.new_pds_test("S", 1.0, drug=drugs[1])
+    alice_package.new_pds_test("R", drug=drugs[0])
+    alice_package.new_mic_test(drug=drugs[3])
+    new_fastq_of(package, "file.fastq.gz")
+    Message.objects.create(sender=package.owner, package=package, content="hi")
+
+    stats = package.stats
+    with django_assert_num_queries(2):
+        stats.update()
+
+    assert (
+        stats.cnt_mic_tests,
+        stats.cnt_pds_tests,
+        stats.cnt_pds_drug_concentration,
+        stats.cnt_messages,
+        stats.cnt_sample_aliases,
+        stats.cnt_samples_created,
+        stats.cnt_samples_matched,
+        stats.cnt_sequencing_data,
+    ) == (1, 4, 3, 1, 2, 1, 1, 1)
+    assert stats.list_pds_drugs == sorted([drugs[0].pk, drugs[1].pk])
+    assert stats.list_mic_drugs == [drugs[3].pk]
+
+    # other packages are left alone
+    assert not PackageStats.objects.exclude(pk=stats.pk).filter(cnt_pds_tests__gt=0).exists()
+
+
+def test_new_message_increments_counter(alice_package):
+    """New chat message shifts the counter in place, instead of recalculating stats."""
+    package = alice_package.package
+    Message.objects.create(sender=package.owner, package=package)
+
+    with CaptureQueriesContext(connection) as context:
+        Message.objects.create(sender=package.owner, package=package)
+    stats_queries = [
+        query["sql"]
+        for query in context.captured_queries
+        if "submission_packagestats" in query["sql"]
+    ]
+    assert len(stats_queries) == 1
+    assert stats_queries[0].startswith('UPDATE "submission_packagestats"')
+    assert "COUNT(" not in stats_queries[0]
+
+    assert PackageStats.objects.get(package=package).cnt_messages == 2
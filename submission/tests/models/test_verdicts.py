@@ -0,0 +1,48 @@
+from submission.models import PackageSequencingData
+from submission.models.mixin_verdict import VerdictBuffer
+
+
+def test_verdicts_saved_immediately_without_buffer(package_of, alice, new_fastq_of):
+    """Out of VerdictBuffer context verdict is saved right away."""
+    fastq = new_fastq_of(package_of(alice), "file.fastq.gz")
+    fastq.add_verdict("checked", fastq.VerdictLevel.INFO)
+
+    assert PackageSequencingData.objects.get(pk=fastq.pk).verdicts == [
+        {"verdict": "checked", "level": "info"},
+    ]
+
+
+def test_buffered_verdicts_flushed_in_bulk(
+    package_of,
+    alice,
+    new_fastq_of,
+    django_assert_num_queries,
+):
+    """Verdicts are kept in memory and written with a single query on context exit."""
+    package = package_of(alice)
+    fastqs = [new_fastq_of(package, f"file{j}.fastq.gz") for j in range(10)]
+
+    with django_assert_num_queries(1):
+        with VerdictBuffer():
+            for fastq in fastqs:
+                fastq.add_verdict("checked", fastq.VerdictLevel.INFO)
+
+    assert all(
+        fastq.verdicts == [{"verdict": "checked", "level": "info"}]
+        for fastq in package.assoc_sequencing_datas.all()
+    )
+
+
+def test_buffered_verdicts_of_refetched_record_merged(package_of, alice, new_fastq_of):
+    """Verdicts given to different instances of same record are all saved."""
+    fastq = new_fastq_of(package_of(alice), "file.fastq.gz")
+
+    with VerdictBuffer():
+        fastq.add_verdict("first", fastq.VerdictLevel.INFO)
+        refetched = PackageSequencingData.objects.get(pk=fastq.pk)
+        refetched.add_verdict("second", fastq.VerdictLevel.ERROR)
+
+    assert PackageSequencingData.objects.get(pk=fastq.pk).verdicts == [
+        {"verdict": "first", "level": "info"},
+        {"verdict": "second", "level": "error"},
+    ]
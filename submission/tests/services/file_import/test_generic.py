@@ -1,4 +1,8 @@
 """Tests that are generic for both PDS/MIC tests import services."""
+from io import BytesIO
+
+import openpyxl
+import pandas as pd
 import pytest
 from django.core.files import File
 
@@ -7,6 +11,7 @@ from genphen.models import Country
 from submission.services.file_import import (
     PackageFileMICImportService,
     PackageFilePDSTImportService,
+    base,
 )
 
 FILE_VALID = "pdst1__valid.xlsx"
@@ -36,7 +41,7 @@ def test_new_sample_has_country(
     countries,
     growth_mediums,
     assessment_methods,
-):  # pylint: disable=unused-argument,too-many-arguments
+):  # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
     """New sample has country specified."""
     with open(shared_datadir / file_name, mode="rb") as file:
         service_class().execute(
@@ -47,3 +52,62 @@ def test_new_sample_has_country(
     sample_alias = package_of(alice).sample_aliases.filter(name=sample_name).get()
     country = Country.objects.filter(three_letters_code=country_code).get()
     assert sample_alias.country == country
+
+
+@pytest.mark.parametrize(
+    "file_name,service_class",
+    (
+        (FILE_VALID, PackageFilePDSTImportService),
+        ("mic_valid.xlsx", PackageFileMICImportService),
+    ),
+)
+def test_file_is_parsed_once(
+    package_of,
+    alice,
+    shared_datadir,
+    file_name,
+    service_class,
+    drugs,
+    countries,
+    growth_mediums,
+    assessment_methods,
+    mocker,
+):  # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+    """Worksheet is read and its rows are parsed once, then reused between validation and import."""
+    read_sheet = mocker.patch(
+        "submission.services.file_import.base.read_sheet",
+        wraps=base.read_sheet,
+    )
+    parse_columns = mocker.spy(service_class, "parse_named_columns")
+    with open(shared_datadir / file_name, mode="rb") as file:
+        service_class().execute(
+            dict(package=package_of(alice)),
+            dict(file=File(file)),
+        )
+
+    assert read_sheet.call_count == 1
+    assert parse_columns.call_count == 1
+    assert package_of(alice).sample_aliases.exists()
+
+
+def test_sheet_header_kept_as_written():
+    """Header cells are not stripped by the reader, and mangled the way pandas does."""
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Sheet"
+    worksheet.append(["Sample Id ", "Sample Id ", "Sample Id", None, "Note"])
+    worksheet.append(["S1", "S2", "S3", "x", 1.0])
+    content = BytesIO()
+    workbook.save(content)
+    expected = pd.read_excel(
+        BytesIO(content.getvalue()),
+        sheet_name="Sheet",
+        dtype="string",
+        mangle_dupe_cols=True,
+    )
+
+    dataframe = base.read_sheet(File(content, name="sheet.xlsx"), "Sheet")
+
+    assert list(dataframe.columns) == list(expected.columns)
+    assert list(dataframe.columns)[:3] == ["Sample Id ", "Sample Id .1", "Sample Id"]
+    assert dataframe.values.tolist() == expected.fillna("").values.tolist()
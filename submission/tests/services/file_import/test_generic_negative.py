@@ -1,11 +1,13 @@
 """Tests that are generic for both PDS/MIC tests import services."""
 import pytest
 from django.core.files import File
+from django.db import IntegrityError
 from rest_framework import serializers
 
 from submission.services.file_import import (
     PackageFileMICImportService,
     PackageFilePDSTImportService,
+    base,
 )
 
 
@@ -78,3 +80,45 @@ def test_duplicate_fastq_prefix_on_upsert(
                 dict(file=File(file)),
             )
         assert "fastq_prefix: Duplicated value" in str(exc)
+
+
+@pytest.mark.parametrize(
+    "service_class,filename,copy_func,existing_name",
+    (
+        # new alias is inserted with the prefix of another alias
+        (PackageFileMICImportService, "mic_valid.xlsx", "copy_insert", None),
+        # existing alias is updated with the prefix of another alias
+        (PackageFilePDSTImportService, "pdst2__valid.xlsx", "copy_update", "915-2015"),
+    ),
+)
+def test_duplicate_fastq_prefix_on_copy(
+    package_of,
+    alice,
+    new_alias_of,
+    shared_datadir,
+    drugs,
+    growth_mediums,
+    countries,
+    assessment_methods,
+    mocker,
+    service_class,
+    filename,
+    copy_func,
+    existing_name,
+):
+    """Unique violation, raised by COPY, is reported as duplicated fastq prefix."""
+    # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+    # pylint: disable=too-many-locals
+    package = package_of(alice)
+    prefix = "abc" if existing_name is None else "bcd"
+    new_alias_of(package, "OTHER", fastq_prefix=prefix)
+    if existing_name:
+        new_alias_of(package, existing_name)
+    spy = mocker.spy(base, copy_func)
+
+    with open(shared_datadir / filename, mode="rb") as file:
+        with pytest.raises(serializers.ValidationError) as exc:
+            service_class().execute(dict(package=package), dict(file=File(file)))
+
+    assert isinstance(spy.spy_exception, IntegrityError)
+    assert exc.value.detail == [f'fastq_prefix: Duplicated value "{prefix}".']
@@ -139,3 +139,47 @@ def test_attachment_created_after_import(
     assert attachment.type == attachment.Type.MIC
     # here somehow is full path to temp copy of a file
     assert attachment.original_filename.endswith("mic_valid.xlsx")
+
+
+def range_key(mic_range):
+    """Comparable range representation, infinite bound inclusiveness ignored."""
+    return (
+        mic_range.lower,
+        mic_range.upper,
+        mic_range.lower_inc,
+        mic_range.upper_inc and mic_range.upper is not None,
+    )
+
+
+def test_imported_tests_match_parsed_rows(
+    package_of,
+    alice,
+    shared_datadir,
+    drugs,
+    countries,
+):  # pylint: disable=unused-argument
+    """Tests and aliases, loaded with COPY, keep all the parsed values."""
+    package = package_of(alice)
+    with open(shared_datadir / "mic_valid.xlsx", "rb") as file:
+        service = PackageFileMICImportService(dict(package=package), dict(file=File(file)))
+        assert service.is_valid()
+        expected = sorted(
+            (row.sample_id, drug.pk, range_key(mic_range))
+            for row in service.get_rows(None)
+            for drug, mic_range in row.tests
+        )
+
+        PackageFileMICImportService().execute(
+            dict(package=package),
+            dict(file=File(file)),
+        )
+
+    imported = sorted(
+        (test.sample_alias.name, test.drug_id, range_key(test.range))
+        for test in package.mic_tests.select_related("sample_alias")
+    )
+    assert imported == expected
+    assert all(
+        alias.created_at and alias.verdicts == []
+        for alias in package.sample_aliases.all()
+    )
@@ -0,0 +1,149 @@
+import pytest
+
+from genphen.models import Country
+from submission.models import Package, PDSTest, SampleAlias, SequencingData
+from submission.services.matching import MatchingService
+
+
+def match_outcome(package: Package):
+    """
+    Collect matching results of the package.
+
+    Samples, created during matching, are named by order of appearance,
+    so outcomes of different runs could be compared.
+    """
+    new_samples = {}
+
+    def sample_name(sample_id):
+        if sample_id is None or not package.samples.filter(pk=sample_id).exists():
+            return sample_id
+        return new_samples.setdefault(sample_id, f"new{len(new_samples)}")
+
+    aliases = {
+        alias.name: (sample_name(alias.sample_id), alias.match_source, alias.verdicts)
+        for alias in package.sample_aliases.order_by("pk")
+    }
+    fastqs = {
+        fastq.filename: (sample_name(fastq.sequencing_data.sample_id), fastq.verdicts)
+        for fastq in package.assoc_sequencing_datas.order_by("pk")
+    }
+    tests = sorted(
+        (test.sample_alias.name, sample_name(test.sample_id))
+        for test in package.pds_tests.all()
+    )
+    return aliases, fastqs, tests
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+@pytest.fixture
+def complex_package(
+    new_package_of,
+    alice,
+    john,
+    new_alias_of,
+    new_fastq_of,
+    new_sample,
+    countries,
+):  # pylint: disable=unused-argument
+    """Package, that touches every matching stage and its edge cases."""
+    ncbi_package = new_package_of(john, origin="NCBI")
+    ncbi_package.sample_aliases.create(
+        name="SAMN0001",
+        origin="BioSample",
+        sample=new_sample(),
+    )
+    ncbi_package.sample_aliases.create(name="ncbi-name", sample=new_sample())
+    SequencingData.objects.create(library_name="err123", sample=new_sample())
+
+    accepted_package = new_package_of(alice, Package.State.ACCEPTED)
+    new_alias_of(accepted_package, "old-sample", sample=new_sample())
+
+    package = new_package_of(alice)
+    country = Country.objects.get(pk="FRA")
+
+    # pattern stage
+    new_alias_of(package, "SAMN0001")
+    new_alias_of(package, "SAMN9999")
+    new_alias_of(package, "ERR123", fastq_prefix="err123")
+    # name stage
+    new_alias_of(package, "NCBI-NAME")
+    new_alias_of(package, "OLD-SAMPLE")
+    # prefix stage
+    new_alias_of(package, "no-fastq", fastq_prefix="nofq")
+    new_alias_of(package, "wrong-count", fastq_prefix="wr")
+    new_alias_of(package, "different", fastq_prefix="df")
+    new_alias_of(package, "existing", fastq_prefix="ex")
+    new_alias_of(package, "new", fastq_prefix="nw", country=country)
+    new_alias_of(package, "overlap", fastq_prefix="ov")
+    new_alias_of(package, "overlap-a", fastq_prefix="ov_a")
+    # sample id as prefix stage
+    new_alias_of(package, "by-name", sampling_date=("2020-01-01", "2020-12-31"))
+
+    for j in range(3):
+        new_fastq_of(package, f"wr_{j}.fastq.gz")
+    new_fastq_of(package, "df_1.fastq.gz", sample=new_sample())
+    new_fastq_of(package, "df_2.fastq.gz", sample=new_sample())
+    new_fastq_of(package, "ex_1.fastq.gz")
+    new_fastq_of(package, "ex_2.fastq.gz", sample=new_sample())
+    new_fastq_of(package, "NW_1.fastq.gz")
+    new_fastq_of(package, "nw_2.fastq.gz")
+    new_fastq_of(package, "ov_a_1.fastq.gz")
+    new_fastq_of(package, "ov_a_2.fastq.gz")
+    new_fastq_of(package, "BY-NAME_R1.fastq.gz")
+    new_fastq_of(package, "by-name_R2.fastq.gz")
+    new_fastq_of(package, "stray.fastq.gz")
+
+    for alias in package.sample_aliases.all():
+        PDSTest.objects.create(package=package, sample_alias=alias)
+
+    return package
+
+
+def test_bulk_matching_same_as_per_alias_matching(complex_package):
+    """Bulk matching produces exactly the same results, as per-alias matching."""
+    # pylint: disable=redefined-outer-name
+    MatchingService.execute(dict(package=complex_package))
+    expected = match_outcome(complex_package)
+
+    complex_package.refresh_from_db()
+    complex_package.matching_state = complex_package.MatchingState.CHANGED
+    complex_package.save()
+
+    MatchingService.execute(dict(package=complex_package, bulk=True))
+
+    assert match_outcome(complex_package) == expected
+
+
+def test_bulk_matching_on_never_matched_package(complex_package):
+    """Bulk matching result doesn't depend on whether package was matched before."""
+    # pylint: disable=redefined-outer-name
+    MatchingService.execute(dict(package=complex_package, bulk=True))
+    aliases, fastqs, tests = match_outcome(complex_package)
+
+    assert aliases["SAMN9999"][1] == SampleAlias.MatchSource.NO_MATCH
+    assert aliases["OLD-SAMPLE"][1] == SampleAlias.MatchSource.USER_ALIAS
+    assert aliases["new"][:2] == ("new0", SampleAlias.MatchSource.FASTQ_UPLOADED_NEW_SAMPLE)
+    assert aliases["overlap-a"][:2] == ("new1", SampleAlias.MatchSource.FASTQ_UPLOADED)
+    assert fastqs["nw_2.fastq.gz"][0] == "new0"
+    assert fastqs["stray.fastq.gz"][1][0]["verdict"] == "was not used in matching"
+    assert ("new", "new0") in tests
+
+
+def test_bulk_matching_queries_do_not_depend_on_package_size(
+    new_package_of,
+    alice,
+    new_alias_of,
+    new_fastq_of,
+    django_assert_max_num_queries,
+):
+    """Bulk matching runs a constant amount of queries."""
+    package = new_package_of(alice)
+    for j in range(50):
+        new_alias_of(package, f"A{j}", fastq_prefix=f"p{j}")
+        new_fastq_of(package, f"p{j}_1.fastq.gz")
+        new_fastq_of(package, f"p{j}_2.fastq.gz")
+
+    with django_assert_max_num_queries(30):
+        MatchingService.execute(dict(package=package, bulk=True))
+
+    assert not package.sample_aliases.filter(sample__isnull=True).exists()
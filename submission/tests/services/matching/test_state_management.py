@@ -4,7 +4,7 @@ import pytest
 from pytest_mock import MockerFixture
 from rest_framework.exceptions import PermissionDenied
 
-from submission.models import Package
+from submission.models import Job, Package, PackageStats
 from submission.services.matching import MatchingService
 
 
@@ -121,3 +121,40 @@ def test_other_user_packages_changed_on_accept(new_package_of, alice):
     assert package1.matching_state == Package.MatchingState.CHANGED
     package2.refresh_from_db()
     assert package2.matching_state == Package.MatchingState.CHANGED
+
+
+def test_other_user_packages_stats_refreshed_on_accept(
+    new_package_of,
+    alice,
+    run_jobs,
+    django_assert_max_num_queries,
+):
+    """Rejected packages go back to draft, their stats are refreshed by one background job."""
+    drafts = [new_package_of(alice) for _ in range(5)]
+    rejected = new_package_of(alice, state=Package.State.REJECTED)
+    accepted = new_package_of(alice)
+    for package in (*drafts, rejected):
+        package.messages.create(sender=alice)
+    PackageStats.objects.update(cnt_messages=0)
+
+    accepted.matching_state = Package.MatchingState.MATCHED
+    accepted.to_pending()
+    # doesn't depend on the number of packages
+    with django_assert_max_num_queries(10):
+        accepted.pending_to_accepted()
+
+    rejected.refresh_from_db()
+    assert rejected.state == Package.State.DRAFT
+    [job] = Job.objects.filter(kind=Job.Kind.REFRESH_STATS)
+    assert sorted(job.payload["package_ids"]) == sorted(p.pk for p in (*drafts, rejected))
+    assert job.package is None
+    assert not accepted.jobs.exists()
+
+    assert run_jobs() == 1
+    assert set(
+        PackageStats.objects.filter(package__in=(*drafts, rejected)).values_list(
+            "cnt_messages",
+            flat=True,
+        ),
+    ) == {1}
+    assert PackageStats.objects.get(package=accepted).cnt_messages == 0
@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from submission.jobs import enqueue, run_pending
+from submission.models import Job
+
+
+def test_jobs_are_executed_in_order(package_of, alice, mocker, run_jobs):
+    """Queued jobs are executed one by one, oldest first."""
+    first = enqueue(Job.Kind.MATCH, package_of(alice), alice)
+    second = enqueue(Job.Kind.MATCH, package_of(alice), alice)
+    handler = mocker.patch.dict(
+        "submission.jobs.HANDLERS",
+        {Job.Kind.MATCH: mocker.Mock(return_value={"ok": True})},
+    )[Job.Kind.MATCH]
+
+    assert run_jobs() == 2
+    assert [call.args[0].pk for call in handler.call_args_list] == [first.pk, second.pk]
+
+    first.refresh_from_db()
+    assert first.state == Job.State.DONE
+    assert first.result == {"ok": True}
+    assert first.attempts == 1
+    assert first.started_at <= first.finished_at
+
+    # nothing left
+    assert run_jobs() == 0
+
+
+def test_crashed_job_is_failed(package_of, alice, mocker, run_jobs):
+    """Unexpected handler error doesn't stop the worker, the job is failed."""
+    job = enqueue(Job.Kind.MATCH, package_of(alice), alice)
+    mocker.patch.dict(
+        "submission.jobs.HANDLERS",
+        {Job.Kind.MATCH: mocker.Mock(side_effect=RuntimeError("boom"))},
+    )
+
+    assert run_jobs() == 1
+
+    job.refresh_from_db()
+    assert job.state == Job.State.FAILED
+    assert job.errors["type"] == "server_error"
+
+
+def test_interrupted_job_backs_off(package_of, alice, mocker, settings):
+    """Job, interrupted by network error, is not taken again until its retry time."""
+    settings.JOBS_RETRY_DELAY = 60
+    job = enqueue(Job.Kind.MATCH, package_of(alice), alice)
+    mocker.patch.dict(
+        "submission.jobs.HANDLERS",
+        {Job.Kind.MATCH: mocker.Mock(side_effect=[ConnectionResetError, None])},
+    )
+
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.state == Job.State.QUEUED
+    assert job.run_after >= timezone.now() + timedelta(seconds=59)
+    # the worker loop doesn't take it again right away
+    assert run_pending() == 0
+
+    Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert (job.state, job.attempts) == (Job.State.DONE, 2)
+
+
+@pytest.mark.parametrize("kind", [Job.Kind.MIC_IMPORT, Job.Kind.PDS_IMPORT])
+def test_import_into_submitted_package_is_failed(package_of, alice, run_jobs, kind):
+    """Import job doesn't touch the package, submitted while the job was queued."""
+    package = package_of(alice)
+    job = enqueue(kind, package, alice, filename="tests.xlsx")
+    package.state = package.State.PENDING
+    package.save()
+
+    assert run_jobs() == 1
+
+    job.refresh_from_db()
+    assert job.state == Job.State.FAILED
+    assert job.errors["type"] == "validation_error"
+    assert job.errors["errors"][0]["detail"] == "The package cannot be edited."
+
+
+def test_dropped_job_is_taken_again(package_of, alice, mocker, settings):
+    """Job, left running by a dead worker, is retried until attempts are exhausted."""
+    settings.JOBS_MAX_ATTEMPTS = 2
+    mocker.patch.dict("submission.jobs.HANDLERS", {Job.Kind.MATCH: mocker.Mock(return_value=None)})
+    stale = timezone.now() - timedelta(seconds=settings.JOBS_STALE_AFTER + 1)
+
+    retried = enqueue(Job.Kind.MATCH, package_of(alice), alice)
+    exhausted = enqueue(Job.Kind.MATCH, package_of(alice), alice)
+    running = enqueue(Job.Kind.MATCH, package_of(alice), alice)
+    Job.objects.filter(pk=retried.pk).update(state=Job.State.RUNNING, started_at=stale, attempts=1)
+    Job.objects.filter(pk=exhausted.pk).update(
+        state=Job.State.RUNNING,
+        started_at=stale,
+        attempts=2,
+    )
+    Job.objects.filter(pk=running.pk).update(
+        state=Job.State.RUNNING,
+        started_at=timezone.now(),
+        attempts=1,
+    )
+
+    assert run_pending() == 1
+
+    for job in (retried, exhausted, running):
+        job.refresh_from_db()
+    assert (retried.state, retried.attempts) == (Job.State.DONE, 2)
+    assert exhausted.state == Job.State.FAILED
+    assert running.state == Job.State.RUNNING
+
+
+def test_runjobs_command_once(package_of, alice, mocker):
+    """Management command executes queued jobs and exits."""
+    enqueue(Job.Kind.MATCH, package_of(alice), alice)
+    mocker.patch.dict("submission.jobs.HANDLERS", {Job.Kind.MATCH: mocker.Mock(return_value=None)})
+
+    call_command("runjobs", "--once")
+
+    assert Job.objects.get().state == Job.State.DONE
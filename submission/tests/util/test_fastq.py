@@ -0,0 +1,128 @@
+import re
+import random
+
+import pytest
+
+from submission.util.fastq import FastqValidator
+
+
+def make_fastq(reads: int, seed: int = 0, titled: bool = False) -> bytes:
+    """Generate random FASTQ file contents."""
+    rnd = random.Random(seed)
+    records = []
+    for idx in range(reads):
+        length = rnd.randint(30, 150)
+        seq = "".join(rnd.choices("ACGT", k=length))
+        qual = "".join(rnd.choices("!#5?AEI", k=length))
+        title = f"read.{idx} length={length}"
+        records.append(f"@{title}\n{seq}\n+{title if titled else ''}\n{qual}\n")
+    return "".join(records).encode()
+
+
+def validate(content: bytes, chunk_size: int = 1000, **kwargs):
+    """Feed contents to validator by chunks."""
+    validator = FastqValidator(**kwargs)
+    for pos in range(0, len(content), chunk_size):
+        validator.feed(content[pos : pos + chunk_size])
+    return validator.close()
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 1000, 1 << 20))
+@pytest.mark.parametrize("titled", (False, True))
+def test_full_mode_counts_reads_and_bases(chunk_size, titled):
+    """Every read and base is counted, regardless of how the stream is split."""
+    content = make_fastq(300, titled=titled)
+    stats = validate(content, chunk_size)
+
+    assert stats.reads == 300
+    assert stats.bases == sum(len(line) for line in content.split(b"\n")[1::4])
+    assert stats.mean_read_length == stats.bases / 300
+    assert not stats.sampled
+
+
+@pytest.mark.parametrize(
+    "content,message",
+    (
+        (b"", "no sequences found"),
+        (b"\n\n", "no sequences found"),
+        (b"read\nACGT\n+\nAAAA\n", "should start with '@'"),
+        (b"@read\nAC\nGT\n+\nAAA\n", "differs for read (4 and 3)"),
+        (b"@read\nACGT\n+\nAAA\n", "differs for read (4 and 3)"),
+        (b"@read\nACGT\n+other\nAAAA\n", "captions differ"),
+        (b"@read\nACGT\n+\n", "Unexpected end of file"),
+    ),
+)
+def test_structure_errors(content, message):
+    """Broken records are reported."""
+    with pytest.raises(ValueError, match=re.escape(message)):
+        validate(make_fastq(10) + content if content.strip() else content, 3)
+
+
+def test_records_after_repeated_title_are_checked():
+    """Record with a whitespace-padded "+" title doesn't hide broken records after it."""
+    content = b"@r1\nACGT\n+\nIIII\n@r2\nACGT\n+r2 \nIIII\n@r3\nACGT\n+\nIII\n"
+
+    with pytest.raises(ValueError, match=re.escape("differs for r3 (4 and 3)")):
+        validate(content)
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 1000))
+@pytest.mark.parametrize("mode", ("full", "sampled"))
+def test_multiline_records(chunk_size, mode):
+    """Records, wrapped over several lines, are accepted, as Biopython does."""
+    content = make_fastq(50, titled=True)
+    lines = content.split(b"\n")[:-1]
+    for idx in (1, 3):
+        lines[idx::4] = [b"\n".join(re.findall(b".{1,20}", line)) for line in lines[idx::4]]
+    wrapped = b"\n".join(lines) + b"\n"
+    assert wrapped.count(b"\n") > content.count(b"\n")
+
+    stats = validate(wrapped, chunk_size, mode=mode, head_reads=10, tail_bytes=500)
+
+    assert stats == validate(content)
+
+
+def test_crlf_and_missing_last_newline():
+    """Windows line endings and no newline at the end of file are accepted."""
+    content = make_fastq(5).replace(b"\n", b"\r\n").rstrip()
+    stats = validate(content, 10)
+
+    assert stats.reads == 5
+    assert stats.bases == validate(make_fastq(5)).bases
+
+
+@pytest.mark.parametrize("chunk_size", (97, 1000))
+def test_sampled_mode_counts_reads_and_estimates_bases(chunk_size):
+    """Reads are counted exactly, bases are estimated from head and tail."""
+    content = make_fastq(2000)
+    full = validate(content)
+    stats = validate(content, chunk_size, mode="sampled", head_reads=100, tail_bytes=5000)
+
+    assert stats.sampled
+    assert stats.reads == full.reads
+    assert stats.bases == pytest.approx(full.bases, rel=0.1)
+
+
+@pytest.mark.parametrize(
+    "corrupt,valid",
+    (
+        (lambda lines: lines.__setitem__(1, b"ACGTACGT"), False),
+        (lambda lines: lines.__setitem__(-3, b"ACGTACGT"), False),
+        (lambda lines: lines.__setitem__(4001, b"ACGTACGT"), True),
+        (lambda lines: lines.pop(), False),
+    ),
+)
+def test_sampled_mode_checks_head_and_tail(corrupt, valid):
+    """Only head and tail records are validated in sampled mode."""
+    lines = make_fastq(2000).split(b"\n")[:-1]
+    corrupt(lines)
+    content = b"\n".join(lines) + b"\n"
+
+    def run():
+        return validate(content, 1000, mode="sampled", head_reads=100, tail_bytes=5000)
+
+    if valid:
+        assert run().reads == 2000
+    else:
+        with pytest.raises(ValueError):
+            run()
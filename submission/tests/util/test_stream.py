@@ -0,0 +1,41 @@
+import random
+import time
+from hashlib import md5
+
+import pytest
+
+from submission.util.stream import HashingReader, RangedReader
+
+
+@pytest.mark.parametrize(
+    "size,chunk_size,concurrency",
+    (
+        (0, 10, 4),
+        (1, 10, 4),
+        (100, 10, 4),
+        (105, 10, 4),
+        (105, 200, 2),
+        (1000, 7, 16),
+    ),
+)
+def test_ranged_reader_reassembles_ranges_in_order(size, chunk_size, concurrency):
+    """Concurrently fetched ranges are returned in order, and nothing is lost."""
+    content = random.randbytes(size)
+
+    def fetch(start, end):
+        time.sleep(random.random() / 1000)
+        return content[start : end + 1]
+
+    with RangedReader(fetch, size, chunk_size, concurrency) as reader:
+        hashing = HashingReader(reader, md5(usedforsecurity=False))
+        assert hashing.read() == content
+
+    assert hashing.size == size
+    assert hashing.hasher.hexdigest() == md5(content, usedforsecurity=False).hexdigest()
+
+
+def test_ranged_reader_detects_incomplete_range():
+    """Range of unexpected length is an error."""
+    with RangedReader(lambda start, end: b"x", 100, 10, 2) as reader:
+        with pytest.raises(IOError):
+            reader.read()
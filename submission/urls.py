@@ -16,6 +16,7 @@ router.register(r"packages", views.packages.PackageViewSet, basename="package")
 package_router = routers.NestedDefaultRouter(router, r"packages", lookup="package")
 
 # nested view sets
+package_router.register(r"jobs", views.PackageJobsViewSet, basename="job")
 package_router.register(r"messages", views.PackageMessagesViewSet, basename="message")
 package_router.register(r"mic-tests", views.PackageMICTestsViewSet, basename="mictest")
 package_router.register(r"pds-tests", views.PackagePDSTestsViewSet, basename="pdstest")
@@ -0,0 +1,332 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+import numpy as np
+
+NEWLINE = ord("\n")
+WHITESPACE = np.frombuffer(b" \t\r\x0b\x0c", dtype=np.uint8)
+AT_SIGN = ord("@")
+PLUS_SIGN = ord("+")
+
+
+@dataclass
+class FastqStats:
+    """FASTQ file statistics, collected during validation."""
+
+    reads: int = 0
+    bases: int = 0
+    sampled: bool = False
+    """Bases are estimated from the sampled reads, not counted exactly."""
+
+    @property
+    def mean_read_length(self) -> float:
+        """Mean read length."""
+        return self.bases / self.reads if self.reads else 0.0
+
+
+# pylint: disable=too-many-instance-attributes
+class FastqRecordsValidator:
+    """
+    Incremental structural validator of FASTQ records over raw bytes.
+
+    Every fed block is checked as a whole with numpy, as 4-line records:
+    header line starts with "@", third line starts with "+",
+    sequence and quality lines are of the same length.
+    Nothing is allocated per record, except for error messages.
+    Incomplete record at the end of a block waits for the next one.
+    Once a record turns out to be wrapped over several lines,
+    the rest of the file is parsed line by line, the way Biopython does.
+    """
+
+    def __init__(self):
+        """Start with no data."""
+        self.reads = 0
+        self.bases = 0
+        self.blank_tail_lines = 0
+        self.multiline = False
+        self._rest = b""
+        # line by line parsing state: expected line and the current record
+        self._expect = "header"
+        self._record_title = ""
+        self._seq_len = 0
+        self._qual_len = 0
+        self._qual_lines = 0
+
+    def feed(self, data: bytes):
+        """Validate all complete records of the data, keep the rest for later."""
+        buffer = self._rest + data if self._rest else data
+        if self.multiline:
+            self._feed_lines(buffer)
+            return
+
+        array = np.frombuffer(buffer, dtype=np.uint8)
+        newlines = np.flatnonzero(array == NEWLINE)
+        lines_cnt = newlines.size - newlines.size % 4
+        if not lines_cnt:
+            self._rest = buffer
+            return
+
+        ends = newlines[:lines_cnt]
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        self._rest = buffer[ends[-1] + 1 :]
+
+        # do not count trailing whitespace, CR of CRLF line endings included
+        while True:
+            trailing = np.isin(array[np.maximum(ends - 1, 0)], WHITESPACE) & (ends > starts)
+            if not trailing.any():
+                break
+            ends = ends - trailing
+        lengths = (ends - starts).reshape(-1, 4)
+        starts = starts.reshape(-1, 4)
+
+        wrapped = self._check_records(buffer, array, starts, lengths)
+
+        self.reads += starts[:wrapped].shape[0]
+        self.bases += int(lengths[:wrapped, 1].sum())
+
+        if wrapped is not None:
+            self.multiline = True
+            self._rest = b""
+            self._feed_lines(buffer[starts[wrapped, 0] :])
+
+    @staticmethod
+    def _title(buffer: bytes, start: int, length: int) -> str:
+        """Decode record title from header or "+" line."""
+        return buffer[start + 1 : start + length].decode("utf-8", "replace").rstrip()
+
+    @staticmethod
+    def _titles_match(array: np.ndarray, starts, lengths) -> np.ndarray:
+        """Check, that "+" lines are either bare or repeat the record title byte by byte."""
+        titles_ok = (lengths[:, 2] <= 1) | (lengths[:, 2] == lengths[:, 0])
+        titled = np.flatnonzero((lengths[:, 2] > 1) & titles_ok)
+        if not titled.size:
+            return titles_ok
+        # compare all repeated titles at once, by gathering their bytes
+        sizes = lengths[titled, 0]
+        offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        equal = (
+            array[np.repeat(starts[titled, 0], sizes) + offsets]
+            == array[np.repeat(starts[titled, 2], sizes) + offsets]
+        )
+        # first byte differs by design ("@" and "+"), skip it
+        equal[np.cumsum(sizes) - sizes] = True
+        titles_ok[titled] = np.logical_and.reduceat(equal, np.cumsum(sizes) - sizes)
+        return titles_ok
+
+    def _check_records(self, buffer: bytes, array: np.ndarray, starts, lengths) -> Optional[int]:
+        """
+        Check structure of complete records, raise ValueError on the first broken one.
+
+        Records, which failed the fast byte checks, are checked one by one,
+        as titles may differ only by trailing whitespace.
+        Return index of the first record, that may be wrapped over several lines:
+        it starts with a blank line, its "+" line is misplaced, its sequence is empty,
+        or its quality is shorter than the sequence.
+        """
+        headers_ok = (lengths[:, 0] > 0) & (array[starts[:, 0]] == AT_SIGN)
+        # a line, starting with "+", ends the sequence, even an empty one
+        seqs_ok = (lengths[:, 1] == 0) | (array[starts[:, 1]] != PLUS_SIGN)
+        pluses_ok = (lengths[:, 2] > 0) & (array[starts[:, 2]] == PLUS_SIGN)
+        lengths_ok = lengths[:, 1] == lengths[:, 3]
+        titles_ok = self._titles_match(array, starts, lengths)
+
+        failed = np.flatnonzero(~(headers_ok & seqs_ok & pluses_ok & lengths_ok & titles_ok))
+        for idx in failed:
+            if not lengths[idx, 0] and (idx or self.reads):
+                # blank line after a record
+                return int(idx)
+            if not headers_ok[idx]:
+                raise ValueError("Records in Fastq files should start with '@' character")
+            if not (seqs_ok[idx] and pluses_ok[idx]) or not lengths[idx, 1]:
+                return int(idx)
+            title = self._title(buffer, starts[idx, 0], lengths[idx, 0])
+            second_title = self._title(buffer, starts[idx, 2], lengths[idx, 2])
+            if second_title and second_title != title:
+                raise ValueError("Sequence and quality captions differ.")
+            if lengths[idx, 3] < lengths[idx, 1]:
+                return int(idx)
+            if not lengths_ok[idx]:
+                raise ValueError(
+                    f"Lengths of sequence and quality values differs for {title} "
+                    f"({lengths[idx, 1]} and {lengths[idx, 3]}).",
+                )
+        return None
+
+    def _feed_lines(self, buffer: bytes):
+        """Validate complete lines of wrapped records, keep the incomplete line for later."""
+        *lines, self._rest = buffer.split(b"\n")
+        for line in lines:
+            self._feed_line(line.rstrip())
+
+    def _feed_line(self, line: bytes):
+        """Take the next line of wrapped records, with trailing whitespace stripped."""
+        if self._expect == "quality":
+            if line.startswith(b"@") and self._qual_len >= self._seq_len:
+                # quality line may start with "@" too, but then the quality is short
+                self._finish_record()
+            else:
+                self._qual_len += len(line)
+                self._qual_lines += 1
+                return
+
+        if self._expect == "header":
+            if not line:
+                # blank lines are allowed between records
+                self.blank_tail_lines += 1
+            elif not line.startswith(b"@"):
+                raise ValueError("Records in Fastq files should start with '@' character")
+            else:
+                self.blank_tail_lines = 0
+                self._record_title = line[1:].decode("utf-8", "replace")
+                self._seq_len = 0
+                self._expect = "sequence"
+        elif line.startswith(b"+"):
+            second_title = line[1:].decode("utf-8", "replace")
+            if second_title and second_title != self._record_title:
+                raise ValueError("Sequence and quality captions differ.")
+            self._qual_len = 0
+            self._qual_lines = 0
+            self._expect = "quality"
+        else:
+            self._seq_len += len(line)
+
+    def _finish_record(self):
+        """Count wrapped record, once its quality is complete."""
+        if self._seq_len != self._qual_len:
+            raise ValueError(
+                f"Lengths of sequence and quality values differs for {self._record_title} "
+                f"({self._seq_len} and {self._qual_len}).",
+            )
+        self.reads += 1
+        self.bases += self._seq_len
+        self._expect = "header"
+
+    def close(self):
+        """Validate the last record, allow only blank lines after it."""
+        if self.multiline:
+            rest = self._rest
+            self._rest = b""
+            if rest:
+                self._feed_line(rest.rstrip())
+            if self._expect == "sequence":
+                raise ValueError("End of file without quality information.")
+            if self._expect == "quality":
+                if not self._qual_lines:
+                    raise ValueError("Unexpected end of file")
+                self._finish_record()
+            return
+
+        if self._rest.strip():
+            rest = self._rest
+            self._rest = b""
+            self.feed(rest if rest.endswith(b"\n") else rest + b"\n")
+            if self.multiline:
+                self.close()
+                return
+            if self._rest.strip():
+                raise ValueError("Unexpected end of file")
+        self.blank_tail_lines = self._rest.count(b"\n")
+        self._rest = b""
+
+
+# pylint: disable=too-many-instance-attributes
+class FastqValidator:
+    """
+    Streaming FASTQ validator, fed with decompressed file contents.
+
+    In "full" mode every record is validated.
+    In "sampled" mode, aimed at very large files, only first `head_reads` records
+    and the records within last `tail_bytes` are validated,
+    the rest of the file is only counted by lines.
+    """
+
+    FULL = "full"
+    SAMPLED = "sampled"
+
+    def __init__(self, mode: str = FULL, head_reads: int = 100_000, tail_bytes: int = 8 << 20):
+        """Prepare validator of the selected mode."""
+        if mode not in (self.FULL, self.SAMPLED):
+            raise ValueError(f"unknown FASTQ validation mode: {mode}")
+        self.mode = mode
+        self.head_reads = head_reads
+        self.tail_bytes = tail_bytes
+        self._head = FastqRecordsValidator()
+        self._head_done = False
+        self._lines = 0
+        self._last_byte = b"\n"
+        self._tail: Deque[bytes] = deque()
+        self._tail_size = 0
+        self._tail_at_line_start = True
+
+    def feed(self, data: bytes):
+        """Validate next part of the decompressed file."""
+        if not data:
+            return
+        if self.mode == self.FULL or not self._head_done:
+            self._head.feed(data)
+            # lines of wrapped records can't be counted as reads, such files are validated fully
+            self._head_done = (
+                self.mode == self.SAMPLED
+                and not self._head.multiline
+                and self._head.reads >= self.head_reads
+            )
+            return
+
+        # sampled mode, past the head: count lines and keep the tail window
+        self._lines += data.count(b"\n")
+        self._last_byte = data[-1:]
+        if not self._tail:
+            rest = self._head._rest  # pylint: disable=protected-access
+            self._tail_at_line_start = not rest or rest.endswith(b"\n")
+        self._tail.append(data)
+        self._tail_size += len(data)
+        while self._tail_size - len(self._tail[0]) >= self.tail_bytes:
+            dropped = self._tail.popleft()
+            self._tail_size -= len(dropped)
+            self._tail_at_line_start = dropped.endswith(b"\n")
+
+    def close(self) -> FastqStats:
+        """Finish validation, return file stats."""
+        head = self._head
+        if not self._tail:
+            head.close()
+            if not head.reads:
+                raise ValueError("no sequences found in the FASTQ file")
+            return FastqStats(reads=head.reads, bases=head.bases)
+
+        # records, started within the head part and finished after it
+        tail = b"".join(self._tail)
+        lines_before_tail = self._lines - tail.count(b"\n")
+        head_rest_lines = head._rest.count(b"\n")  # pylint: disable=protected-access
+        lines_before_tail += head.reads * 4 + head_rest_lines
+
+        # skip to the first record start within the tail window
+        pos = 0
+        skip_lines = (-lines_before_tail) % 4
+        if not skip_lines and not self._tail_at_line_start:
+            skip_lines = 4
+        for _ in range(skip_lines):
+            pos = tail.index(b"\n", pos) + 1
+
+        tail_validator = FastqRecordsValidator()
+        tail_validator.feed(tail[pos:])
+        tail_validator.close()
+
+        lines = head.reads * 4 + head_rest_lines + self._lines
+        if self._last_byte != b"\n":
+            lines += 1
+        lines -= tail_validator.blank_tail_lines
+        if lines % 4:
+            raise ValueError("Unexpected end of file")
+
+        reads = lines // 4
+        sampled_reads = head.reads + tail_validator.reads
+        sampled_bases = head.bases + tail_validator.bases
+        return FastqStats(
+            reads=reads,
+            bases=round(reads * sampled_bases / sampled_reads),
+            sampled=True,
+        )
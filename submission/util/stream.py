@@ -0,0 +1,97 @@
+import io
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Callable, Deque, Tuple
+
+
+class HashingReader(io.RawIOBase):
+    """
+    Read-only binary stream wrapper, that hashes and counts all the bytes read through it.
+
+    Allows to calculate checksum and size of the file
+    while it's being consumed by another reader, e.g. gzip decompressor.
+    """
+
+    def __init__(self, file: BinaryIO, hasher):
+        """Wrap binary file, hasher is a hashlib hash object."""
+        super().__init__()
+        self.file = file
+        self.hasher = hasher
+        self.size = 0
+
+    def readable(self):
+        """Stream is readable."""
+        return True
+
+    def readinto(self, buffer) -> int:
+        """Read up to len(buffer) bytes into buffer."""
+        chunk = self.file.read(len(buffer))
+        self.hasher.update(chunk)
+        self.size += len(chunk)
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+# pylint: disable=too-many-instance-attributes
+class RangedReader(io.RawIOBase):
+    """
+    Read-only binary stream over a remote file, downloaded by byte ranges concurrently.
+
+    Ranges are fetched with fetch(start, end) (both inclusive) over a thread pool,
+    at most `concurrency` ranges ahead of the reader, and returned strictly in order.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int, int], bytes],
+        size: int,
+        chunk_size: int,
+        concurrency: int,
+    ):
+        """Prepare ranged download of the file of known size."""
+        super().__init__()
+        self.fetch = fetch
+        self.size = size
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._pending: Deque[Tuple[int, Future]] = deque()
+        self._next_offset = 0
+        self._chunk = memoryview(b"")
+
+    def readable(self):
+        """Stream is readable."""
+        return True
+
+    def _schedule(self):
+        """Keep the download queue full."""
+        while len(self._pending) < self.concurrency and self._next_offset < self.size:
+            start = self._next_offset
+            end = min(start + self.chunk_size, self.size) - 1
+            future = self._executor.submit(self.fetch, start, end)
+            self._pending.append((end - start + 1, future))
+            self._next_offset = end + 1
+
+    def readinto(self, buffer) -> int:
+        """Read up to len(buffer) bytes into buffer."""
+        if not self._chunk:
+            self._schedule()
+            if not self._pending:
+                return 0
+            expected, future = self._pending.popleft()
+            chunk = future.result()
+            if len(chunk) != expected:
+                raise IOError(f"incomplete range received: {len(chunk)} of {expected} bytes")
+            self._chunk = memoryview(chunk)
+            self._schedule()
+
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        """Stop all pending downloads."""
+        if not self.closed:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        super().close()
@@ -0,0 +1,31 @@
+from rest_framework import viewsets, permissions, status
+from rest_framework.response import Response
+
+from submission.models import Job
+from submission.permissions import IsParentPackageOwner
+from submission.serializers.job import JobSerializer
+
+
+class PackageJobsViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Package background jobs.
+
+    Long running package operations respond with a queued job,
+    which should be polled until it's done or failed.
+    """
+
+    permission_classes = (
+        permissions.IsAuthenticated,
+        IsParentPackageOwner,
+    )
+    serializer_class = JobSerializer
+
+    def get_queryset(self):
+        """Only work within current package jobs."""
+        return Job.objects.filter(package_id=self.kwargs["package_pk"]).order_by("-pk")
+
+
+def job_accepted(job: Job, request) -> Response:
+    """Respond with just queued job."""
+    data = JobSerializer(job, context={"request": request}).data
+    return Response(data, status=status.HTTP_202_ACCEPTED, headers={"Location": data["url"]})
@@ -4,17 +4,16 @@ from rest_framework import viewsets, mixins, permissions
 from rest_framework.decorators import action
 from rest_framework.reverse import reverse
 
-from submission.models import Package
+from submission.jobs import enqueue
+from submission.models import Job, Package
 from submission.permissions import (
     IsParentPackageOwner,
     IsParentPackageEditable,
     ReadOnly,
 )
 from submission.serializers.package.mic_tests import MICTestsSerializer
-from submission.services.file_import.mic import (
-    PackageFileMICImportService,
-    PackageMICDataClearService,
-)
+from submission.services.file_import.mic import PackageMICDataClearService
+from submission.views.jobs import job_accepted
 
 
 class PackageMICTestsViewSet(
@@ -31,17 +30,19 @@ class PackageMICTestsViewSet(
     serializer_class = MICTestsSerializer
 
     def create(self, request, *args, **kwargs):
-        """Import Excel file with data."""
+        """Queue import of Excel file with data."""
         package = Package.objects.get(pk=self.kwargs["package_pk"])
-
-        PackageFileMICImportService().execute(
-            dict(package=package),
-            request.FILES,
+        file = request.FILES.get("file")
+
+        job = enqueue(
+            Job.Kind.MIC_IMPORT,
+            package,
+            request.user,
+            file=file,
+            filename=file.name if file else None,
         )
 
-        return redirect(
-            reverse("submission:package-detail", (package.pk,), request=request),
-        )
+        return job_accepted(job, request)
 
     @action(methods=["POST"], detail=False, url_name="clear", url_path="clear")
     def clear(self, request, **kwargs):  # pylint: disable=unused-argument
@@ -1,15 +1,17 @@
 import logging
 
+from django.db import transaction
 from django.shortcuts import redirect
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, serializers
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.reverse import reverse
 
-from submission.models import Package
+from submission.jobs import enqueue
+from submission.models import Job, Package
 from submission.permissions import IsPackageEditable, ReadOnly, IsPackageOwner
 from submission.serializers.package import PackageSerializer
-from submission.services.matching import MatchingService
+from submission.views.jobs import job_accepted
 
 log = logging.getLogger(__name__)
 
@@ -30,31 +32,31 @@ class PackageViewSet(viewsets.ModelViewSet):
 
     @action(methods=["POST"], detail=True, url_path="match", url_name="match")
     def match(self, request: Request, **kwargs):  # pylint: disable=unused-argument
-        """Perform package data matching."""
+        """Queue package data matching, return the job to poll."""
         package: Package = Package.objects.get(pk=kwargs["pk"])
 
-        if package.matching_state != package.MatchingState.MATCHED:
-            # do not perform any matching at all,
-            # if there were no changes to its data since it was matched
+        # matching the same data twice is useless, reuse the pending job
+        job = package.jobs.filter(
+            kind=Job.Kind.MATCH,
+            state=Job.State.QUEUED,
+        ).first() or enqueue(Job.Kind.MATCH, package, request.user)
 
-            MatchingService().execute(
-                dict(
-                    package=package,
-                ),
-            )
-            log.info("package match done: %s by %s", package, package.owner)
-
-        return redirect(
-            reverse("submission:package-detail", (package.pk,), request=request),
-        )
+        return job_accepted(job, request)
 
     @action(methods=["POST"], detail=True, url_path="submit", url_name="submit")
     def submit(self, request: Request, **kwargs):  # pylint: disable=unused-argument
         """Submit the package for moderation."""
-        package: Package = Package.objects.get(pk=kwargs["pk"])
+        with transaction.atomic():
+            # jobs lock the package too, before they change it
+            package: Package = Package.objects.select_for_update().get(pk=kwargs["pk"])
+
+            if package.jobs.filter(state__in=(Job.State.QUEUED, Job.State.RUNNING)).exists():
+                raise serializers.ValidationError(
+                    "The package has unfinished jobs, wait for them to be done.",
+                )
 
-        package.to_pending()
-        package.save()
+            package.to_pending()
+            package.save()
 
         return redirect(
             reverse("submission:package-detail", (package.pk,), request=request),
@@ -1,13 +1,11 @@
 import logging
 
-from django.db import transaction
-from django.shortcuts import redirect
-from rest_framework import viewsets, serializers, permissions
+from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.reverse import reverse
 
-from submission.models import PackageSequencingData, Package, SequencingData
+from submission.jobs import enqueue
+from submission.models import Job, PackageSequencingData, Package
 from submission.permissions import (
     IsParentPackageOwner,
     IsParentPackageEditable,
@@ -17,7 +15,7 @@ from submission.serializers.package.package_sequencingdata import (
     NestedPackageSequencingDataSerializer,
 )
 from submission.services.s3bucket import SequencingDataS3BucketService
-from submission.util.tag import clear_s3_tag
+from submission.views.jobs import job_accepted
 
 log = logging.getLogger(__name__)
 
@@ -75,12 +73,10 @@ class PackageSequencingDataViewSet(
     @action(methods=["POST"], detail=False, url_path="fetch", url_name="fetch")
     def fetch_s3_file(self, request, **kwargs):  # pylint: disable=unused-argument
         """
-        Fetch file from S3, validate and generate MD5 hash.
+        Queue file fetch from S3, validation and MD5 hash generation.
 
-        Return redirect to object details.
+        Return the job to poll, once it's done it refers to sequencing data object.
         """
-        # pylint: disable=too-many-locals
-
         # passing request into serializer context
         # allows us to generate S3 paths
         serializer: NestedPackageSequencingDataSerializer = self.get_serializer(
@@ -88,95 +84,14 @@ class PackageSequencingDataViewSet(
         )
         serializer.is_valid(raise_exception=True)
 
-        service = SequencingDataS3BucketService(
-            filename=serializer.validated_data["filename"],
-            user=request.user,
-        )
-
-        try:
-            md5_hash, file_size = service.validate_uploaded_file()
-        except serializers.ValidationError:
-            # remove invalid FASTQ file from S3
-            service.remove_tmp_file()
-            raise
-
-        # search for existing FASTQ by MD5
-        seq_data: SequencingData | None = SequencingData.objects.filter(
-            hashes__algorithm__iexact="MD5",
-            hashes__value__iexact=md5_hash,
-        ).first()
-
-        if not seq_data:
-            # not found - create SequencingData and its hash
-            with transaction.atomic():
-                # make sure we only create new objects
-                # if the file is successfully persisted
-                seq_data = SequencingData.objects.create(
-                    data_location="TB-Kb",  # origin of a file
-                    filename=service.persisted_filename,
-                    file_path=service.persisted_path,
-                    file_size=file_size,
-                    sequencing_platform="ILLUMINA",
-                    library_preparation_strategy="WGS",
-                    library_layout="PAIRED",
-                )
-                seq_data_hash = seq_data.hashes.create(
-                    algorithm="MD5",
-                    value=md5_hash,
-                )
-                # persist fastq file on S3
-                service.persist_file(
-                    SequencingDataId=str(seq_data.id),
-                    OriginalFilename=clear_s3_tag(service.filename),
-                    MD5Hash=md5_hash,
-                )
-            log.info("new fastq uploaded: %s by %s", seq_data, request.user)
-        else:
-            seq_data_hash = seq_data.hashes.get(
-                algorithm="MD5",
-                value=md5_hash,
-            )
-            if seq_data.file_size is None:
-                # if file is found but has no file size - updating
-                # TODO may be confusing for Sequencing Data with multiple hashes
-                # better to save it along with sequencing data hash
-                seq_data.file_size = file_size
-                seq_data.save()
-
-            log.info("existing fastq uploaded: %s by %s", seq_data, request.user)
-
-        # remove temporary file from S3
-        service.remove_tmp_file()
-
-        package = Package.objects.get(pk=self.kwargs["package_pk"])
-
-        if PackageSequencingData.objects.filter(
-            package=package,
-            sequencing_data=seq_data,
-            sequencing_data_hash=seq_data_hash,
-        ).exists():
-            raise serializers.ValidationError(
-                "The file is already attached to the package.",
-            )
-
-        # we save original filename within fastq-package M2M
-        # in order to match it later by prefix with sample alases
-        package_fastq: PackageSequencingData = PackageSequencingData.objects.create(
-            package=package,
-            sequencing_data=seq_data,
-            sequencing_data_hash=seq_data_hash,
+        job = enqueue(
+            Job.Kind.FETCH_FASTQ,
+            Package.objects.get(pk=self.kwargs["package_pk"]),
+            request.user,
             filename=serializer.validated_data["filename"],
         )
 
-        package.mark_changed()
-
-        return redirect(
-            reverse(
-                "submission:packagesequencingdata-detail",
-                (self.kwargs["package_pk"], package_fastq.pk),
-                request=request,
-            ),
-        )
+        return job_accepted(job, request)
 
     def perform_destroy(self, instance: PackageSequencingData):
         """Mark parent package as changed on sequencing data unlink."""
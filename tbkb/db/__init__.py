@@ -1 +1,2 @@
 from .query import SubqueryCount
+from .copy import copy_insert, copy_update
@@ -0,0 +1,154 @@
+import io
+from typing import Iterable, Iterator, List, Sequence, Type
+
+from django.db import connection, transaction
+from django.db.models import Field, Model
+from psycopg2.extras import Range
+
+
+def _range_literal(value: Range) -> str:
+    """Represent psycopg2 range as PostgreSQL range literal."""
+    if value.isempty:
+        return "empty"
+    return "".join(
+        (
+            "[" if value.lower_inc else "(",
+            "" if value.lower is None else str(value.lower),
+            ",",
+            "" if value.upper is None else str(value.upper),
+            "]" if value.upper_inc else ")",
+        ),
+    )
+
+
+def _copy_value(value) -> str:
+    """Represent database-ready value in COPY text format."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, Range):
+        value = _range_literal(value)
+    elif hasattr(value, "isoformat"):
+        value = value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class _LinesFile(io.TextIOBase):
+    """Read-only file-like object over lines iterator, to stream COPY data."""
+
+    def __init__(self, lines: Iterator[str]):
+        """Wrap lines iterator."""
+        super().__init__()
+        self._lines = lines
+        self._buffer = ""
+
+    def readable(self):
+        """File is readable."""
+        return True
+
+    def read(self, size=-1):
+        """Read up to size characters."""
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for line in self._lines:
+            chunks.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = "".join(chunks)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _copy(cursor, table: str, objs: Iterable[Model], fields: List[Field], add: bool):
+    """COPY fields of the model records into the table."""
+    quote = connection.ops.quote_name
+
+    def lines():
+        for obj in objs:
+            yield "\t".join(
+                _copy_value(field.get_db_prep_save(field.pre_save(obj, add), connection))
+                for field in fields
+            ) + "\n"
+
+    with connection.wrap_database_errors:
+        cursor.copy_expert(
+            f"COPY {quote(table)} ({', '.join(quote(field.column) for field in fields)}) "
+            "FROM STDIN",
+            _LinesFile(lines()),
+        )
+
+
+def copy_insert(model: Type[Model], objs: Iterable[Model]):
+    """
+    Insert new model records with COPY FROM STDIN.
+
+    Much faster than bulk_create on big amounts of data,
+    as no huge INSERT statements are built.
+    Primary keys are reserved from the table sequence beforehand
+    and assigned to the objects, same as bulk_create does.
+    """
+    objs = list(objs)
+    if not objs:
+        return
+    opts = model._meta  # pylint: disable=protected-access
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [opts.db_table, opts.pk.column, len(objs)],
+        )
+        for obj, (pk,) in zip(objs, cursor.fetchall()):
+            # same as bulk_create, pick up primary keys of just saved related objects
+            obj._prepare_related_fields_for_save(  # pylint: disable=protected-access
+                operation_name="copy_insert",
+            )
+            obj.pk = pk
+            obj._state.adding = False  # pylint: disable=protected-access
+            obj._state.db = connection.alias  # pylint: disable=protected-access
+
+        _copy(cursor, opts.db_table, objs, list(opts.concrete_fields), add=True)
+
+
+def copy_update(model: Type[Model], objs: Iterable[Model], fields: Sequence[str]):
+    """
+    Update fields of existing model records with COPY FROM STDIN.
+
+    Data is copied into temporary staging table,
+    and then the model table is updated from it in a single UPDATE.
+    """
+    objs = list({obj.pk: obj for obj in objs}.values())
+    if not objs:
+        return
+    quote = connection.ops.quote_name
+    opts = model._meta  # pylint: disable=protected-access
+    table = quote(opts.db_table)
+    staging = quote(f"_staging_{opts.db_table}")
+    pk = quote(opts.pk.column)
+    fields = [opts.pk, *(opts.get_field(name) for name in fields)]
+    columns = ", ".join(quote(field.column) for field in fields)
+    assignments = ", ".join(
+        f"{quote(field.column)} = {staging}.{quote(field.column)}"
+        for field in fields[1:]
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {columns} FROM {table} WITH NO DATA",
+        )
+        _copy(cursor, f"_staging_{opts.db_table}", objs, fields, add=False)
+        cursor.execute(
+            f"UPDATE {table} SET {assignments} "
+            f"FROM {staging} WHERE {table}.{pk} = {staging}.{pk}",
+        )
+        cursor.execute(f"DROP TABLE {staging}")
@@ -146,6 +146,34 @@ AWS_SEQUENCING_DATA_BUCKET_NAME = env(
     "AWS_SEQUENCING_DATA_BUCKET_NAME",
     default=None,
 )
+# Uploaded sequencing data files are downloaded for validation by byte ranges,
+# fetched in parallel. Concurrency of 1 turns it into plain sequential download.
+FASTQ_DOWNLOAD_CHUNK_SIZE = env.int("FASTQ_DOWNLOAD_CHUNK_SIZE", default=8 * 1024 * 1024)
+FASTQ_DOWNLOAD_CONCURRENCY = env.int("FASTQ_DOWNLOAD_CONCURRENCY", default=8)
+FASTQ_VALIDATION_MODE = env("FASTQ_VALIDATION_MODE", default="full")
+
+# Background jobs
+JOBS_POLL_INTERVAL = env.float("JOBS_POLL_INTERVAL", default=2.0)
+JOBS_STALE_AFTER = env.int("JOBS_STALE_AFTER", default=60 * 60)
+JOBS_MAX_ATTEMPTS = env.int("JOBS_MAX_ATTEMPTS", default=3)
+JOBS_RETRY_DELAY = env.int("JOBS_RETRY_DELAY", default=60)
+
+CACHES = {
+    "default": env.cache_url("CACHE_URL", default="locmemcache://"),
+}
+# Overview API responses are cached until materialized views are refreshed,
+# 0 disables the cache
+OVERVIEW_CACHE_TIMEOUT = env.int("OVERVIEW_CACHE_TIMEOUT", default=24 * 60 * 60)
+
+# Gene searches are counted in memory and written to search history in batches,
+# when the batch is older than the interval (seconds) or has that many genes,
+# and every interval in background; searches of the last interval are lost,
+# when a worker is killed
+GENE_SEARCH_FLUSH_INTERVAL = env.int("GENE_SEARCH_FLUSH_INTERVAL", default=30)
+GENE_SEARCH_FLUSH_SIZE = env.int("GENE_SEARCH_FLUSH_SIZE", default=100)
+
+# How many independent materialized views are refreshed at once
+MATVIEWS_REFRESH_CONCURRENCY = env.int("MATVIEWS_REFRESH_CONCURRENCY", default=2)
 
 #
 # AWS deployment specific setup
@@ -9,6 +9,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",  # for trigram search lookups
     "django_pgviews",  # for postgres matview models support
     # tbkb apps
     "tbkb.apps.TbKbAdminConfig",
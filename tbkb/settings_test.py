@@ -12,6 +12,12 @@ os.environ["ENVIRONMENT"] = "testing"
 # Keys are not None to tell botocore not to search for creds in other places
 os.environ["AWS_ACCESS_KEY_ID"] = "DUMMY"  # nosec B105
 os.environ["AWS_SECRET_ACCESS_KEY"] = "DUMMY"  # nosec B105
+# uploaded sequencing data is mocked as a plain file, download it sequentially
+os.environ["FASTQ_DOWNLOAD_CONCURRENCY"] = "1"
+# tests refresh views directly, which doesn't invalidate cached responses
+os.environ["OVERVIEW_CACHE_TIMEOUT"] = "0"
+# gene searches are written to search history right away
+os.environ["GENE_SEARCH_FLUSH_INTERVAL"] = "0"
 # disable S3 file upload backend
 os.environ["DEFAULT_FILE_STORAGE"] = "django.core.files.storage.FileSystemStorage"
 
@@ -0,0 +1,67 @@
+from datetime import datetime
+from hashlib import sha256
+from typing import Optional, Tuple
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def querysets_checksum(*querysets: QuerySet) -> str:
+    """Checksum of querysets rows, calculated by the database without fetching them."""
+    checksums = []
+    params = []
+    for queryset in querysets:
+        sql, qs_params = queryset.order_by().query.sql_with_params()
+        checksums.append(
+            "(SELECT md5(coalesce(string_agg(t::text, ',' ORDER BY t::text), ''))"
+            f" FROM ({sql}) t)",
+        )
+        params.extend(qs_params)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT concat_ws(',', {', '.join(checksums)})", params)
+        return cursor.fetchone()[0]
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GET requests with 304 Not Modified before the view runs.
+
+    By default the data is versioned by checksum of `version_querysets` rows,
+    views override `get_validators()` to return version and last modification time
+    of the served data some other way, cheaper than getting the data itself.
+    """
+
+    version_querysets: tuple = ()
+
+    def get_validators(self, request) -> Tuple[Optional[str], Optional[datetime]]:
+        """Return data version string and last modification time, each may be None."""
+        # pylint: disable=unused-argument
+        if not self.version_querysets:
+            return None, None
+        return querysets_checksum(*self.version_querysets), None
+
+    def dispatch(self, request, *args, **kwargs):
+        """Return 304 response if client has the current data, add validators."""
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        version, last_modified = self.get_validators(request)
+        etag = None
+        if version is not None:
+            # representation depends on requested format
+            key = f"{version}\n{request.META.get('HTTP_ACCEPT', '')}"
+            etag = quote_etag(sha256(key.encode()).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            if etag is not None:
+                response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+        return response